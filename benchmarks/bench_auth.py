@@ -0,0 +1,169 @@
+import time
+from functools import wraps
+
+import jwt
+from flask import Flask, jsonify, make_response, request
+
+from pc_builder_backend.auth_context import TokenAuthenticator, TokenClaimsCache, TokenError, get_request_claims
+from pc_builder_backend.token_blacklist import TokenBlacklist
+
+SECRET_KEY = "benchmark-secret"
+REQUESTS = 10_000
+# Each measurement is the fastest of several runs, as the request context baseline varies between runs
+REPEATS = 5
+# Tokens revoked by other users, which the filter holds
+REVOKED_TOKENS = 10_000
+# Round trip times of the blacklist lookup, none stands for the cost of the lookup alone
+LOOKUP_LATENCIES_MS = [0, 0.2, 1]
+
+
+class Blacklist:
+    """
+    Stands in for the blacklisted tokens collection, waiting out a round trip to the database on each lookup.
+    """
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.tokens = {f"revoked-{number}" for number in range(REVOKED_TOKENS)}
+        self.lookups = 0
+
+    def find_one(self, query):
+        self.lookups += 1
+        if self.latency:
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+        return {"token": query["token"]} if query["token"] in self.tokens else None
+
+    def find(self, query, projection):
+        return [{"token": token} for token in self.tokens]
+
+    def create_index(self, key, **kwargs):
+        pass
+
+
+def previous_decorators(blacklist):
+    """
+    Previous implementation, each decorator decodes the token and jwt_required looks it up in the blacklist.
+    """
+    def jwt_required(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            token = request.headers.get('x-access-token')
+            try:
+                jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+            except Exception as e:
+                return make_response(jsonify({'message': f'Error decoding token: {str(e)}'}), 401)
+            if blacklist.find_one({"token": token}) is not None:
+                return make_response(jsonify({"message": "Token is blacklisted, can no longer be used"}), 401)
+            return func(*args, **kwargs)
+        return wrapper
+
+    def admin_required(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            data = jwt.decode(request.headers.get('x-access-token'), SECRET_KEY, algorithms=['HS256'])
+            if data['admin']:
+                return func(*args, **kwargs)
+            return make_response(jsonify({'message': 'Admin Access is required'}), 401)
+        return wrapper
+
+    return jwt_required, admin_required
+
+
+def current_decorators(authenticator):
+    """
+    Current implementation, the token is checked once per request, verified tokens are cached between requests and
+    the blacklist filter only sends tokens it finds to the database.
+    """
+    def jwt_required(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                get_request_claims(authenticator)
+            except TokenError as e:
+                return make_response(jsonify({'message': str(e)}), 401)
+            return func(*args, **kwargs)
+        return wrapper
+
+    def admin_required(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                data = get_request_claims(authenticator)
+            except TokenError as e:
+                return make_response(jsonify({'message': str(e)}), 401)
+            if data.get('admin'):
+                return func(*args, **kwargs)
+            return make_response(jsonify({'message': 'Admin Access is required'}), 401)
+        return wrapper
+
+    return jwt_required, admin_required
+
+
+def admin_view(decorators):
+    jwt_required, admin_required = decorators
+
+    @jwt_required
+    @admin_required
+    def view():
+        return "ok"
+
+    return view
+
+
+def measure(app: Flask, view, tokens: list) -> float:
+    """
+    Calls a view inside a request context for each token, as a request would.
+
+    :return: Microseconds taken per request, in the fastest of REPEATS runs.
+    """
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for token in tokens:
+            with app.test_request_context(headers={'x-access-token': token}):
+                assert view() == "ok"
+        elapsed = (time.perf_counter() - start) / len(tokens) * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    app = Flask(__name__)
+    expires = int(time.time()) + 3600
+    # Every request of a session sends the same token, cold requests each send a token not seen before
+    repeat_tokens = [jwt.encode({'user': 'admin', 'admin': True, 'exp': expires}, SECRET_KEY, algorithm='HS256')]
+    repeat_tokens *= REQUESTS
+    unique_tokens = [jwt.encode({'user': f'user{number}', 'admin': True, 'exp': expires}, SECRET_KEY,
+                                algorithm='HS256') for number in range(REQUESTS)]
+    baseline = measure(app, lambda: "ok", repeat_tokens)
+
+    print(f"Auth overhead per request of a jwt_required and admin_required route, {REQUESTS} requests, "
+          f"request context baseline {baseline:.1f} us")
+    print(f"Filter of {REVOKED_TOKENS} revoked tokens, unsynced looks up every token as before the filter")
+    print(f"{'lookup (ms)':>12} {'previous (us)':>14} {'unsynced cold':>14} {'unsynced warm':>14} "
+          f"{'cold (us)':>10} {'warm (us)':>10} {'lookups':>8} {'speedup':>8}")
+    for latency_ms in LOOKUP_LATENCIES_MS:
+        collection = Blacklist(latency_ms)
+        previous = measure(app, admin_view(previous_decorators(collection)), repeat_tokens) - baseline
+
+        def current_view(synced: bool):
+            blacklist = TokenBlacklist(collection, capacity=REVOKED_TOKENS, error_rate=0.001)
+            if synced:
+                blacklist.sync()
+            authenticator = TokenAuthenticator(SECRET_KEY, blacklist,
+                                               cache=TokenClaimsCache(max_entries=REQUESTS, max_ttl=60))
+            return admin_view(current_decorators(authenticator))
+
+        unsynced_cold = measure(app, current_view(synced=False), unique_tokens) - baseline
+        unsynced_warm = measure(app, current_view(synced=False), repeat_tokens) - baseline
+        collection.lookups = 0
+        cold = measure(app, current_view(synced=True), unique_tokens) - baseline
+        warm = measure(app, current_view(synced=True), repeat_tokens) - baseline
+        print(f"{latency_ms:>12} {previous:>14.1f} {unsynced_cold:>14.1f} {unsynced_warm:>14.1f} {cold:>10.1f} "
+              f"{warm:>10.1f} {collection.lookups:>8} {previous / warm:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
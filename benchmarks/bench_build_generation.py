@@ -0,0 +1,65 @@
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_catalog import create_synthetic_catalog
+from pc_builder_backend.excel_methods.candidate_cache import CandidatePoolCache
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.excel_helper_methods import allocate_budget, fetch_valid_parts, \
+    generate_build_from_excel, get_component_info
+
+CATALOG_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+BUDGETS = [400, 750, 1250, 1800]
+
+
+def generate_build_with_query(build_price, complete_parts_df):
+    """
+    Previous implementation of build generation, one DataFrame.query scan per part type.
+    """
+    ratios = allocate_budget(build_budget=build_price)
+    slots = {"CPU": ["CPU"], "GPU": ["GPU"], "RAM": ["RAM"], "Storage": ["HDD", "SSD"],
+             "Motherboard": ["Motherboard"], "Power Supply": ["Power Supply"], "Case": ["Case"]}
+    build = []
+    for slot, part_types in slots.items():
+        frames = [fetch_valid_parts(part_type, complete_parts_df, build_price * ratios[slot])
+                  for part_type in part_types]
+        frames = [frame for frame in frames if frame is not None]
+        build.append(get_component_info(pd.concat(frames, ignore_index=True)))
+    return build
+
+
+def time_per_build(function, repeats: int) -> float:
+    """
+    Times a build generation function, returning the mean milliseconds per build.
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(random.choice(BUDGETS))
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    print(f"{'Parts':>10} {'query (ms)':>12} {'index (ms)':>12} {'speedup':>9} {'cached (ms)':>12} "
+          f"{'index build (ms)':>17}")
+    for num_parts in CATALOG_SIZES:
+        catalog = create_synthetic_catalog(num_parts)
+
+        start = time.perf_counter()
+        index = CatalogIndex(catalog)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        repeats = 20 if num_parts >= 1_000_000 else 100
+        query_ms = time_per_build(lambda budget: generate_build_with_query(budget, catalog), repeats)
+        index_ms = time_per_build(lambda budget: generate_build_from_excel(budget, catalog, catalog_index=index),
+                                  repeats * 10)
+        cache = CandidatePoolCache(max_entries=512, price_step=5)
+        cached_ms = time_per_build(lambda budget: generate_build_from_excel(budget, catalog, catalog_index=index,
+                                                                            candidate_cache=cache), repeats * 10)
+
+        print(f"{num_parts:>10} {query_ms:>12.3f} {index_ms:>12.3f} {query_ms / index_ms:>8.0f}x {cached_ms:>12.3f} "
+              f"{build_ms:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import statistics
+import time
+
+from benchmarks.synthetic_catalog import create_synthetic_catalog
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel
+
+CATALOG_SIZES = [1_000, 10_000, 100_000]
+BUDGETS = [400, 750, 1250, 1800]
+REPEATS = 50
+
+
+def main():
+    print(f"{'Parts':>8} {'Budget':>7} {'mode':>9} {'mean ms':>9} {'max ms':>8} {'mean use':>9} "
+          f"{'min use':>8} {'over budget':>12}")
+    for num_parts in CATALOG_SIZES:
+        catalog = create_synthetic_catalog(num_parts)
+        index = CatalogIndex(catalog)
+        for budget in BUDGETS:
+            for mode in ("random", "optimize"):
+                times, utilisation = [], []
+                for _ in range(REPEATS):
+                    start = time.perf_counter()
+                    build = generate_build_from_excel(budget, catalog, catalog_index=index, mode=mode)
+                    times.append((time.perf_counter() - start) * 1000)
+                    utilisation.append(round(build.overall_price, 2) / budget if build.is_valid() else 0)
+                over = sum(use > 1 for use in utilisation) / len(utilisation)
+                print(f"{num_parts:>8} {budget:>7} {mode:>9} {statistics.mean(times):>9.3f} {max(times):>8.2f} "
+                      f"{statistics.mean(utilisation):>8.1%} {min(utilisation):>8.1%} {over:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_catalog import create_synthetic_catalog
+from pc_builder_backend.excel_methods.catalog_loader import load_catalog, get_cache_path
+from pc_builder_backend.excel_methods.excel_helper_methods import read_excel_data
+
+CATALOG_SIZES = [1_000, 10_000, 100_000]
+
+
+def time_ms(function) -> float:
+    """
+    Times a single call of a function in milliseconds.
+    """
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'Parts':>8} {'excel (ms)':>12} {'first load (ms)':>16} {'cached (ms)':>12} {'speedup':>9} "
+          f"{'xlsx (KB)':>10} {'cache (KB)':>11}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_parts in CATALOG_SIZES:
+            excel_file = os.path.join(temp_dir, f"components_{num_parts}.xlsx")
+            create_synthetic_catalog(num_parts).to_excel(excel_file, index=False)
+
+            excel_ms = time_ms(lambda: read_excel_data(excel_file))
+            # The first load reads the Excel file and writes the cache, later loads only read the cache
+            first_ms = time_ms(lambda: load_catalog(excel_file))
+            cached_ms = min(time_ms(lambda: load_catalog(excel_file)) for _ in range(5))
+
+            xlsx_kb = os.path.getsize(excel_file) / 1024
+            cache_kb = os.path.getsize(get_cache_path(excel_file)) / 1024
+            print(f"{num_parts:>8} {excel_ms:>12.1f} {first_ms:>16.1f} {cached_ms:>12.2f} "
+                  f"{excel_ms / cached_ms:>8.0f}x {xlsx_kb:>10.0f} {cache_kb:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
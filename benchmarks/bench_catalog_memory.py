@@ -0,0 +1,88 @@
+import gc
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic_catalog import create_synthetic_catalog
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.catalog_loader import encode_catalog, decode_catalog, decode_compact_catalog
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel
+
+CATALOG_SIZES = [100_000, 1_000_000]
+BUDGETS = [400, 750, 1250, 1800]
+
+
+def load_dataframe_catalog(columns) -> tuple:
+    """
+    Previous in-memory layout, an object dtype DataFrame plus per type arrays of sorted prices and names.
+    """
+    dataframe = decode_catalog(columns)
+    index = {}
+    for part_type, group in dataframe.groupby('Type', sort=False):
+        prices = group['Price'].to_numpy(dtype=np.float64)
+        order = np.argsort(prices, kind='stable')
+        index[part_type] = (prices[order], group['Name'].to_numpy(dtype=object)[order])
+    return dataframe, index
+
+
+def load_compact_catalog(columns) -> tuple:
+    """
+    Compact layout, the catalog arrays plus the index of sorted pence and catalog rows.
+    """
+    catalog = decode_compact_catalog(columns)
+    return catalog, CatalogIndex(catalog)
+
+
+def measure_bytes(load, columns) -> tuple:
+    """
+    Measures the memory still held by what a loader returns once it has finished.
+
+    :return: Tuple of (bytes held, result of the loader).
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = load(columns)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, result
+
+
+def time_ms(function, repeats: int = 3) -> float:
+    """
+    Times a function, returning the fastest of a few calls in milliseconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    print(f"{'Parts':>9} {'layout':>10} {'held (MB)':>10} {'bytes/part':>11} {'list all (ms)':>14} "
+          f"{'build (ms)':>11}")
+    for num_parts in CATALOG_SIZES:
+        columns = encode_catalog(create_synthetic_catalog(num_parts))
+
+        dataframe_bytes, (dataframe, _) = measure_bytes(load_dataframe_catalog, columns)
+        list_ms = time_ms(lambda: dataframe.values.tolist())
+        print(f"{num_parts:>9} {'DataFrame':>10} {dataframe_bytes / 2 ** 20:>10.1f} "
+              f"{dataframe_bytes / num_parts:>11.1f} {list_ms:>14.1f} {'':>11}")
+        del dataframe
+
+        compact_bytes, (catalog, index) = measure_bytes(load_compact_catalog, columns)
+        list_ms = time_ms(lambda: catalog.to_lists())
+        random.seed(0)
+        build_ms = time_ms(lambda: [generate_build_from_excel(budget, None, catalog_index=index)
+                                    for budget in BUDGETS]) / len(BUDGETS)
+        print(f"{num_parts:>9} {'compact':>10} {compact_bytes / 2 ** 20:>10.1f} "
+              f"{compact_bytes / num_parts:>11.1f} {list_ms:>14.1f} {build_ms:>11.3f}")
+        print(f"{'':>9} {'saving':>10} {dataframe_bytes / compact_bytes:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_catalog import create_synthetic_catalog
+from pc_builder_backend.excel_methods.catalog_loader import write_catalog, load_compact_catalog
+from pc_builder_backend.excel_methods.excel_helper_methods import write_excel_data
+
+CATALOG_SIZES = [10_000, 100_000, 1_000_000]
+# The workbook rewrite the scraper used to do takes minutes past this many parts, so larger catalogs skip it
+OPENPYXL_REWRITE_MAX_PARTS = 100_000
+
+
+def time_ms(function) -> float:
+    """
+    Times a single call of a function in milliseconds.
+    """
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def rewrite_workbook(excel_file: str, dataframe: pd.DataFrame) -> None:
+    """
+    Rewrites the workbook in place through pandas, as the scraper did before writing the columnar catalog.
+    """
+    with pd.ExcelWriter(excel_file, mode='w', engine='openpyxl') as writer:
+        dataframe.to_excel(writer, index=False)
+
+
+def main():
+    print(f"{'Parts':>9} {'columnar (ms)':>14} {'load (ms)':>10} {'xlsx stream (ms)':>17} "
+          f"{'xlsx rewrite (ms)':>18} {'columnar (KB)':>14} {'xlsx (KB)':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for num_parts in CATALOG_SIZES:
+            dataframe = create_synthetic_catalog(num_parts)
+            catalog_file = os.path.join(temp_dir, f"components_{num_parts}.npz")
+            excel_file = os.path.join(temp_dir, f"components_{num_parts}.xlsx")
+
+            columnar_ms = min(time_ms(lambda: write_catalog(catalog_file, dataframe)) for _ in range(3))
+            load_ms = min(time_ms(lambda: load_compact_catalog(catalog_file)) for _ in range(3))
+            stream_ms = time_ms(lambda: write_excel_data(excel_file, dataframe))
+            rewrite = "-"
+            if num_parts <= OPENPYXL_REWRITE_MAX_PARTS:
+                rewrite = f"{time_ms(lambda: rewrite_workbook(excel_file, dataframe)):.0f}"
+
+            print(f"{num_parts:>9} {columnar_ms:>14.1f} {load_ms:>10.1f} {stream_ms:>17.0f} {rewrite:>18} "
+                  f"{os.path.getsize(catalog_file) / 1024:>14.0f} {os.path.getsize(excel_file) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
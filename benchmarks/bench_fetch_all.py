@@ -0,0 +1,65 @@
+import time
+
+from flask import Flask, jsonify, make_response, request
+
+from benchmarks.synthetic_catalog import create_synthetic_catalog
+from pc_builder_backend.excel_methods.catalog_snapshot import CatalogSnapshot
+from pc_builder_backend.parts_payload import PartsPayloadCache, make_payload_response
+
+CATALOG_SIZES = [1_000, 10_000, 100_000]
+BENCH_SECONDS = 2
+
+
+def create_app(snapshot: CatalogSnapshot) -> Flask:
+    """
+    Creates an app serving a catalog snapshot through the previous and the cached fetch_all routes.
+    """
+    app = Flask(__name__)
+    payload_cache = PartsPayloadCache()
+
+    @app.route('/before')
+    def fetch_all_before():
+        # Previous implementation, the parts list is built and encoded on every request
+        return make_response(jsonify({'parts': snapshot.catalog.to_lists(), 'catalog_version': snapshot.version}), 200)
+
+    @app.route('/after')
+    def fetch_all_after():
+        return make_payload_response(payload=payload_cache.get(snapshot), request=request)
+
+    return app
+
+
+def requests_per_second(client, url: str, headers: dict) -> tuple:
+    """
+    Sends requests for BENCH_SECONDS, at least three, and works out the throughput.
+
+    :return: Tuple of (requests per second, bytes in the last response body).
+    """
+    count, start = 0, time.perf_counter()
+    while count < 3 or time.perf_counter() - start < BENCH_SECONDS:
+        response = client.get(url, headers=headers)
+        count += 1
+    return count / (time.perf_counter() - start), len(response.get_data())
+
+
+def main():
+    print(f"{'Parts':>8} {'route':>22} {'req/s':>10} {'body (KB)':>10}")
+    for num_parts in CATALOG_SIZES:
+        client = create_app(CatalogSnapshot(create_synthetic_catalog(num_parts))).test_client()
+        # Builds the cached payloads and finds the ETag so only steady state requests are timed
+        etag = client.get('/after', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        client.get('/after')
+
+        cases = [
+            ("before", '/before', {}),
+            ("after", '/after', {}),
+            ("after gzip", '/after', {'Accept-Encoding': 'gzip'}),
+            ("after If-None-Match", '/after', {'Accept-Encoding': 'gzip', 'If-None-Match': etag}),
+        ]
+        for label, url, headers in cases:
+            rate, body_bytes = requests_per_second(client, url, headers)
+            print(f"{num_parts:>8} {label:>22} {rate:>10.1f} {body_bytes / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import random
+import time
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+
+NUM_PAGES = 200
+LATENCY = 0.02
+# Share of pages that fail at first, each with one of the runs of errors below
+FLAKY_SHARE = 0.15
+FAILURE_RUNS = ([503], [429, 503], [500, 502], [503] * 5)
+BACKOFF_BASE = 0.05
+
+
+def create_failures(paths: list, seed: int = 0) -> dict:
+    """
+    Picks the pages that fail and the errors each gets before it is served.
+    """
+    generator = random.Random(seed)
+    return {path: generator.choice(FAILURE_RUNS) for path in paths if generator.random() < FLAKY_SHARE}
+
+
+def refresh(pages: dict, failures: dict, max_retries: int, retry_rounds: int, rerun_failed_runs: bool) -> tuple:
+    """
+    Refreshes every page from a flaky server.
+
+    :param rerun_failed_runs: Whether a run with any failed page is run again in full, as the scraper had to be.
+    :return: Tuple of (seconds taken, requests sent, pages still failing).
+    """
+    with FixtureServer(pages, latency=LATENCY, failures=failures) as server:
+        urls = [server.url(path) for path in pages]
+        start = time.perf_counter()
+        while True:
+            # The local server isn't rate limited, so neither are the requests measured
+            with PageFetcher(rate_per_host=None, max_retries=max_retries, retry_rounds=retry_rounds,
+                             backoff_base=BACKOFF_BASE) as fetcher:
+                fetched = fetcher.fetch_all(urls)
+            failed = sum(page is None for page in fetched)
+            if not (rerun_failed_runs and failed):
+                break
+        return time.perf_counter() - start, len(server.requests), failed
+
+
+def main():
+    pages = {f"/browse/category-{number}": load_fixture('cpus_page1.html') for number in range(NUM_PAGES)}
+    failures = create_failures(list(pages))
+    print(f"{NUM_PAGES} pages, {len(failures)} flaky, {LATENCY * 1000:.0f} ms latency")
+    print(f"{'refresh':>28} {'time (s)':>9} {'requests':>9} {'failed':>7}")
+
+    runs = [
+        ("no retries", 0, 0, False),
+        ("no retries, rerun on error", 0, 0, True),
+        ("retries", 3, 0, False),
+        ("retries and a retry round", 3, 1, False),
+    ]
+    for label, max_retries, retry_rounds, rerun_failed_runs in runs:
+        seconds, requests_sent, failed = refresh(pages, failures, max_retries, retry_rounds, rerun_failed_runs)
+        print(f"{label:>28} {seconds:>9.2f} {requests_sent:>9} {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+from pc_builder_backend.excel_methods.name_search import NameSearchIndex
+
+CATALOG_SIZES = [10_000, 100_000]
+QUERIES = [("rtx 40", "GPU"), ("rtx 40", None), ("ryzen 7", "CPU"), ("corsair", None), ("samsung 990", "SSD"),
+           ("ddr5 32", "RAM"), ("n", None), ("asus rog strix", None)]
+SEARCH_REPEATS = 200
+
+# Words part names are made from, so searches hit realistic numbers of tokens and matches
+NAME_WORDS = {
+    'CPU': (["AMD Ryzen 5", "AMD Ryzen 7", "AMD Ryzen 9", "Intel Core i5", "Intel Core i7", "Intel Core i9"],
+            ["7600X", "7800X3D", "7950X", "13400F", "13700K", "14900K", "5600", "12100F"]),
+    'GPU': (["ASUS ROG Strix", "MSI Gaming X", "Gigabyte Eagle", "Zotac Twin Edge", "Sapphire Pulse"],
+            ["RTX 4060", "RTX 4070 Ti", "RTX 4080 Super", "RTX 3060", "RX 7600", "RX 7800 XT", "Arc A770"]),
+    'RAM': (["Corsair Vengeance", "G.Skill Trident Z5", "Kingston Fury Beast", "Crucial Pro"],
+            ["DDR4 16GB 3200MHz", "DDR5 32GB 6000MHz", "DDR5 64GB 5600MHz", "DDR4 32GB 3600MHz"]),
+    'SSD': (["Samsung 990 Pro", "WD Black SN850X", "Crucial P5 Plus", "Kingston KC3000"],
+            ["500GB", "1TB", "2TB", "4TB"]),
+    'HDD': (["Seagate Barracuda", "WD Blue", "Toshiba P300"], ["1TB 7200RPM", "2TB 5400RPM", "4TB 5400RPM"]),
+    'Motherboard': (["ASUS ROG Strix", "MSI MAG Tomahawk", "Gigabyte Aorus Elite", "ASRock Steel Legend"],
+                    ["B650", "X670E", "Z790", "B760M", "B550"]),
+    'Power Supply': (["Corsair RM", "Seasonic Focus GX", "be quiet! Pure Power", "EVGA SuperNOVA"],
+                     ["650W", "750W", "850W", "1000W"]),
+    'Case': (["NZXT H5 Flow", "Fractal Design North", "Lian Li Lancool 216", "Corsair 4000D Airflow"],
+             ["Black", "White", "RGB", "Mesh"]),
+}
+
+
+def create_named_catalog(num_parts: int, seed: int = 0) -> CompactCatalog:
+    """
+    Creates a catalog of parts with realistic names, each ending in a unique listing number.
+    """
+    rng = np.random.default_rng(seed)
+    part_types = list(NAME_WORDS)
+    rows = []
+    for number in range(num_parts):
+        part_type = part_types[number % len(part_types)]
+        brands, models = NAME_WORDS[part_type]
+        name = f"{brands[rng.integers(len(brands))]} {models[rng.integers(len(models))]} #{number}"
+        rows.append((part_type, name, round(float(rng.uniform(10, 1500)), 2)))
+    dataframe = pd.DataFrame(rows, columns=['Type', 'Name', 'Price'])
+    return CompactCatalog.from_dataframe(dataframe)
+
+
+def main():
+    for num_parts in CATALOG_SIZES:
+        catalog = create_named_catalog(num_parts)
+        start = time.perf_counter()
+        index = NameSearchIndex(catalog)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"{num_parts} parts, {len(index)} tokens, index built in {build_ms:.0f} ms")
+
+        names = pd.Series(catalog.names())
+        print(f"  {'query':>16} {'type':>6} {'matches':>8} {'index (us)':>11} {'str.contains (us)':>18}")
+        for query, part_type in QUERIES:
+            start = time.perf_counter()
+            for _ in range(SEARCH_REPEATS):
+                rows = index.search(query, part_type=part_type, limit=10)
+            index_us = (time.perf_counter() - start) / SEARCH_REPEATS * 1e6
+
+            # Previous way of searching, a full scan of the names for each word of the query
+            start = time.perf_counter()
+            matches = np.ones(len(names), dtype=bool)
+            for word in query.split():
+                matches &= names.str.contains(word, case=False, regex=False).to_numpy()
+            scan_us = (time.perf_counter() - start) * 1e6
+
+            print(f"  {query:>16} {part_type or '-':>6} {int(matches.sum()):>8} {index_us:>11.0f} {scan_us:>18.0f}")
+            assert len(rows) <= 10
+
+
+if __name__ == "__main__":
+    main()
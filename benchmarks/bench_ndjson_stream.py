@@ -0,0 +1,70 @@
+import datetime
+import time
+import tracemalloc
+
+from flask import Flask, jsonify, request
+
+from pc_builder_backend.ndjson_stream import NDJSON_MIMETYPE, make_ndjson_response, wants_ndjson
+
+RECORD_COUNTS = [10_000, 100_000, 1_000_000]
+
+
+def read_users(num_users: int):
+    """
+    Stands in for a database cursor, creating user records as they are read.
+    """
+    registered = datetime.datetime(2024, 1, 1)
+    for number in range(num_users):
+        yield {"user_id": f"user-{number:08d}", "username": f"builder{number}", "registration_date": registered}
+
+
+def create_app() -> Flask:
+    """
+    Creates an app listing users through the previous jsonify response and the opt-in NDJSON stream.
+    """
+    app = Flask(__name__)
+
+    @app.route('/users/<int:num_users>')
+    def users(num_users):
+        if wants_ndjson(request):
+            return make_ndjson_response(read_users(num_users))
+        # Previous implementation, the whole list is built and encoded before anything is sent
+        return jsonify({'users': list(read_users(num_users))})
+
+    return app
+
+
+def measure(client, url: str, headers: dict) -> tuple:
+    """
+    Reads a response a chunk at a time, as a server would send it, and throws each chunk away.
+
+    :return: Tuple of (peak traced memory in MB, time to first chunk in ms, total time in ms, body size in MB).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    first_chunk_ms, body_bytes = None, 0
+    for chunk in response.iter_encoded():
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - start) * 1000
+        body_bytes += len(chunk)
+    response.close()
+    total_ms = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, first_chunk_ms, total_ms, body_bytes / 2 ** 20
+
+
+def main():
+    client = create_app().test_client()
+    print(f"{'Records':>9} {'format':>7} {'peak (MB)':>10} {'first chunk (ms)':>17} {'total (ms)':>11} "
+          f"{'body (MB)':>10}")
+    for num_records in RECORD_COUNTS:
+        for label, headers in (("json", {}), ("ndjson", {'Accept': NDJSON_MIMETYPE})):
+            peak_mb, first_ms, total_ms, body_mb = measure(client, f'/users/{num_records}', headers)
+            print(f"{num_records:>9} {label:>7} {peak_mb:>10.1f} {first_ms:>17.1f} {total_ms:>11.0f} "
+                  f"{body_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_cache import PageCache
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+from pc_builder_backend.webscraping.part_data_scraper import scrape_part_data
+
+NUM_PAGES = 24
+# Listings on a real category page, the saved page is repeated up to this many
+PARTS_PER_PAGE = 60
+LATENCY = 0.05
+
+
+def create_page(number: int) -> bytes:
+    """
+    Builds a category page with a full page of listings out of the saved page.
+    """
+    page = load_fixture('cpus_page1.html').decode('utf-8')
+    start, end = page.index('<div class="card card-horizontal">'), page.index('  </div>\n  <nav')
+    cards = page[start:end]
+    listings = "".join(cards.replace('Processor', f'Processor #{number}-{copy}') for copy in range(PARTS_PER_PAGE // 3))
+    return (page[:start] + listings + page[end:]).encode('utf-8')
+
+
+def run_scraper(server: FixtureServer, cache_file: str) -> tuple:
+    """
+    Fetches and scrapes every page through the page cache, as the scraper does.
+
+    :return: Tuple of (seconds taken, cache stats of the run).
+    """
+    start = time.perf_counter()
+    page_cache = PageCache(cache_file)
+    # The local server isn't rate limited, so neither are the requests measured
+    with PageFetcher(rate_per_host=None) as fetcher:
+        fetcher.fetch_all([server.url(path) for path in server.pages],
+                          fetch=lambda url: page_cache.fetch_parts(fetcher, url, parse=scrape_part_data))
+    page_cache.save()
+    return time.perf_counter() - start, page_cache.stats()
+
+
+def main():
+    pages = {f"/browse/category-{number}": create_page(number) for number in range(NUM_PAGES)}
+    print(f"{NUM_PAGES} pages of {PARTS_PER_PAGE} parts, {sum(map(len, pages.values())) / 1024:.0f} KB in total")
+    print(f"{'run':>22} {'time (s)':>9} {'parsed':>7} {'downloaded (KB)':>16} {'saved (KB)':>11} "
+          f"{'parse (ms)':>11} {'parse saved (ms)':>17}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for validators in (True, False):
+            cache_file = os.path.join(temp_dir, f".components.{validators}.pages.json")
+            with FixtureServer(pages, latency=LATENCY, validators=validators) as server:
+                for label in ("cold", "warm"):
+                    seconds, stats = run_scraper(server, cache_file)
+                    label = f"{label} ({'304s' if validators else 'hash only'})"
+                    print(f"{label:>22} {seconds:>9.2f} {stats['pages_parsed']:>7} "
+                          f"{stats['bytes_downloaded'] / 1024:>16.0f} {stats['bytes_saved'] / 1024:>11.0f} "
+                          f"{stats['parse_seconds'] * 1000:>11.0f} {stats['parse_seconds_saved'] * 1000:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import time
+
+from benchmarks.bench_page_cache import create_page
+from pc_builder_backend.webscraping.part_parsers import PARSER_BACKENDS, parse_with_soup
+
+NUM_PAGES = 24
+BENCH_SECONDS = 2
+
+
+def pages_per_second(parse, pages: list) -> float:
+    """
+    Parses the pages over and over for BENCH_SECONDS, at least once, and works out the throughput.
+    """
+    count, start = 0, time.perf_counter()
+    while count == 0 or time.perf_counter() - start < BENCH_SECONDS:
+        for page in pages:
+            parse(page)
+        count += len(pages)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    pages = [create_page(number).decode('utf-8') for number in range(NUM_PAGES)]
+    print(f"{NUM_PAGES} pages of {len(parse_with_soup(pages[0])[0])} parts, "
+          f"{sum(map(len, pages)) / NUM_PAGES / 1024:.0f} KB each")
+
+    baseline = None
+    print(f"{'backend':>12} {'pages/s':>9} {'speedup':>8}")
+    for backend, parse in PARSER_BACKENDS.items():
+        assert all(parse(page) == parse_with_soup(page) for page in pages)
+        rate = pages_per_second(parse, pages)
+        baseline = baseline or rate
+        print(f"{backend:>12} {rate:>9.1f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
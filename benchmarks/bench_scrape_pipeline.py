@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+
+from benchmarks.bench_page_cache import create_page
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer
+from pc_builder_backend.webscraping.page_cache import PageCache
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+from pc_builder_backend.webscraping.part_data_scraper import scrape_page_rows
+from pc_builder_backend.webscraping.scrape_pipeline import ScrapePipeline
+
+NUM_PAGES = 2000
+PARSE_WORKERS = (1, 2, 4, 8)
+
+
+def scrape_on_fetch_threads(fetcher: PageFetcher, page_cache: PageCache, urls: list) -> list:
+    """
+    Scrapes each page on the thread that fetched it, as the scraper did before the parse stage.
+    """
+    return fetcher.fetch_all(urls, fetch=lambda url: page_cache.fetch_parts(fetcher, url, parse=scrape_page_rows))
+
+
+def run(urls: list, cache_file: str, parse_workers: int = None) -> tuple:
+    """
+    Fetches and scrapes every page with an empty page cache.
+
+    :return: Tuple of (seconds taken, number of rows scraped).
+    """
+    start = time.perf_counter()
+    page_cache = PageCache(cache_file)
+    # The local server isn't rate limited, so neither are the requests measured
+    with PageFetcher(rate_per_host=None) as fetcher:
+        if parse_workers is None:
+            pages = scrape_on_fetch_threads(fetcher, page_cache, urls)
+        else:
+            pages = ScrapePipeline(fetcher, page_cache, parse=scrape_page_rows,
+                                   parse_workers=parse_workers).scrape_all(urls)
+    return time.perf_counter() - start, sum(len(page["rows"]) for page in pages)
+
+
+def main():
+    pages = {f"/browse/category-{number}": create_page(number) for number in range(NUM_PAGES)}
+    print(f"{NUM_PAGES} pages, {sum(map(len, pages.values())) / 1024 / 1024:.1f} MB in total, "
+          f"{os.cpu_count()} CPU cores")
+    print(f"{'parse stage':>22} {'time (s)':>9} {'pages/s':>8} {'rows':>8}")
+
+    with tempfile.TemporaryDirectory() as temp_dir, FixtureServer(pages) as server:
+        urls = [server.url(path) for path in pages]
+        for parse_workers in (None,) + PARSE_WORKERS:
+            cache_file = os.path.join(temp_dir, f".components.{parse_workers}.pages.json")
+            seconds, rows = run(urls, cache_file, parse_workers=parse_workers)
+            label = "fetch threads" if parse_workers is None else f"{parse_workers} worker processes"
+            print(f"{label:>22} {seconds:>9.2f} {NUM_PAGES / seconds:>8.0f} {rows:>8}")
+
+
+if __name__ == "__main__":
+    main()
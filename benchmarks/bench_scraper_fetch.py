@@ -0,0 +1,64 @@
+import time
+
+import requests
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+
+# The scraper fetches three pages for each of eight categories
+CATEGORIES = ["cpus", "graphics-cards", "memory", "solid-state-drives", "hard-drives", "motherboards",
+              "power-supplies", "cases"]
+PAGES_PER_CATEGORY = 3
+LATENCIES = [0.05, 0.2]
+
+
+def fetch_html_content(url: str) -> str:
+    """
+    Previous way of fetching a page, a new connection for each request.
+    """
+    response = requests.get(url)
+    response.raise_for_status()
+    return response.text
+
+
+def create_pages() -> dict:
+    """
+    Maps the path of every category page to a saved page.
+    """
+    page = load_fixture('cpus_page1.html')
+    paths = []
+    for category in CATEGORIES:
+        paths.append(f"/browse/{category}")
+        paths.extend(f"/browse/{category}?page={number}" for number in range(2, PAGES_PER_CATEGORY + 1))
+    return {path: page for path in paths}
+
+
+def main():
+    pages = create_pages()
+    print(f"{len(pages)} pages")
+    print(f"{'latency (ms)':>12} {'sequential (s)':>15} {'concurrent (s)':>15} {'speedup':>8} {'connections':>12}")
+    for latency in LATENCIES:
+        with FixtureServer(pages, latency=latency) as server:
+            category_urls = {category: [server.url(path) for path in pages if path.startswith(f"/browse/{category}")]
+                             for category in CATEGORIES}
+
+            # Previous way of fetching, one page after another with a new connection for each
+            start = time.perf_counter()
+            for url_list in category_urls.values():
+                for url in url_list:
+                    fetch_html_content(url)
+            sequential = time.perf_counter() - start
+
+            connections_before = server.connections
+            start = time.perf_counter()
+            # The local server isn't rate limited, so neither are the requests measured
+            with PageFetcher(rate_per_host=None) as fetcher:
+                fetcher.fetch_categories(category_urls)
+            concurrent = time.perf_counter() - start
+
+            print(f"{latency * 1000:>12.0f} {sequential:>15.2f} {concurrent:>15.2f} {sequential / concurrent:>7.1f}x "
+                  f"{server.connections - connections_before:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+PART_TYPES = ['CPU', 'GPU', 'RAM', 'HDD', 'SSD', 'Motherboard', 'Power Supply', 'Case']
+
+
+def create_synthetic_catalog(num_parts: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Creates a catalog shaped like components.xlsx with parts spread evenly over every type.
+    Prices are log-uniform so cheap parts are denser than expensive ones, as in the scraped catalog.
+
+    :param num_parts: Number of parts in the catalog.
+    :param seed: Seed for the random number generator.
+    :return: DataFrame with 'Type', 'Name' and 'Price' columns.
+    """
+    rng = np.random.default_rng(seed)
+    types = np.array(PART_TYPES, dtype=object)[np.arange(num_parts) % len(PART_TYPES)]
+    prices = np.round(np.exp(rng.uniform(np.log(10), np.log(1500), size=num_parts)), 2)
+    names = [f"{part_type} Model {number}" for number, part_type in enumerate(types)]
+    return pd.DataFrame({'Type': types, 'Name': names, 'Price': prices})
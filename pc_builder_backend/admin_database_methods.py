@@ -1,6 +1,6 @@
 from datetime import datetime
 from pprint import pprint
-from typing import Union
+from typing import Iterator, Union
 
 from pymongo import MongoClient
 from pymongo.collection import Collection
@@ -8,7 +8,7 @@ from pymongo.database import Database
 from pymongo.errors import PyMongoError
 
 from pc_builder_backend.constants import MONGO_CONNECTION_URL, STAGING_DATABASE, BUILDS_COLLECTION, USER_COLLECTION, \
-    BUILDS_INDEX_COLLECTION, BLACKLIST_COLLECTION
+    BUILDS_INDEX_COLLECTION, BLACKLIST_COLLECTION, STREAM_BATCH_SIZE
 
 
 def fetch_app_info(db: Database, user_collection: Collection, build_collection: Collection) -> Union[dict, None]:
@@ -56,14 +56,7 @@ def fetch_all_users(collection: Collection) -> Union[list, None]:
     :return: List of user information dictionaries or None if an error occurs.
     """
     try:
-        # Fetch the username and registration_date of every user
-        user_data = []
-        for doc in collection.find({}, {"username": 1, "registration_date": 1, "user_id": 1, "_id": 0}):
-            user_data.append({
-                "user_id": doc["user_id"],
-                "username": doc["username"],
-                "registration_date": datetime.fromtimestamp(doc["registration_date"].timestamp())
-            })
+        user_data = list(iter_all_users(collection=collection))
 
         if user_data:
             return user_data
@@ -75,6 +68,25 @@ def fetch_all_users(collection: Collection) -> Union[list, None]:
         return None
 
 
+def iter_all_users(collection: Collection, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Lazily fetches information about all users, reading them from the cursor a batch at a time.
+
+    :param collection: Collection containing user data.
+    :param batch_size: Number of users read from the database at once.
+    :return: Generator of user information dictionaries.
+    """
+    # Fetch the username and registration_date of every user
+    cursor = collection.find({}, {"username": 1, "registration_date": 1, "user_id": 1, "_id": 0},
+                             batch_size=batch_size)
+    for doc in cursor:
+        yield {
+            "user_id": doc["user_id"],
+            "username": doc["username"],
+            "registration_date": datetime.fromtimestamp(doc["registration_date"].timestamp())
+        }
+
+
 def admin_delete_user_account(builds_collection: Collection, builds_index_collection: Collection,
                               users_collection: Collection, user_id: str) -> bool:
     """
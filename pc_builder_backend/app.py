@@ -1,4 +1,5 @@
 import datetime
+import itertools
 from functools import wraps
 
 import bcrypt
@@ -8,11 +9,24 @@ from flask_cors import CORS
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
 
-from build_database_methods import write_new_build, delete_build, edit_build, fetch_user_builds, update_build
+from build_database_methods import (write_new_build, write_new_builds, delete_build, edit_build,
+                                    fetch_user_builds, iter_user_builds, update_build, fetch_build)
 from user_database_methods import (add_new_user, delete_existing_user,
                                    unique_username_check, update_user_password)
-from admin_database_methods import fetch_app_info, fetch_all_users, admin_delete_user_account
-from excel_methods.excel_helper_methods import generate_build_from_excel, read_excel_data
+from admin_database_methods import fetch_app_info, fetch_all_users, iter_all_users, admin_delete_user_account
+from excel_methods.excel_helper_methods import (generate_build_from_excel, generate_builds_batch,
+                                                fetch_alternative_parts, get_stored_slot_name, fetch_parts_page,
+                                                BUILD_SLOTS, STORED_SLOT_NAMES)
+from excel_methods.shared_catalog import load_shared_catalog
+from excel_methods.catalog_loader import find_catalog_file
+from excel_methods.catalog_snapshot import CatalogStore
+from excel_methods.candidate_cache import CandidatePoolCache
+from excel_methods.build_pool import BuildPool
+from excel_methods.price_history import PriceHistoryStore, get_history_dir
+from parts_payload import PartsPayloadCache, make_payload_response
+from ndjson_stream import wants_ndjson, make_ndjson_response
+from auth_context import TokenAuthenticator, TokenClaimsCache, TokenError, get_request_claims
+from token_blacklist import TokenBlacklist
 from constants import *
 
 app = Flask(__name__)
@@ -35,36 +49,69 @@ builds_collection = database[BUILDS_COLLECTION]
 build_index_collection = database[BUILDS_INDEX_COLLECTION]
 users_collection = database[USER_COLLECTION]
 blacklisted_tokens_collection = database[BLACKLIST_COLLECTION]
+# Revoked tokens are kept until they expire, each worker holds a filter of them synced in the background so tokens
+# that were never revoked are accepted without a round trip to the database
+token_blacklist = TokenBlacklist(collection=blacklisted_tokens_collection, capacity=BLACKLIST_FILTER_CAPACITY,
+                                 error_rate=BLACKLIST_FILTER_ERROR_RATE)
+token_blacklist.start_syncing(interval=BLACKLIST_SYNC_INTERVAL)
+# Checks the token of each request once, caching the claims of verified tokens so repeat requests skip decoding them
+authenticator = TokenAuthenticator(secret_key=app.config['SECRET_KEY'], blacklist=token_blacklist,
+                                   cache=TokenClaimsCache(max_entries=AUTH_CACHE_SIZE, max_ttl=AUTH_CACHE_MAX_TTL))
 
 # Get the current directory of the script
 current_dir = os.path.dirname(os.path.realpath(__file__))
 # Construct the path to the Excel file relative to the project root
 excel_file = os.path.abspath(os.path.join(current_dir, '../parts/components.xlsx'))
-
-complete_parts_df = read_excel_data(excel_file)
+# The columnar catalog the scraper writes next to the Excel file, or the Excel file if none has been written yet
+catalog_file = find_catalog_file(excel_file)
+
+# Holds the current snapshot of the catalog as compact arrays with their price index. The arrays are a memory mapped
+# segment published once from the catalog file and shared by every worker process. Requests take the current
+# snapshot once, so a reload swaps in a new version without affecting requests in flight. The catalog file is found
+# again on each check, so a columnar catalog first written after the app started replaces the Excel catalog
+catalog_store = CatalogStore(catalog_file=catalog_file, load_catalog=load_shared_catalog,
+                             locate_catalog=lambda: find_catalog_file(excel_file))
+# Reads the price changes the scraper appends to the history next to the catalog, one part at a time
+price_history = PriceHistoryStore(history_dir=get_history_dir(excel_file))
+# Caches the candidate parts for each component at common target prices, shared by every request
+candidate_cache = CandidatePoolCache(max_entries=CANDIDATE_CACHE_SIZE, price_step=CANDIDATE_PRICE_STEP)
+
+
+# Generates builds for the pool from whichever catalog snapshot is current when each build is made
+def generate_pooled_build(budget):
+    snapshot = catalog_store.current()
+    return generate_build_from_excel(build_price=budget, complete_parts_df=None,
+                                     catalog_index=snapshot.index, candidate_cache=candidate_cache)
+
+
+# Keeps builds for common budgets generated ahead of time in the background, so requests rarely generate inline
+build_pool = BuildPool(budgets=BUILD_POOL_BUDGETS, depth=BUILD_POOL_DEPTH,
+                       refill_per_second=BUILD_POOL_REFILL_PER_SECOND, generate_build=generate_pooled_build,
+                       max_failures=BUILD_POOL_MAX_FAILURES, retry_backoff=BUILD_POOL_RETRY_BACKOFF)
+build_pool.start()
+
+# Pre-generated builds come from the old catalog once a new version is swapped in, so they are thrown away
+catalog_store.add_listener(lambda snapshot: build_pool.clear())
+# Holds the serialised and compressed parts list of the current catalog version, built once rather than per request
+parts_payload_cache = PartsPayloadCache()
+# The payload of a new version is built as soon as it is swapped in, so no request waits for it
+catalog_store.add_listener(parts_payload_cache.get)
+# The name search index is likewise built when each version loads rather than on the first search
+catalog_store.current().build_search_index()
+catalog_store.add_listener(lambda snapshot: snapshot.build_search_index())
+# Watches the catalog file so catalog updates written by the scraper are picked up without a restart
+catalog_store.start_watching(interval=CATALOG_WATCH_INTERVAL)
 
 
 # Decorator function used to protect from unregistered calls by requiring a valid token
 def jwt_required(func):
     @wraps(func)
     def jwt_required_wrapper(*args, **kwargs):
-        # Checks for valid token
-        token = None
-        if 'x-access-token' in request.headers:
-            token = request.headers['x-access-token']
-        if not token:
-            return make_response(jsonify({'message': 'Token is missing'}, 401))
-
-        # Decrypts and checks the token
+        # Checks for a valid token that hasn't been blacklisted, the claims are kept for the rest of the request
         try:
-            data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-        except Exception as e:
-            return make_response(jsonify({'message': f'Error decoding token: {str(e)}'}, 401))
-
-        # Checks the token hasn't already been blacklisted
-        blacklist_token = blacklisted_tokens_collection.find_one({"token": token})
-        if blacklist_token is not None:
-            return make_response(jsonify({"message": "Token is blacklisted, can no longer be used"}), 401)
+            get_request_claims(authenticator)
+        except TokenError as e:
+            return make_response(jsonify({'message': str(e)}), 401)
 
         return func(*args, **kwargs)
 
@@ -75,15 +122,14 @@ def jwt_required(func):
 def admin_required(func):
     @wraps(func)
     def admin_required_wrapper(*args, **kwargs):
-        token = None
-        if 'x-access-token' in request.headers:
-            token = request.headers['x-access-token']
-        if not token:
-            return make_response(jsonify({'message': 'Token is missing'}, 401))
+        # Reuses the claims jwt_required already checked rather than decoding the token again
+        try:
+            data = get_request_claims(authenticator)
+        except TokenError as e:
+            return make_response(jsonify({'message': str(e)}), 401)
 
-        data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
         # Checks for admin status embedded in token
-        if data['admin']:
+        if data.get('admin'):
             return func(*args, **kwargs)
         else:
             return make_response(jsonify({'message': 'Admin Access is required'}), 401)
@@ -133,9 +179,12 @@ def login():
 
 @app.route('/api/v1.0/logout', methods=['GET'])
 def logout():
-    # Gets the token, and writes it to a database of blacklisted tokens
-    token = request.headers['x-access-token']
-    blacklisted_tokens_collection.insert_one({"token": token})
+    # Gets the token, and writes it to a database of blacklisted tokens until it expires
+    # Tokens that are invalid, expired or already blacklisted can't be used anyway so aren't stored
+    try:
+        authenticator.revoke(request.headers.get('x-access-token'))
+    except PyMongoError as e:
+        return make_response(jsonify({"message": f"Logout failed: {e}"}), 500)
     return make_response(jsonify({"message": "logout successful"}), 200)
 
 
@@ -172,13 +221,7 @@ def delete_user(id):
     # Checks for a token that contains the username of the account,
     # This is used to ensure that the person calling this endpoint is correct
     # preventing people from calling the endpoint to delete others accounts
-    token = None
-    if 'x-access-token' in request.headers:
-        token = request.headers['x-access-token']
-    if not token:
-        return make_response(jsonify({'message': 'Token is missing'}, 401))
-
-    data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+    data = get_request_claims(authenticator)
 
     # Requires that the person deleting the account is logged into the account
     username = data['user']
@@ -241,10 +284,20 @@ def new_pc_build():
 
     # Convert the price to an int and verify it is within budget
     new_build_price = int(request.json['price'])
-    if new_build_price > 2000:
+    if new_build_price > MAX_BUILD_PRICE:
         return make_response(jsonify({"message": "Price is too high to generate build"}), 400)
-    # Generates a new build object using params
-    new_build = generate_build_from_excel(build_price=new_build_price, complete_parts_df=complete_parts_df)
+    # Generates a new build object using params, builds are picked at random unless optimize mode is requested
+    build_mode = request.json.get('mode', 'random')
+    # Random builds are taken from the pre-generated pool when one is ready, otherwise generated inline
+    new_build = build_pool.take(new_build_price) if build_mode == 'random' else None
+    if new_build is None:
+        snapshot = catalog_store.current()
+        try:
+            new_build = generate_build_from_excel(build_price=new_build_price, complete_parts_df=None,
+                                                  catalog_index=snapshot.index, mode=build_mode,
+                                                  candidate_cache=candidate_cache)
+        except ValueError as e:
+            return make_response(jsonify({"message": f"Error while generating new build: {e}"}), 400)
 
     # Checks for build validity
     if not new_build.is_valid():
@@ -256,11 +309,64 @@ def new_pc_build():
                         builds_index_collection=build_index_collection,
                         completed_build=new_build,
                         user_id=user_id)
-        return make_response(jsonify({"Build": new_build.to_dict(user_id=user_id)}))
+        return make_response(jsonify({"Build": new_build.to_dict(user_id=user_id),
+                                      "fallback_slots": new_build.fallback_slots}))
     except PyMongoError as e:
         return make_response(jsonify({"Message": str(e)}), 400)
 
 
+@app.route('/api/v1.0/builds/generate-batch', methods=['POST'])
+@jwt_required
+def generate_pc_build_batch():
+    user_id = None
+    if 'x-user-id' in request.headers:
+        user_id = str(request.headers['x-user-id'])  # Makes sure the id is a string
+    if not user_id:
+        return make_response(jsonify({'message': 'user id not provided'}), 400)
+
+    data = request.json
+    budgets = data.get('prices') if isinstance(data, dict) else None
+    if not isinstance(budgets, list) or len(budgets) == 0:
+        return make_response(jsonify({"message": "A list of prices must be provided"}), 400)
+    if len(budgets) > MAX_BATCH_BUILDS:
+        return make_response(jsonify({"message": f"No more than {MAX_BATCH_BUILDS} builds can be generated "
+                                                 f"at once"}), 400)
+
+    try:
+        budgets = [int(budget) for budget in budgets]
+    except (TypeError, ValueError):
+        return make_response(jsonify({"message": "Prices must be numeric"}), 400)
+    if max(budgets) > MAX_BUILD_PRICE:
+        return make_response(jsonify({"message": "Price is too high to generate build"}), 400)
+
+    # A seed makes the batch reproducible, it must be a whole number that isn't negative
+    seed = data.get('seed')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        return make_response(jsonify({"message": "seed must be a non-negative integer"}), 400)
+
+    snapshot = catalog_store.current()
+    try:
+        new_builds = generate_builds_batch(budgets=budgets, complete_parts_df=None,
+                                           seed=seed, catalog_index=snapshot.index)
+    except ValueError as e:
+        return make_response(jsonify({"message": f"Error while generating builds: {e}"}), 400)
+
+    # Only keeps the valid builds, the position of any build that couldn't be generated is reported back
+    valid_builds = [new_build for new_build in new_builds if new_build.is_valid()]
+    invalid_positions = [position for position, new_build in enumerate(new_builds) if not new_build.is_valid()]
+
+    if data.get('save', False):
+        if not write_new_builds(builds_collection=builds_collection,
+                                builds_index_collection=build_index_collection,
+                                completed_builds=valid_builds,
+                                user_id=user_id):
+            return make_response(jsonify({"message": "Builds could not be saved"}), 500)
+
+    return make_response(jsonify({"Builds": [new_build.to_dict(user_id=user_id) for new_build in valid_builds],
+                                  "fallback_slots": [new_build.fallback_slots for new_build in valid_builds],
+                                  "invalid_positions": invalid_positions}), 200)
+
+
 @app.route('/api/v1.0/builds/<string:build_id>/delete', methods=['DELETE'])
 @jwt_required
 def delete_pc_build(build_id):
@@ -314,6 +420,62 @@ def edit_pc_build(build_id):
         return make_response(jsonify({"message": f"Error: {e}"}), 400)
 
 
+@app.route('/api/v1.0/builds/<string:build_id>/alternatives', methods=['GET'])
+@jwt_required
+def get_part_alternatives(build_id):
+    # The slot of the build to find alternatives for, and how many to return
+    slot = request.args.get('slot')
+    if not slot:
+        return make_response(jsonify({"message": "slot must be provided"}), 400)
+    try:
+        k = int(request.args.get('k', 10))
+        budget = float(request.args['budget']) if 'budget' in request.args else None
+    except ValueError:
+        return make_response(jsonify({"message": "k and budget must be numeric"}), 400)
+    if not 0 < k <= MAX_ALTERNATIVE_PARTS:
+        return make_response(jsonify({"message": f"k must be between 1 and {MAX_ALTERNATIVE_PARTS}"}), 400)
+
+    # Only the current part and overall price are needed, the rest of the parts come from the in-memory catalog
+    stored_slot = get_stored_slot_name(slot)
+    # Only part slots are looked up, other fields of the build such as its id or price aren't parts
+    if stored_slot not in STORED_SLOT_NAMES and stored_slot not in BUILD_SLOTS:
+        return make_response(jsonify({"message": f"slot must be one of {', '.join(BUILD_SLOTS)}"}), 400)
+    try:
+        build = fetch_build(builds_collection=builds_collection, build_id=build_id,
+                            fields=[stored_slot, "OverallPrice"])
+    except PyMongoError as e:
+        return make_response(jsonify({"message": f"Error: {e}"}), 500)
+    if build is None:
+        return make_response(jsonify({"message": f"Build could not be found - {build_id}"}), 404)
+    current_part = build.get(stored_slot)
+    if not isinstance(current_part, dict) or "price" not in current_part or "value" not in current_part:
+        return make_response(jsonify({"message": f"Build has no {slot} part"}), 400)
+
+    # Alternatives are priced closest to the current part, or if a budget is given, closest to what's left of it
+    # once the other parts are paid for without going over
+    target_price = current_part["price"]
+    remaining_budget = None
+    if budget is not None:
+        remaining_budget = round(budget - (build.get("OverallPrice", 0) - current_part["price"]), 2)
+        target_price = remaining_budget
+
+    try:
+        alternatives = fetch_alternative_parts(catalog_index=catalog_store.current().index, slot=slot,
+                                               target_price=target_price, k=k, max_price=remaining_budget,
+                                               exclude_name=current_part["value"])
+    except ValueError as e:
+        return make_response(jsonify({"message": str(e)}), 400)
+
+    return make_response(jsonify({
+        "slot": stored_slot,
+        "current": current_part,
+        "remaining_budget": remaining_budget,
+        "alternatives": [{"type": part_type, "value": name, "price": price,
+                          "price_difference": round(price - current_part["price"], 2)}
+                         for part_type, name, price in alternatives]
+    }), 200)
+
+
 @app.route('/api/v1.0/builds/<string:build_id>/replace', methods=['PUT'])
 @jwt_required
 def replace_pc_build(build_id):
@@ -341,6 +503,20 @@ def get_all_builds():
     if not user_id:
         return make_response(jsonify({'message': 'user id not provided'}), 400)
 
+    # Streams the builds one per line as they are read from the database, if the client asked for NDJSON
+    if wants_ndjson(request):
+        try:
+            builds = iter_user_builds(builds_collection=builds_collection,
+                                      builds_index_collection=build_index_collection,
+                                      user_id=user_id)
+            # Reads the first build before the response starts, so database errors still get an error status
+            first_build = next(builds, None)
+        except PyMongoError as e:
+            return make_response(jsonify({"message": f"Error: {e}"}), 500)
+        if first_build is None:
+            return make_ndjson_response([])
+        return make_ndjson_response(itertools.chain([first_build], builds))
+
     try:
         # Fetch all builds created by the user
         user_created_builds = fetch_user_builds(builds_collection=builds_collection,
@@ -358,21 +534,101 @@ def get_all_builds():
 # Then it can be used to edit the build on the frontend etc...
 @app.route('/api/v1.0/parts/fetch_all', methods=['GET'])
 def fetch_all_parts():
+    snapshot = catalog_store.current()
+    if wants_ndjson(request):
+        # Streams one [type, name, price] part per line, decoding the names a chunk at a time
+        if len(snapshot.catalog) == 0:
+            return make_response(jsonify({'message': 'No Parts Could be found'}), 404)
+        return make_ndjson_response(snapshot.catalog.iter_lists(),
+                                    headers={'X-Catalog-Version': snapshot.version})
+
     try:
-        # Fetch all parts stored in Excel
-        parts_list = complete_parts_df.values.tolist()
+        # Fetch all parts stored in Excel, serialised once per catalog version
+        parts_payload = parts_payload_cache.get(snapshot)
     except Exception as e:
         # Handle any errors that may occur
         return make_response(jsonify({'message': f'Parts list could not be converted to list: {e}'}), 400)
 
-    # If a full list is found return it
-    if len(parts_list) > 0:
-        return make_response(jsonify({'parts': parts_list}), 200)
+    # If a full list is found return it, or a 304 if the client already has this version
+    if parts_payload.num_parts > 0:
+        return make_payload_response(payload=parts_payload, request=request)
     # Otherwise return a message denoting nothing could be found
     else:
         return make_response(jsonify({'message': 'No Parts Could be found'}), 404)
 
 
+# Lets the frontend page through the parts of one type in a price range, rather than downloading the whole catalog
+@app.route('/api/v1.0/parts', methods=['GET'])
+def query_parts():
+    part_type = request.args.get('type')
+    if not part_type:
+        return make_response(jsonify({"message": "type must be provided"}), 400)
+    try:
+        min_price = float(request.args.get('min', 0))
+        max_price = float(request.args['max']) if 'max' in request.args else None
+        limit = int(request.args.get('limit', PARTS_PAGE_SIZE))
+    except ValueError:
+        return make_response(jsonify({"message": "min, max and limit must be numeric"}), 400)
+    if not 0 < limit <= MAX_PARTS_PAGE_SIZE:
+        return make_response(jsonify({"message": f"limit must be between 1 and {MAX_PARTS_PAGE_SIZE}"}), 400)
+
+    snapshot = catalog_store.current()
+    try:
+        parts, next_cursor = fetch_parts_page(catalog_index=snapshot.index, part_type=part_type,
+                                              min_price=min_price, max_price=max_price, limit=limit,
+                                              cursor=request.args.get('cursor'),
+                                              sort=request.args.get('sort', 'asc'))
+    except ValueError as e:
+        return make_response(jsonify({"message": str(e)}), 400)
+
+    return make_response(jsonify({
+        "parts": [{"type": part_type, "value": name, "price": price} for part_type, name, price in parts],
+        "next_cursor": next_cursor,
+        "catalog_version": snapshot.version
+    }), 200)
+
+
+# Backs autocomplete on the frontend, matching each word of the query against the start of the words in part names
+@app.route('/api/v1.0/parts/search', methods=['GET'])
+def search_parts():
+    query = request.args.get('q', '')
+    if not query.strip():
+        return make_response(jsonify({"message": "q must be provided"}), 400)
+    try:
+        limit = int(request.args.get('limit', SEARCH_RESULTS_SIZE))
+    except ValueError:
+        return make_response(jsonify({"message": "limit must be numeric"}), 400)
+    if not 0 < limit <= MAX_SEARCH_RESULTS:
+        return make_response(jsonify({"message": f"limit must be between 1 and {MAX_SEARCH_RESULTS}"}), 400)
+
+    snapshot = catalog_store.current()
+    rows = snapshot.search_index.search(query=query, part_type=request.args.get('type'), limit=limit)
+    return make_response(jsonify({
+        "parts": [snapshot.catalog[row].to_dict() for row in rows.tolist()],
+        "catalog_version": snapshot.version
+    }), 200)
+
+
+# Returns the price changes of a part over time, a part's name may contain slashes so the rest of the path is used
+@app.route('/api/v1.0/parts/<path:part>/history', methods=['GET'])
+def get_part_history(part):
+    part_type = request.args.get('type')
+    part_types = [part_type] if part_type else price_history.find_types(part)
+
+    history = []
+    for part_type in part_types:
+        changes = price_history.history(part_type=part_type, name=part)
+        if changes:
+            # A price of null marks when the part stopped being listed
+            prices = [{"recorded_at": datetime.datetime.fromtimestamp(recorded_at, datetime.timezone.utc).isoformat(),
+                       "price": price} for recorded_at, price in changes]
+            history.append({"type": part_type, "prices": prices})
+
+    if not history:
+        return make_response(jsonify({"message": "No price history found for this part"}), 404)
+    return make_response(jsonify({"name": part, "history": history}), 200)
+
+
 """
     ADMIN ROUTES
 """
@@ -386,15 +642,45 @@ def get_app_data():
     app_data = fetch_app_info(db=database, user_collection=users_collection, build_collection=builds_collection)
     # Returns data if present or an error message if not
     if app_data:
+        app_data["catalog"] = catalog_store.current().info()
+        app_data["candidate_cache"] = candidate_cache.stats()
+        app_data["build_pool"] = build_pool.stats()
         return make_response(jsonify({'AppInfo': app_data}), 200)
     else:
         return make_response(jsonify({'message': 'No data found'}), 404)
 
 
+@app.route('/api/v1.0/admin/catalog/reload', methods=['POST'])
+@jwt_required
+@admin_required
+def reload_catalog():
+    # Loads the catalog file into a new snapshot and swaps it in, requests in flight finish on the old version
+    previous_version = catalog_store.current().version
+    try:
+        reloaded = catalog_store.reload()
+    except Exception as e:
+        return make_response(jsonify({'message': f'Catalog could not be reloaded: {e}'}), 500)
+
+    return make_response(jsonify({'reloaded': reloaded,
+                                  'previous_version': previous_version,
+                                  'catalog': catalog_store.current().info()}), 200)
+
+
 @app.route('/api/v1.0/admin/fetch-all-users', methods=['GET'])
 @jwt_required
 @admin_required
 def get_all_users_data():
+    # Streams the users one per line as they are read from the database, if the client asked for NDJSON
+    if wants_ndjson(request):
+        users = iter_all_users(collection=users_collection)
+        try:
+            first_user = next(users, None)
+        except PyMongoError as e:
+            return make_response(jsonify({'message': f'Error: {e}'}), 500)
+        if first_user is None:
+            return make_response(jsonify({'message': 'No user info could be found'}), 404)
+        return make_ndjson_response(itertools.chain([first_user], users))
+
     # Fetches a list of users for the admin
     user_info = fetch_all_users(collection=users_collection)
     # Returns users list if present or an error message if not
@@ -0,0 +1,186 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Union
+
+import jwt
+from flask import g, request
+
+
+class TokenError(Exception):
+    """
+    Raised when a request's token is missing, invalid or blacklisted, its message is sent back to the client.
+    """
+
+
+def hash_token(token: str) -> str:
+    """
+    Hashes a token so it can be used as a cache key without keeping the token itself.
+
+    :param token: Encoded JWT.
+    :return: Hex digest of the SHA-256 hash of the token.
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class TokenClaimsCache:
+
+    def __init__(self, max_entries: int, max_ttl: Union[int, float]):
+        """
+        Initialises a bounded cache of the claims of tokens whose signature was verified.
+
+        Entries expire at the token's exp, or after max_ttl seconds if sooner. The least recently used entry is
+        evicted once there are max_entries.
+
+        :param max_entries: Most tokens cached.
+        :param max_ttl: Most seconds a token's claims are reused without verifying it again.
+        :raises ValueError: If max_entries or max_ttl isn't positive.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        if max_ttl <= 0:
+            raise ValueError("max_ttl must be positive.")
+
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, token: str) -> Union[dict, None]:
+        """
+        Fetches the claims of a cached token.
+
+        :param token: Encoded JWT.
+        :return: The token's claims, or None if it isn't cached or its entry has expired.
+        """
+        key = hash_token(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, claims: dict) -> None:
+        """
+        Caches the claims of a token whose signature was verified.
+
+        :param token: Encoded JWT.
+        :param claims: Claims decoded from the token.
+        """
+        expires_at = time.time() + self.max_ttl
+        if 'exp' in claims:
+            expires_at = min(expires_at, claims['exp'])
+        key = hash_token(token)
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Removes a token from the cache, so it is checked again the next time it is used.
+
+        :param token: Encoded JWT.
+        """
+        with self._lock:
+            self._entries.pop(hash_token(token), None)
+
+    def stats(self) -> dict:
+        """
+        Fetches the size and hit rate of the cache.
+
+        :return: Dictionary of the number of entries, hits and misses.
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class TokenAuthenticator:
+
+    def __init__(self, secret_key: str, blacklist, cache: TokenClaimsCache):
+        """
+        Initialises the checks a request's token has to pass, its signature and expiry and that it isn't
+        blacklisted.
+
+        :param secret_key: Key the tokens are signed with.
+        :param blacklist: TokenBlacklist of the tokens of users that logged out.
+        :param cache: Cache of the claims of verified tokens.
+        """
+        self.secret_key = secret_key
+        self.blacklist = blacklist
+        self.cache = cache
+
+    def authenticate(self, token: Union[str, None]) -> dict:
+        """
+        Checks a token, only decoding it if it isn't cached. Every token is checked against the blacklist, which only
+        reaches the database for tokens its filter finds.
+
+        :param token: Encoded JWT, None if the request didn't have one.
+        :return: Claims decoded from the token.
+        :raises TokenError: If the token is missing, can't be decoded, has expired or is blacklisted.
+        """
+        if not token:
+            raise TokenError("Token is missing")
+
+        claims = self.cache.get(token)
+        decoded = claims is None
+        if decoded:
+            try:
+                claims = jwt.decode(token, self.secret_key, algorithms=['HS256'])
+            except Exception as e:
+                raise TokenError(f"Error decoding token: {str(e)}") from e
+
+        # Checks the token hasn't already been blacklisted
+        if self.blacklist.is_blacklisted(token):
+            self.cache.invalidate(token)
+            raise TokenError("Token is blacklisted, can no longer be used")
+
+        if decoded:
+            self.cache.put(token, claims)
+        return claims
+
+    def revoke(self, token: Union[str, None]) -> bool:
+        """
+        Blacklists a token so it can no longer be used, until it expires.
+
+        :param token: Encoded JWT, None if the request didn't have one.
+        :return: True if the token was blacklisted, False if it was already unusable so had nothing to revoke.
+        :raises PyMongoError: If the token can't be stored in the blacklist.
+        """
+        try:
+            claims = self.authenticate(token)
+        except TokenError:
+            return False
+        self.blacklist.revoke(token, expires_at=claims.get('exp'))
+        self.cache.invalidate(token)
+        return True
+
+
+def get_request_claims(authenticator: TokenAuthenticator) -> dict:
+    """
+    Checks the current request's token once, keeping the outcome on flask.g for every decorator and route that asks.
+
+    :param authenticator: TokenAuthenticator the token is checked with.
+    :return: Claims decoded from the request's x-access-token header.
+    :raises TokenError: If the token is missing, can't be decoded, has expired or is blacklisted.
+    """
+    if 'auth_claims' not in g:
+        try:
+            g.auth_claims = authenticator.authenticate(request.headers.get('x-access-token'))
+        except TokenError as e:
+            g.auth_claims = e
+    if isinstance(g.auth_claims, TokenError):
+        raise g.auth_claims
+    return g.auth_claims
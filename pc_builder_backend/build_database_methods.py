@@ -1,6 +1,9 @@
+from typing import Iterator, Union
+
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
 
+from pc_builder_backend.constants import STREAM_BATCH_SIZE
 from pc_builder_backend.pc_build import PCBuild
 from logger_config.logger_config import create_logger
 
@@ -51,6 +54,40 @@ def write_new_build(builds_collection: Collection,
         return False
 
 
+def write_new_builds(builds_collection: Collection,
+                     builds_index_collection: Collection,
+                     completed_builds: list,
+                     user_id: str) -> bool:
+    """
+    Writes a batch of new builds to MongoDB collections with a single insert.
+
+    :param builds_collection: MongoDB collection for storing builds.
+    :param builds_index_collection: MongoDB collection for storing build indexes.
+    :param completed_builds: List of completed PCBuild objects to be stored.
+    :param user_id: User identifier associated with the builds.
+    :return: A True/False value depending on if the write was successful.
+    """
+    builds = [completed_build.to_dict(user_id=user_id) for completed_build in completed_builds]
+    if not builds:
+        return True
+
+    try:
+        builds_collection.insert_many(builds, ordered=False)
+        build_logger.info(f"{len(builds)} new builds added to MongoDB collection")
+
+        # Adds every new build id to the user's index, creating the index entry if it doesn't exist yet
+        builds_index_collection.update_one(
+            {"user_id": user_id},
+            {'$push': {'created_build_list': {'$each': [build["build_id"] for build in builds]}}},
+            upsert=True
+        )
+        return True
+
+    except PyMongoError as e:
+        build_logger.error(f"Batch of builds failed to be added {e}")
+        return False
+
+
 def edit_build(builds_collection: Collection, build_id: str, part_name: str, new_part: dict) -> bool:
     """
     Edits a specific build in the MongoDB collection.
@@ -201,3 +238,45 @@ def fetch_user_builds(builds_collection: Collection, builds_index_collection: Co
             fetched_builds.append(build)
 
     return fetched_builds
+
+
+def iter_user_builds(builds_collection: Collection, builds_index_collection: Collection, user_id: str,
+                     batch_size: int = STREAM_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Lazily fetches the builds associated with a user, in the order they were created.
+
+    Builds are fetched a batch at a time with one query per batch, so only a batch of builds is held in memory.
+
+    :param builds_collection: MongoDB collection for storing builds.
+    :param builds_index_collection: MongoDB collection for storing build indexes.
+    :param user_id: User identifier associated with the builds.
+    :param batch_size: Number of builds fetched by each query.
+    :return: Generator of the user's builds, builds that no longer exist are skipped.
+    """
+    user_build_ids = builds_index_collection.find_one({"user_id": user_id}, {"created_build_list": 1})
+    if user_build_ids is None:
+        return
+
+    build_ids = user_build_ids.get("created_build_list", [])
+    for start in range(0, len(build_ids), batch_size):
+        batch_ids = build_ids[start:start + batch_size]
+        builds = {build["build_id"]: build
+                  for build in builds_collection.find({"build_id": {"$in": batch_ids}}, {"_id": 0})}
+        for build_id in batch_ids:
+            if build_id in builds:
+                yield builds[build_id]
+
+
+def fetch_build(builds_collection: Collection, build_id: str, fields: list = None) -> Union[dict, None]:
+    """
+    Fetches a single build from the MongoDB collection.
+
+    :param builds_collection: MongoDB collection for storing builds.
+    :param build_id: ID of the build to be fetched.
+    :param fields: Fields of the build to fetch, every field is fetched if not provided.
+    :return: Dictionary of the build, or None if no build has that ID.
+    """
+    projection = {"_id": 0}
+    if fields is not None:
+        projection.update({field: 1 for field in fields})
+    return builds_collection.find_one({"build_id": build_id}, projection)
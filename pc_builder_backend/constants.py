@@ -22,5 +22,49 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 RELATIONAL_DATABASE_URL = os.getenv("RELATIONAL_DATABASE_URL")
 RELATIONAL_TABLE_NAME = os.getenv("RELATIONAL_TABLE_NAME")
 
+# Directory the log files are written to, logs/ in the project root if not set
+LOG_DIR = os.getenv("LOG_DIR")
+
+# Whether the scraper also exports the catalog to components.xlsx alongside its columnar catalog file
+EXPORT_CATALOG_XLSX = os.getenv("EXPORT_CATALOG_XLSX", "true").lower() == "true"
+
 # Functional Args
 PART_COST_RANGE = 25  # Outlines the range of part price e.g. x-25% -> x+25%
+FALLBACK_COST_RANGES = (50, 100)  # Wider part price ranges tried in turn when nothing is within PART_COST_RANGE
+FALLBACK_NEAREST_PARTS = 5  # Number of closest priced parts used when even the widest range has nothing
+MAX_BUILD_PRICE = 2000  # Highest budget a build can be generated for
+MAX_BATCH_BUILDS = 5000  # Limits the number of builds generated in a single batch request
+OPTIMIZE_TIME_BUDGET_MS = 50  # Time the optimize build mode may search for before settling on its best build
+CANDIDATE_CACHE_SIZE = 512  # Number of candidate part pools kept in the build generation cache
+CANDIDATE_PRICE_STEP = 5  # Target prices are rounded to this step so similar budgets share candidate pools
+BUILD_POOL_BUDGETS = range(100, MAX_BUILD_PRICE + 1, 100)  # Common budgets that have builds generated ahead of time
+BUILD_POOL_DEPTH = 20  # Number of ready builds held for each pooled budget
+BUILD_POOL_REFILL_PER_SECOND = 200  # Most builds generated per second in the background to refill the pool
+BUILD_POOL_MAX_FAILURES = 5  # Failed builds in a row before a pooled budget is left to be generated inline
+BUILD_POOL_RETRY_BACKOFF = 1  # Seconds a pooled budget waits after a failed build, doubling with each failure
+MAX_ALTERNATIVE_PARTS = 50  # Most alternative parts returned for a slot of a build
+CATALOG_WATCH_INTERVAL = 30  # Seconds between checks of the catalog file for changes written by the scraper
+PARTS_PAGE_SIZE = 50  # Parts returned per page of the parts query when no limit is given
+MAX_PARTS_PAGE_SIZE = 200  # Most parts returned per page of the parts query
+SEARCH_RESULTS_SIZE = 10  # Parts returned by a name search when no limit is given
+MAX_SEARCH_RESULTS = 50  # Most parts returned by a name search
+STREAM_BATCH_SIZE = 500  # Records read from the database at once when a listing is streamed
+SCRAPER_MAX_WORKERS = 8  # Most pages the scraper fetches at once
+SCRAPER_MAX_PER_HOST = 4  # Most pages the scraper fetches at once from a single site
+SCRAPER_TIMEOUT = 30  # Seconds the scraper waits for a page before giving up on it
+SCRAPER_MAX_PAGES = 50  # Most pages scraped from one category, however many its pagination lists
+SCRAPER_RATE_PER_HOST = 10  # Requests per second the scraper sends a single site on average
+SCRAPER_BURST_PER_HOST = 10  # Requests the scraper may send a single site back to back before the rate applies
+SCRAPER_MAX_RETRIES = 3  # Times a page is retried after a rate limit, server error or dropped connection
+SCRAPER_BACKOFF_BASE = 0.5  # Seconds the scraper backs off for before its first retry, doubling with each retry
+SCRAPER_BACKOFF_MAX = 30  # Most seconds the scraper backs off for before a retry
+SCRAPER_RETRY_ROUNDS = 1  # Times the pages that still failed are fetched again once every other page is done
+SCRAPER_PARSE_WORKERS = os.cpu_count() or 1  # Worker processes scraping the fetched pages
+SCRAPER_PARSE_QUEUE_SIZE = 32  # Most fetched pages waiting for a parse worker before fetching pauses
+PRICE_HISTORY_MAX_SEGMENTS = 64  # Segments the price history is left to grow to before the scraper merges them
+CATALOG_MIN_KEPT_FRACTION = 0.5  # Fraction of the last run's parts a scraped catalog must list to be written
+AUTH_CACHE_SIZE = 10000  # Most verified tokens kept, so their repeat requests skip decoding them
+AUTH_CACHE_MAX_TTL = 60  # Most seconds the claims of a verified token are reused before it is verified again
+BLACKLIST_SYNC_INTERVAL = 10  # Seconds between syncs of the blacklist filter, how long a token revoked elsewhere works
+BLACKLIST_FILTER_CAPACITY = 100_000  # Fewest revoked tokens the blacklist filter is sized for
+BLACKLIST_FILTER_ERROR_RATE = 0.001  # Chance of a token that wasn't revoked being looked up in the database
@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Union
+
+from pc_builder_backend.pc_build import PCBuild
+
+
+class BuildPool:
+
+    def __init__(self, budgets: Iterable[int], depth: int, refill_per_second: Union[int, float],
+                 generate_build: Callable[[int], PCBuild], max_failures: int = 5,
+                 retry_backoff: Union[int, float] = 1.0):
+        """
+        Initialises a pool of ready generated builds for each common budget, kept topped up by a background thread.
+
+        A budget whose build fails, either by raising or by not being valid, is backed off before it is tried again,
+        doubling the wait with each failure in a row. It is only given up on as unfillable after max_failures in a
+        row, so an unlucky random draw or a passing error doesn't leave it unpooled until the catalog next changes.
+
+        :param budgets: Budgets builds are pre-generated for.
+        :param depth: Number of ready builds held for each budget.
+        :param refill_per_second: Most builds the background thread generates per second.
+        :param generate_build: Function taking a budget and returning a newly generated PCBuild.
+        :param max_failures: Failed builds in a row before a budget is marked unfillable.
+        :param retry_backoff: Seconds a budget is backed off for after its first failure.
+        :raises ValueError: If the depth, refill rate, failure limit or backoff isn't positive.
+        """
+        if depth <= 0:
+            raise ValueError("depth must be positive.")
+        if refill_per_second <= 0:
+            raise ValueError("refill_per_second must be positive.")
+        if max_failures <= 0:
+            raise ValueError("max_failures must be positive.")
+        if retry_backoff <= 0:
+            raise ValueError("retry_backoff must be positive.")
+
+        self.depth = depth
+        self.refill_per_second = refill_per_second
+        self.max_failures = max_failures
+        self.retry_backoff = retry_backoff
+        self._generate_build = generate_build
+
+        self._pools = {int(budget): deque() for budget in budgets}
+        # Times builds were taken from each budget that haven't been replaced yet, used to measure refill lag
+        self._taken_at = {budget: deque() for budget in self._pools}
+        # Failed builds in a row for each budget, and when a budget that failed may be tried again
+        self._failures = {}
+        self._retry_at = {}
+        # Budgets that failed max_failures times in a row, retried after the next clear
+        self._unfillable = set()
+        # Incremented whenever the pool is cleared so builds generated from an old catalog are thrown away
+        self._epoch = 0
+
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self._refills = 0
+        self._total_refill_lag = 0.0
+        self._max_refill_lag = 0.0
+
+    def start(self) -> None:
+        """
+        Starts the background thread that keeps the pool topped up.
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._refill_loop, name="build-pool-refill", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Union[int, float] = None) -> None:
+        """
+        Stops the background thread.
+
+        :param timeout: Seconds to wait for the thread to finish.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def take(self, budget: int) -> Union[PCBuild, None]:
+        """
+        Takes a ready build for a budget out of the pool.
+
+        :param budget: The budget of the build wanted.
+        :return: A pre-generated PCBuild, or None if the budget isn't pooled or none are ready.
+        """
+        with self._condition:
+            pool = self._pools.get(budget)
+            if not pool:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._taken_at[budget].append(time.monotonic())
+            self._condition.notify_all()
+            return pool.popleft()
+
+    def clear(self) -> None:
+        """
+        Throws away every ready build, used when the catalog changes so stale builds aren't handed out.
+        """
+        with self._condition:
+            self._epoch += 1
+            self._unfillable.clear()
+            self._failures.clear()
+            self._retry_at.clear()
+            for pool in self._pools.values():
+                self.discarded += len(pool)
+                pool.clear()
+            # Builds taken before the clear are replaced by new ones, not measured as refills
+            for taken_at in self._taken_at.values():
+                taken_at.clear()
+            self._condition.notify_all()
+
+    def _next_budget(self) -> Union[int, None]:
+        """
+        Finds the budget with the fewest ready builds that isn't full or backed off, the condition lock must already
+        be held.
+
+        :return: The budget to generate a build for next, None if every budget is full or backed off.
+        """
+        now = time.monotonic()
+        fillable = [budget for budget in self._pools
+                    if budget not in self._unfillable and self._retry_at.get(budget, 0) <= now]
+        budget = min(fillable, key=lambda pooled_budget: len(self._pools[pooled_budget]), default=None)
+        if budget is None or len(self._pools[budget]) >= self.depth:
+            return None
+        return budget
+
+    def _next_retry_wait(self) -> Union[float, None]:
+        """
+        Works out how long until the first backed off budget may be tried again, the lock must already be held.
+
+        :return: Seconds to wait, None if no budget that needs builds is backed off.
+        """
+        retry_times = [retry_at for budget, retry_at in self._retry_at.items()
+                       if budget not in self._unfillable and len(self._pools[budget]) < self.depth]
+        if not retry_times:
+            return None
+        return max(0.0, min(retry_times) - time.monotonic())
+
+    def _record_failure(self, budget: int) -> None:
+        """
+        Backs off a budget whose build failed, marking it unfillable once it has failed max_failures times in a row.
+        The lock must already be held.
+
+        :param budget: The budget the build failed for.
+        """
+        failures = self._failures.get(budget, 0) + 1
+        self._failures[budget] = failures
+        if failures >= self.max_failures:
+            # Invalid builds are never handed out, the budget is left to be generated inline
+            self._unfillable.add(budget)
+            self._retry_at.pop(budget, None)
+        else:
+            self._retry_at[budget] = time.monotonic() + self.retry_backoff * 2 ** (failures - 1)
+
+    def _refill_loop(self) -> None:
+        """
+        Generates builds for the emptiest budget until every budget is full, then waits for builds to be taken.
+        """
+        interval = 1 / self.refill_per_second
+        while True:
+            with self._condition:
+                budget = self._next_budget()
+                while self._running and budget is None:
+                    # Wakes up when a backed off budget may be tried again, or when a build is taken
+                    self._condition.wait(self._next_retry_wait())
+                    budget = self._next_budget()
+                if not self._running:
+                    return
+                epoch = self._epoch
+
+            started = time.monotonic()
+            try:
+                new_build = self._generate_build(budget)
+            except Exception as e:
+                print(f"Build pool could not generate a build for {budget}: {e}")
+                new_build = None
+
+            with self._condition:
+                # Builds from before a clear came from the old catalog and are thrown away
+                if epoch == self._epoch:
+                    if new_build is not None and new_build.is_valid():
+                        self._pools[budget].append(new_build)
+                        self._record_refill(budget)
+                        self._failures.pop(budget, None)
+                        self._retry_at.pop(budget, None)
+                    else:
+                        self._record_failure(budget)
+
+                # Sleeps off the rest of the interval so the refill rate is never exceeded
+                deadline = started + interval
+                while self._running and time.monotonic() < deadline:
+                    self._condition.wait(deadline - time.monotonic())
+
+    def _record_refill(self, budget: int) -> None:
+        """
+        Records how long the oldest taken build of a budget waited to be replaced, the lock must already be held.
+
+        :param budget: The budget a build was just added for.
+        """
+        taken_at = self._taken_at[budget]
+        if taken_at:
+            lag = time.monotonic() - taken_at.popleft()
+            self._refills += 1
+            self._total_refill_lag += lag
+            self._max_refill_lag = max(self._max_refill_lag, lag)
+
+    def stats(self) -> dict:
+        """
+        Fetches the usage counters of the pool.
+
+        :return: Dictionary containing the hit rate, refill lag, failed builds in a row of the budgets still being
+                 retried and number of ready builds for each budget.
+        """
+        with self._condition:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "discarded": self.discarded,
+                "unfillable_budgets": sorted(self._unfillable),
+                "failing_budgets": {str(budget): failures for budget, failures in sorted(self._failures.items())
+                                    if budget not in self._unfillable},
+                "depth": self.depth,
+                "refill_per_second": self.refill_per_second,
+                "mean_refill_lag_ms": self._total_refill_lag / self._refills * 1000 if self._refills else 0.0,
+                "max_refill_lag_ms": self._max_refill_lag * 1000,
+                "ready_builds": {str(budget): len(pool) for budget, pool in self._pools.items()}
+            }
@@ -0,0 +1,112 @@
+import time
+from typing import Union
+
+import numpy as np
+
+
+class _SolverTimeout(Exception):
+    """
+    Raised inside the search when the time budget has run out.
+    """
+
+
+def _prepare_slot(names: np.ndarray, prices: np.ndarray) -> tuple:
+    """
+    Sorts a slot's candidates by price in pence, keeping one candidate per distinct price.
+
+    Candidates with the same price are interchangeable for the budget, so only the first is searched.
+
+    :param names: Array of candidate part names.
+    :param prices: Array of candidate prices, aligned with the names.
+    :return: Tuple of (names, pence) arrays sorted ascending by price.
+    """
+    pence = np.rint(np.asarray(prices, dtype=np.float64) * 100).astype(np.int64)
+    unique_pence, first_positions = np.unique(pence, return_index=True)
+    return np.asarray(names, dtype=object)[first_positions], unique_pence
+
+
+def solve_build(slot_candidates: dict, budget: Union[int, float], time_budget_ms: Union[int, float]) -> tuple:
+    """
+    Chooses one part per slot so that the total price is as close to the budget as possible without going over.
+
+    This is a multiple-choice knapsack solved with a depth first branch and bound search. Each slot is searched from
+    its most expensive candidate that still leaves room for the cheapest parts of the remaining slots, branches that
+    can't beat the best total found are cut, and the last slot is filled with a binary search. The search stops when
+    the time budget runs out, returning the best selection found so far.
+
+    :param slot_candidates: Dictionary mapping each slot to a tuple of (parts, prices) arrays of its candidates, the
+                            parts being catalog rows or names.
+    :param budget: The most the build may cost.
+    :param time_budget_ms: Time in milliseconds the search may run for.
+    :return: Tuple of (selection, complete) - selection maps each slot to a (part, price) tuple, or is None if no
+             combination fits the budget, complete is False if the search ran out of time.
+    """
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    budget_pence = int(round(budget * 100))
+
+    slots = {slot: _prepare_slot(names, prices) for slot, (names, prices) in slot_candidates.items()}
+    if any(len(pence) == 0 for _, pence in slots.values()):
+        return None, True
+
+    # Slots with the fewest candidates are branched on first, the largest is left for the binary search
+    order = sorted(slots, key=lambda slot: len(slots[slot][1]))
+    slot_pence = [slots[slot][1] for slot in order]
+
+    # Cheapest and dearest totals of the slots after each position, used to bound the search
+    min_rest = np.zeros(len(order) + 1, dtype=np.int64)
+    max_rest = np.zeros(len(order) + 1, dtype=np.int64)
+    for position in range(len(order) - 1, -1, -1):
+        min_rest[position] = min_rest[position + 1] + slot_pence[position][0]
+        max_rest[position] = max_rest[position + 1] + slot_pence[position][-1]
+
+    if min_rest[0] > budget_pence:
+        return None, True
+
+    best_total = -1
+    best_choice = None
+    choice = [0] * len(order)
+    steps = 0
+
+    def search(position: int, spent: int) -> None:
+        nonlocal best_total, best_choice, steps
+
+        pence = slot_pence[position]
+        capacity = budget_pence - spent - min_rest[position + 1]
+
+        # Highest candidate that leaves room for the cheapest parts of the remaining slots
+        top = int(np.searchsorted(pence, capacity, side='right')) - 1
+
+        if position == len(order) - 1:
+            total = spent + int(pence[top])
+            if total > best_total:
+                choice[position] = top
+                best_total = total
+                best_choice = list(choice)
+            return
+
+        for candidate in range(top, -1, -1):
+            steps += 1
+            if steps % 256 == 0 and time.perf_counter() > deadline:
+                raise _SolverTimeout()
+
+            # Candidates only get cheaper from here, so once the bound can't beat the best total neither can they
+            if spent + int(pence[candidate]) + max_rest[position + 1] <= best_total:
+                break
+
+            choice[position] = candidate
+            search(position + 1, spent + int(pence[candidate]))
+
+            if best_total == budget_pence:
+                return
+
+    complete = True
+    try:
+        search(0, 0)
+    except _SolverTimeout:
+        complete = False
+
+    selection = {}
+    for position, slot in enumerate(order):
+        names, pence = slots[slot]
+        selection[slot] = (names[best_choice[position]], int(pence[best_choice[position]]) / 100)
+    return selection, complete
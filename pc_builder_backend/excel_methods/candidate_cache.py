@@ -0,0 +1,130 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Union
+
+import numpy as np
+
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+
+
+class CandidatePoolCache:
+
+    def __init__(self, max_entries: int, price_step: Union[int, float]):
+        """
+        Initialises a bounded least recently used cache of the candidate parts for a slot at a target price.
+
+        Target prices are rounded to the nearest price step, so budgets that cluster around round numbers share the
+        same pools. Small targets are rounded to a finer step of at most a tenth of the target instead, so they are
+        never moved by more than 5% rather than collapsing to 0. Pools belong to the catalog index they were built
+        from and are dropped when a different index is used, which happens whenever the catalog is reloaded.
+
+        :param max_entries: Largest number of pools held before the least recently used is evicted.
+        :param price_step: Step target prices are rounded to before looking up a pool.
+        :raises ValueError: If the size or price step isn't positive.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        if price_step <= 0:
+            raise ValueError("price_step must be positive.")
+
+        self.max_entries = max_entries
+        self.price_step = price_step
+
+        self._pools = OrderedDict()
+        self._catalog_index = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def quantize(self, target_price: Union[int, float]) -> float:
+        """
+        Rounds a target price to the nearest price step, or to the nearest power of ten no more than a tenth of the
+        target if that is smaller than the price step.
+
+        :param target_price: Target price for the slot.
+        :return: The rounded target price.
+        """
+        if target_price <= 0:
+            return target_price
+        step = min(self.price_step, 10 ** math.floor(math.log10(target_price / 10)))
+        return round(target_price / step) * step
+
+    def get_candidates(self, catalog_index: CatalogIndex, part_types: tuple, target_price: Union[int, float],
+                       fetch_candidates) -> tuple:
+        """
+        Fetches the candidate pool for a slot, building it with fetch_candidates on a miss.
+
+        :param catalog_index: Price index of the parts catalog the pool should come from.
+        :param part_types: Part types that can fill the slot.
+        :param target_price: Target price for the slot, rounded to the price step before use.
+        :param fetch_candidates: Function taking (catalog_index, part_types, target_price) that builds the pool.
+        :return: The pool returned by fetch_candidates for the rounded target price, with its arrays made read-only.
+        """
+        key = (tuple(part_types), self.quantize(target_price))
+
+        with self._lock:
+            if catalog_index is not self._catalog_index:
+                self._invalidate(catalog_index)
+
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                self.hits += 1
+                return pool
+            self.misses += 1
+
+        # Built outside the lock so other slots can still be served while a pool is being built
+        pool = fetch_candidates(catalog_index, part_types, key[1])
+        for array in pool:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+
+        with self._lock:
+            # Only stored if the catalog wasn't reloaded while the pool was being built
+            if catalog_index is self._catalog_index:
+                self._pools[key] = pool
+                self._pools.move_to_end(key)
+                while len(self._pools) > self.max_entries:
+                    self._pools.popitem(last=False)
+                    self.evictions += 1
+        return pool
+
+    def _invalidate(self, catalog_index: CatalogIndex) -> None:
+        """
+        Drops every pool and binds the cache to a new catalog index, the lock must already be held.
+
+        :param catalog_index: Catalog index new pools will be built from.
+        """
+        if self._catalog_index is not None:
+            self.invalidations += 1
+        self._pools.clear()
+        self._catalog_index = catalog_index
+
+    def clear(self) -> None:
+        """
+        Drops every pool held by the cache.
+        """
+        with self._lock:
+            self._invalidate(None)
+
+    def stats(self) -> dict:
+        """
+        Fetches the usage counters of the cache.
+
+        :return: Dictionary containing the size, hits, misses, hit rate, evictions and invalidations of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._pools),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
@@ -0,0 +1,70 @@
+import pandas as pd
+
+
+def catalog_prices(dataframe: pd.DataFrame) -> dict:
+    """
+    Keys the prices of a parts DataFrame by part, a part listed more than once keeps the last price it was listed at.
+
+    :param dataframe: DataFrame containing 'Type', 'Name' and 'Price' columns.
+    :return: Dictionary of (type, name) to price in pence.
+    """
+    prices_pence = (dataframe['Price'].to_numpy(dtype=float) * 100).round().astype(int).tolist()
+    return dict(zip(zip(dataframe['Type'].astype(str).tolist(), dataframe['Name'].astype(str).tolist()),
+                    prices_pence))
+
+
+class CatalogDiff:
+    __slots__ = ('added', 'removed', 'repriced')
+
+    def __init__(self, added: list, removed: list, repriced: list):
+        """
+        Initialises the changes between two versions of the catalog.
+
+        Prices are whole pence, so a price that only differs by floating point error isn't a change.
+
+        :param added: List of (type, name, price in pence) of each part only in the new catalog.
+        :param removed: List of (type, name, price in pence) of each part only in the old catalog, at its last price.
+        :param repriced: List of (type, name, old price in pence, new price in pence) of each part whose price changed.
+        """
+        self.added = added
+        self.removed = removed
+        self.repriced = repriced
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.repriced)
+
+    def summary(self) -> dict:
+        """
+        Counts the changes of each kind.
+
+        :return: Dictionary of the number of added, removed and repriced parts.
+        """
+        return {"added": len(self.added), "removed": len(self.removed), "repriced": len(self.repriced)}
+
+    def __repr__(self):
+        return f"CatalogDiff: {len(self.added)} added - {len(self.removed)} removed - {len(self.repriced)} repriced"
+
+
+def diff_catalogs(previous: pd.DataFrame, current: pd.DataFrame) -> CatalogDiff:
+    """
+    Works out which parts were added, removed and repriced between two versions of the catalog, keyed by type and name.
+
+    :param previous: DataFrame of the old catalog, containing 'Type', 'Name' and 'Price' columns.
+    :param current: DataFrame of the new catalog, containing 'Type', 'Name' and 'Price' columns.
+    :return: CatalogDiff of the changes, each list in the order the parts are listed in their catalog.
+    """
+    previous_prices = catalog_prices(previous)
+    current_prices = catalog_prices(current)
+
+    added, repriced = [], []
+    for (part_type, name), price in current_prices.items():
+        previous_price = previous_prices.get((part_type, name))
+        if previous_price is None:
+            added.append((part_type, name, price))
+        elif previous_price != price:
+            repriced.append((part_type, name, previous_price, price))
+
+    removed = [(part_type, name, price) for (part_type, name), price in previous_prices.items()
+               if (part_type, name) not in current_prices]
+
+    return CatalogDiff(added=added, removed=removed, repriced=repriced)
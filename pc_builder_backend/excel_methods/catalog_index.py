@@ -0,0 +1,265 @@
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+
+
+def to_pence_bounds(min_price, max_price) -> tuple:
+    """
+    Converts an inclusive price range in pounds to the inclusive range of whole pence inside it.
+
+    :param min_price: Lowest price accepted, or an array of them.
+    :param max_price: Highest price accepted, or an array of them.
+    :return: Tuple of the lowest and highest accepted prices in pence.
+    """
+    # Rounding first stops float error such as 49.95 * 100 = 4995.000000000001 from moving a bound by a penny
+    min_pence = np.ceil(np.round(np.asarray(min_price, dtype=np.float64) * 100, 6))
+    max_pence = np.floor(np.round(np.asarray(max_price, dtype=np.float64) * 100, 6))
+    return min_pence, max_pence
+
+
+def is_index_ordered(catalog) -> bool:
+    """
+    Checks whether a catalog's parts are grouped by type code and sorted by price within each type.
+
+    :param catalog: CompactCatalog of the parts.
+    :return: True if the catalog is already in the order of its index.
+    """
+    codes, pence = catalog.type_codes, catalog.prices_pence
+    if len(codes) < 2:
+        return True
+    same_type = codes[1:] == codes[:-1]
+    return bool(np.all((codes[1:] > codes[:-1]) | (same_type & (pence[1:] >= pence[:-1]))))
+
+
+class CatalogIndex:
+
+    def __init__(self, catalog, version: str = None):
+        """
+        Builds an immutable, price-sorted index of the parts catalog grouped by part type.
+
+        Each part type holds an array of prices in pence sorted ascending and an array of the catalog rows aligned
+        with it, so a price window can be found with two binary searches instead of scanning the whole catalog.
+        Names are only decoded from the catalog for the parts that are actually used.
+
+        :param catalog: CompactCatalog of the parts, or a DataFrame containing 'Type', 'Name' and 'Price' columns.
+        :param version: Version of the catalog the index was built from, recorded on builds generated from it.
+        :raises ValueError: If the input is not a CompactCatalog or pandas DataFrame.
+        """
+        if isinstance(catalog, pd.DataFrame):
+            catalog = CompactCatalog.from_dataframe(catalog)
+        elif not hasattr(catalog, 'prices_pence'):
+            raise ValueError("catalog must be a CompactCatalog or pandas DataFrame.")
+
+        self.catalog = catalog
+        self.version = version
+        self._bounds = {}
+
+        if is_index_ordered(catalog):
+            # Already grouped by type and sorted by price, as a published catalog is, so the catalog's own arrays are
+            # used and the row of a part is simply its position
+            self._sorted_rows = None
+            self._sorted_pence = catalog.prices_pence
+            sorted_codes = catalog.type_codes
+        else:
+            # Sorts by type then price, lexsort is stable so parts with the same price keep catalog order
+            self._sorted_rows = np.lexsort((catalog.prices_pence, catalog.type_codes)).astype(np.int32)
+            self._sorted_pence = catalog.prices_pence[self._sorted_rows]
+            sorted_codes = catalog.type_codes[self._sorted_rows]
+
+            # Freezes the arrays so slices handed out can't be used to alter the index
+            self._sorted_rows.flags.writeable = False
+            self._sorted_pence.flags.writeable = False
+
+        type_bounds = np.searchsorted(sorted_codes, np.arange(len(catalog.type_labels) + 1))
+        for type_code, part_type in enumerate(catalog.type_labels):
+            start, stop = int(type_bounds[type_code]), int(type_bounds[type_code + 1])
+            if start < stop:
+                self._bounds[part_type] = (start, stop)
+
+    def __len__(self):
+        return sum(stop - start for start, stop in self._bounds.values())
+
+    def __contains__(self, part_type):
+        return part_type in self._bounds
+
+    def part_types(self) -> list:
+        """
+        Lists the part types held in the index.
+
+        :return: List of part type names.
+        """
+        return list(self._bounds.keys())
+
+    def rows(self, part_type: str, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Fetches the catalog rows of a part type, aligned with its sorted prices.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param start: First position in the sorted prices of the type to fetch the row of.
+        :param stop: Position to stop before, the end of the type if not provided.
+        :return: Read-only array of catalog rows, empty if the type isn't in the catalog.
+        """
+        type_start, type_stop = self._bounds.get(part_type, (0, 0))
+        stop = type_stop - type_start if stop is None else stop
+        if self._sorted_rows is None:
+            rows = np.arange(type_start + start, type_start + stop, dtype=np.int32)
+            rows.flags.writeable = False
+            return rows
+        return self._sorted_rows[type_start + start:type_start + stop]
+
+    def rows_at(self, part_type: str, positions: np.ndarray) -> np.ndarray:
+        """
+        Fetches the catalog rows at many positions in the sorted prices of a part type.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param positions: Array of positions in the sorted prices of the type.
+        :return: Array of catalog rows aligned with the positions.
+        """
+        type_start, _ = self._bounds.get(part_type, (0, 0))
+        if self._sorted_rows is None:
+            return np.asarray(positions) + type_start
+        return self._sorted_rows[np.asarray(positions) + type_start]
+
+    def pence(self, part_type: str) -> np.ndarray:
+        """
+        Fetches the sorted prices of a part type in pence.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :return: Read-only array of prices in pence sorted ascending, empty if the type isn't in the catalog.
+        """
+        type_start, type_stop = self._bounds.get(part_type, (0, 0))
+        return self._sorted_pence[type_start:type_stop]
+
+    def prices(self, part_type: str) -> np.ndarray:
+        """
+        Fetches the sorted prices of a part type in pounds.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :return: Read-only array of prices sorted ascending, empty if the type isn't in the catalog.
+        """
+        prices = self.pence(part_type) / 100
+        prices.flags.writeable = False
+        return prices
+
+    def names(self, part_type: str) -> np.ndarray:
+        """
+        Fetches the part names of a part type, aligned with the sorted prices. Every name of the type is decoded, so
+        fetching rows and decoding only the names needed is preferred.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :return: Read-only array of part names, empty if the type isn't in the catalog.
+        """
+        names = np.array(self.catalog.names(self.rows(part_type)), dtype=object)
+        names.flags.writeable = False
+        return names
+
+    def name(self, row: int) -> str:
+        """
+        Decodes the name of the part in a catalog row.
+
+        :param row: Catalog row of the part.
+        :return: The part name.
+        """
+        return self.catalog.name(row)
+
+    def price_windows(self, part_type: str, min_prices, max_prices) -> tuple:
+        """
+        Finds the positions of the parts of a type priced within each of many inclusive ranges.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param min_prices: Array of the lowest price accepted in each range.
+        :param max_prices: Array of the highest price accepted in each range.
+        :return: Tuple of (starts, stops) arrays of positions into the sorted prices and rows of the part type.
+        """
+        pence = self.pence(part_type)
+        min_pence, max_pence = to_pence_bounds(min_prices, max_prices)
+        starts = np.searchsorted(pence, min_pence, side='left')
+        stops = np.searchsorted(pence, max_pence, side='right')
+        return starts, np.maximum(starts, stops)
+
+    def price_window(self, part_type: str, min_price: Union[int, float], max_price: Union[int, float]) -> slice:
+        """
+        Finds the positions of every part of a type priced within an inclusive range.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param min_price: Lowest price accepted.
+        :param max_price: Highest price accepted.
+        :return: Slice into the sorted prices and rows of the part type.
+        """
+        start, stop = self.price_windows(part_type, min_price, max_price)
+        return slice(int(start), int(stop))
+
+    def fetch_rows_in_range(self, part_type: str, min_price: Union[int, float], max_price: Union[int, float]) \
+            -> tuple:
+        """
+        Fetches the catalog rows and prices of every part of a type priced within an inclusive range.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param min_price: Lowest price accepted.
+        :param max_price: Highest price accepted.
+        :return: Tuple of (rows, prices) arrays, both empty if nothing fits.
+        """
+        window = self.price_window(part_type, min_price, max_price)
+        return self.rows(part_type, window.start, window.stop), self.pence(part_type)[window] / 100
+
+    def fetch_parts_in_range(self, part_type: str, min_price: Union[int, float], max_price: Union[int, float]) \
+            -> tuple:
+        """
+        Fetches the names and prices of every part of a type priced within an inclusive range.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param min_price: Lowest price accepted.
+        :param max_price: Highest price accepted.
+        :return: Tuple of (names, prices) arrays, both empty if nothing fits.
+        """
+        rows, prices = self.fetch_rows_in_range(part_type, min_price, max_price)
+        return np.array(self.catalog.names(rows), dtype=object), prices
+
+    def nearest_rows(self, part_type: str, target_price: Union[int, float], k: int,
+                     max_price: Union[int, float] = None) -> tuple:
+        """
+        Fetches the catalog rows of the k parts of a type whose prices are closest to a target price.
+
+        The closest parts always sit next to each other in the sorted prices, so they are found by binary searching for
+        the target and growing a window outwards towards whichever neighbour is closer.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param target_price: Price the parts should be closest to.
+        :param k: Number of parts wanted.
+        :param max_price: Highest price accepted, if given.
+        :return: Tuple of (rows, prices) arrays sorted by price, fewer than k if the type has fewer parts.
+        """
+        pence = self.pence(part_type)
+        target_pence = target_price * 100
+        end = len(pence) if max_price is None else int(np.searchsorted(pence, to_pence_bounds(0, max_price)[1],
+                                                                        side='right'))
+        low = high = min(int(np.searchsorted(pence, target_pence, side='left')), end)
+
+        while high - low < k and (low > 0 or high < end):
+            if low == 0:
+                high += 1
+            elif high == end:
+                low -= 1
+            elif target_pence - pence[low - 1] <= pence[high] - target_pence:
+                low -= 1
+            else:
+                high += 1
+
+        return self.rows(part_type, low, high), pence[low:high] / 100
+
+    def nearest_parts(self, part_type: str, target_price: Union[int, float], k: int,
+                      max_price: Union[int, float] = None) -> tuple:
+        """
+        Fetches the k parts of a type whose prices are closest to a target price.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param target_price: Price the parts should be closest to.
+        :param k: Number of parts wanted.
+        :param max_price: Highest price accepted, if given.
+        :return: Tuple of (names, prices) arrays sorted by price, fewer than k if the type has fewer parts.
+        """
+        rows, prices = self.nearest_rows(part_type, target_price, k, max_price=max_price)
+        return np.array(self.catalog.names(rows), dtype=object), prices
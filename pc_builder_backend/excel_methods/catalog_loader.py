@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from typing import Callable, Union
+
+import numpy as np
+import pandas as pd
+
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog, NAME_SEPARATOR
+from pc_builder_backend.excel_methods.excel_helper_methods import read_excel_data
+
+# Bumped whenever the layout of the cache file changes so old caches are rebuilt
+CATALOG_CACHE_FORMAT = 1
+
+# Columns of the catalog held in the cache, alongside the details of its source file
+CATALOG_COLUMNS = ("type_codes", "type_labels", "names", "prices")
+
+# Extension of the columnar catalog file the scraper writes, catalog files with any other extension are read as Excel
+CATALOG_FILE_EXTENSION = ".npz"
+
+
+def get_cache_path(excel_file: str) -> str:
+    """
+    Works out where the columnar cache of an Excel catalog is kept, next to the catalog itself.
+
+    :param excel_file: File path of the Excel catalog.
+    :return: File path of the cache.
+    """
+    directory, filename = os.path.split(excel_file)
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}.catalog.npz")
+
+
+def get_catalog_path(excel_file: str) -> str:
+    """
+    Works out where the columnar catalog file is written, next to the Excel export of the catalog.
+
+    :param excel_file: File path of the Excel catalog.
+    :return: File path of the columnar catalog.
+    """
+    return os.path.splitext(excel_file)[0] + CATALOG_FILE_EXTENSION
+
+
+def find_catalog_file(excel_file: str) -> str:
+    """
+    Finds the file the catalog should be loaded from, the columnar catalog if the scraper has written one.
+
+    :param excel_file: File path of the Excel catalog.
+    :return: File path of the columnar catalog if it exists, otherwise of the Excel catalog.
+    """
+    catalog_file = get_catalog_path(excel_file)
+    return catalog_file if os.path.exists(catalog_file) else excel_file
+
+
+def hash_file(filepath: str) -> str:
+    """
+    Hashes the contents of a file.
+
+    :param filepath: File path of the file to hash.
+    :return: Hex digest of the SHA-256 hash of the file.
+    """
+    file_hash = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def encode_catalog(dataframe: pd.DataFrame) -> dict:
+    """
+    Encodes a parts DataFrame as NumPy columns that can be saved without pickling.
+
+    Types are stored as small integer codes with a table of labels, and names as one UTF-8 buffer.
+
+    :param dataframe: DataFrame containing 'Type', 'Name' and 'Price' columns.
+    :return: Dictionary of column name to NumPy array.
+    """
+    types = pd.Categorical(dataframe['Type'].astype(str))
+    names = NAME_SEPARATOR.join(dataframe['Name'].astype(str).tolist()).encode('utf-8')
+    return {
+        "type_codes": types.codes.astype(np.int16),
+        "type_labels": np.array(types.categories.tolist(), dtype=str),
+        "names": np.frombuffer(names, dtype=np.uint8),
+        "prices": dataframe['Price'].to_numpy(dtype=np.float64),
+    }
+
+
+def decode_catalog(columns) -> pd.DataFrame:
+    """
+    Decodes NumPy columns made by encode_catalog back into a parts DataFrame.
+
+    :param columns: Mapping of column name to NumPy array.
+    :return: DataFrame containing 'Type', 'Name' and 'Price' columns.
+    """
+    prices = columns["prices"]
+    names = columns["names"].tobytes().decode('utf-8').split(NAME_SEPARATOR) if len(prices) else []
+    types = pd.Categorical.from_codes(columns["type_codes"], categories=columns["type_labels"].tolist())
+    return pd.DataFrame({'Type': np.asarray(types, dtype=object), 'Name': names, 'Price': prices})
+
+
+def decode_compact_catalog(columns) -> CompactCatalog:
+    """
+    Decodes NumPy columns made by encode_catalog straight into a CompactCatalog, without building a DataFrame.
+
+    :param columns: Mapping of column name to NumPy array.
+    :return: CompactCatalog holding the parts.
+    """
+    type_labels = columns["type_labels"].tolist()
+    names = columns["names"]
+    prices = columns["prices"]
+    return CompactCatalog(type_labels=type_labels,
+                          type_codes=columns["type_codes"].astype(CompactCatalog.type_code_dtype(len(type_labels))),
+                          name_buffer=names,
+                          name_offsets=CompactCatalog.find_name_offsets(names, len(prices)),
+                          prices_pence=np.rint(prices * 100).astype(np.int32))
+
+
+def read_cache_source(cache_file: str):
+    """
+    Reads the details of the Excel file a cache was built from.
+
+    :param cache_file: File path of the cache.
+    :return: Dictionary of the source file's size, mtime and hash, or None if the cache can't be read.
+    """
+    try:
+        with np.load(cache_file, allow_pickle=False) as cache:
+            source = json.loads(str(cache["source"]))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if source.get("format") != CATALOG_CACHE_FORMAT:
+        return None
+    return source
+
+
+def write_catalog_cache(cache_file: str, columns: dict, source: dict) -> None:
+    """
+    Writes a catalog to its cache, writing to a temporary file first so a partly written cache is never read.
+
+    :param cache_file: File path of the cache.
+    :param columns: Columns of the catalog made by encode_catalog.
+    :param source: Details of the Excel file the catalog was read from.
+    """
+    _write_columns(filepath=cache_file, columns=columns, source=source)
+
+
+def write_catalog(catalog_file: str, dataframe: pd.DataFrame) -> None:
+    """
+    Writes the catalog to its columnar file, writing to a temporary file first and renaming it over the old catalog,
+    so a reader sees either the old catalog or the new one and never a partly written file.
+
+    The file holds the same uncompressed columns as the cache of an Excel catalog, so it is loaded without parsing.
+
+    :param catalog_file: File path of the columnar catalog.
+    :param dataframe: DataFrame containing 'Type', 'Name' and 'Price' columns.
+    """
+    _write_columns(filepath=catalog_file, columns=encode_catalog(dataframe), source={})
+
+
+def _write_columns(filepath: str, columns: dict, source: dict) -> None:
+    """
+    Writes catalog columns to a NumPy archive atomically, along with the details of where they came from.
+    """
+    columns = dict(columns)
+    columns["source"] = np.array(json.dumps({**source, "format": CATALOG_CACHE_FORMAT}))
+
+    directory = os.path.dirname(filepath) or '.'
+    file_descriptor, temp_file = tempfile.mkstemp(dir=directory, suffix='.npz.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            np.savez(file, **columns)
+        # Temporary files are only readable by their owner, the file is made readable like any other file
+        os.chmod(temp_file, 0o644)
+        os.replace(temp_file, filepath)
+    except OSError:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def read_catalog_columns(catalog_file: str) -> dict:
+    """
+    Reads the columns of a columnar catalog file written by write_catalog.
+
+    :param catalog_file: File path of the columnar catalog.
+    :return: Dictionary of column name to NumPy array.
+    :raises ValueError: If the file isn't a columnar catalog of the current format.
+    """
+    source = read_cache_source(catalog_file)
+    if source is None:
+        raise ValueError(f"'{catalog_file}' is not a catalog file.")
+    with np.load(catalog_file, allow_pickle=False) as catalog:
+        return {column: catalog[column] for column in CATALOG_COLUMNS}
+
+
+def load_catalog(catalog_file: str, cache_file: str = None) -> pd.DataFrame:
+    """
+    Loads the parts catalog from its columnar file, or from an Excel catalog through its columnar cache.
+
+    The cache of an Excel catalog is trusted when the Excel file's size and modified time match those it was built
+    from. If they don't, the Excel file is hashed, and only if its contents changed is it read again and the cache
+    rebuilt.
+
+    :param catalog_file: File path of the columnar catalog, or of the Excel catalog.
+    :param cache_file: File path of the cache of an Excel catalog, kept next to it if not provided.
+    :return: DataFrame containing the contents of the catalog.
+    """
+    return _load_catalog_columns(catalog_file=catalog_file, cache_file=cache_file, decode=decode_catalog)
+
+
+def load_compact_catalog(catalog_file: str, cache_file: str = None) -> CompactCatalog:
+    """
+    Loads the parts catalog into a CompactCatalog, reading it in the same way as load_catalog.
+
+    :param catalog_file: File path of the columnar catalog, or of the Excel catalog.
+    :param cache_file: File path of the cache of an Excel catalog, kept next to it if not provided.
+    :return: CompactCatalog holding the contents of the catalog.
+    """
+    return _load_catalog_columns(catalog_file=catalog_file, cache_file=cache_file, decode=decode_compact_catalog)
+
+
+def _load_catalog_columns(catalog_file: str, cache_file: Union[str, None], decode: Callable[[dict], object]):
+    """
+    Loads the columns of the catalog from the columnar file, the cache or the Excel file, and decodes them with the
+    given function.
+    """
+    if catalog_file.endswith(CATALOG_FILE_EXTENSION):
+        return decode(read_catalog_columns(catalog_file))
+
+    if cache_file is None:
+        cache_file = get_cache_path(catalog_file)
+
+    stat = os.stat(catalog_file)
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    cached_source = read_cache_source(cache_file)
+
+    if cached_source is not None:
+        unchanged = cached_source["size"] == source["size"] and cached_source["mtime_ns"] == source["mtime_ns"]
+        if not unchanged:
+            source["sha256"] = hash_file(catalog_file)
+            unchanged = cached_source.get("sha256") == source["sha256"]
+
+        if unchanged:
+            with np.load(cache_file, allow_pickle=False) as cache:
+                columns = {column: cache[column] for column in CATALOG_COLUMNS}
+            if cached_source["mtime_ns"] != source["mtime_ns"]:
+                # Same contents with a new modified time, the cache is updated so the file isn't hashed again
+                _write_cache_safely(cache_file, columns, source)
+            return decode(columns)
+
+    columns = encode_catalog(read_excel_data(catalog_file))
+    source.setdefault("sha256", hash_file(catalog_file))
+    _write_cache_safely(cache_file, columns, source)
+    return decode(columns)
+
+
+def _write_cache_safely(cache_file: str, columns: dict, source: dict) -> None:
+    """
+    Writes the catalog cache, a cache that can't be written only costs the next startup time so errors are printed.
+    """
+    try:
+        write_catalog_cache(cache_file=cache_file, columns=columns, source=source)
+    except OSError as e:
+        print(f"Catalog cache could not be written to '{cache_file}': {e}")
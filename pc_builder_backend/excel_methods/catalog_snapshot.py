@@ -0,0 +1,222 @@
+import datetime
+import hashlib
+import os
+import threading
+from typing import Callable, Union
+
+import numpy as np
+import pandas as pd
+
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+from pc_builder_backend.excel_methods.name_search import NameSearchIndex
+
+
+def get_catalog_version(catalog: CompactCatalog) -> str:
+    """
+    Works out the version of a catalog from its contents, so reloading an unchanged catalog keeps its version.
+
+    :param catalog: CompactCatalog of the parts.
+    :return: Version string made from a hash of the catalog's arrays.
+    """
+    catalog_hash = hashlib.sha256("\x00".join(catalog.type_labels).encode('utf-8'))
+    for array in (catalog.type_codes, catalog.name_buffer, catalog.prices_pence):
+        # Hashes the array's buffer in place, so a memory mapped array isn't copied into private memory
+        catalog_hash.update(memoryview(np.ascontiguousarray(array)).cast('B'))
+    return catalog_hash.hexdigest()[:16]
+
+
+class CatalogSnapshot:
+
+    def __init__(self, catalog, version: str = None):
+        """
+        Initialises an immutable snapshot of the parts catalog, holding its compact arrays and price index.
+
+        Requests take the current snapshot once and use it throughout, so a reload part way through a request
+        never mixes parts from two versions of the catalog.
+
+        :param catalog: CompactCatalog of the parts, or a DataFrame containing 'Type', 'Name' and 'Price' columns.
+        :param version: Version of the catalog, the catalog's own version or worked out from its contents if not
+                        provided.
+        """
+        if isinstance(catalog, pd.DataFrame):
+            catalog = CompactCatalog.from_dataframe(catalog)
+
+        if version is None:
+            version = catalog.version if catalog.version is not None else get_catalog_version(catalog)
+        self.version = version
+        self.catalog = catalog
+        self.index = CatalogIndex(catalog, version=self.version)
+        self.loaded_at = datetime.datetime.now()
+        self._search_index = None
+        self._search_index_lock = threading.Lock()
+
+    @property
+    def search_index(self) -> NameSearchIndex:
+        """
+        Name search index of the catalog, built the first time it is used and then kept with the snapshot.
+        """
+        return self.build_search_index()
+
+    def build_search_index(self) -> NameSearchIndex:
+        """
+        Builds the name search index of the catalog if it hasn't been built yet, so it can be built ahead of the
+        first search.
+
+        :return: NameSearchIndex of the catalog.
+        """
+        if self._search_index is None:
+            with self._search_index_lock:
+                if self._search_index is None:
+                    self._search_index = NameSearchIndex(self.catalog)
+        return self._search_index
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame of the catalog, built from the compact arrays on each access for code that still needs one.
+        """
+        return self.catalog.to_dataframe()
+
+    def info(self) -> dict:
+        """
+        Fetches a summary of the snapshot.
+
+        :return: Dictionary containing the version, number of parts, bytes held by the catalog arrays and load time
+                 of the snapshot.
+        """
+        return {
+            "version": self.version,
+            "num_parts": len(self.catalog),
+            "catalog_bytes": self.catalog.nbytes,
+            "loaded_at": self.loaded_at
+        }
+
+
+class CatalogStore:
+
+    def __init__(self, catalog_file: str, load_catalog: Callable[[str], Union[CompactCatalog, pd.DataFrame]],
+                 locate_catalog: Callable[[], str] = None):
+        """
+        Initialises a store holding the current catalog snapshot, loading the first snapshot straight away.
+
+        :param catalog_file: File path of the catalog.
+        :param load_catalog: Function taking the catalog file path and returning its CompactCatalog or DataFrame.
+        :param locate_catalog: Function returning the file path the catalog should be loaded from, checked on every
+                               reload and watch so the store moves to a new file, such as a columnar catalog written
+                               after the app started. The catalog is always loaded from catalog_file if not provided.
+        """
+        self._locate_catalog = locate_catalog
+        self.catalog_file = locate_catalog() if locate_catalog is not None else catalog_file
+        self._load_catalog = load_catalog
+        self._listeners = []
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+        self._file_state = self._get_file_state(self.catalog_file)
+        self._snapshot = CatalogSnapshot(self._load_catalog(self.catalog_file))
+        self.reloads = 0
+
+    def current(self) -> CatalogSnapshot:
+        """
+        Fetches the current catalog snapshot.
+
+        :return: The snapshot requests should be served from.
+        """
+        return self._snapshot
+
+    def add_listener(self, listener: Callable[[CatalogSnapshot], None]) -> None:
+        """
+        Registers a function called with the new snapshot whenever a new catalog version is swapped in.
+
+        :param listener: Function taking the new CatalogSnapshot.
+        """
+        self._listeners.append(listener)
+
+    def reload(self) -> bool:
+        """
+        Loads the catalog file into a new snapshot and swaps it in if the catalog has changed.
+
+        The snapshot is fully built before the swap, and the swap is a single reference assignment, so requests
+        already holding the old snapshot finish on it while new requests get the new one.
+
+        :return: True if a new catalog version was swapped in, False if the catalog was unchanged.
+        """
+        with self._reload_lock:
+            catalog_file = self._find_catalog_file()
+            file_state = self._get_file_state(catalog_file)
+            new_snapshot = CatalogSnapshot(self._load_catalog(catalog_file))
+            # Only recorded once loaded, so a file that failed to load is tried again by the watcher
+            self.catalog_file = catalog_file
+            self._file_state = file_state
+            if new_snapshot.version == self._snapshot.version:
+                return False
+
+            self._snapshot = new_snapshot
+            self.reloads += 1
+
+        for listener in self._listeners:
+            try:
+                listener(new_snapshot)
+            except Exception as e:
+                print(f"Catalog reload listener failed: {e}")
+        return True
+
+    def start_watching(self, interval: Union[int, float]) -> None:
+        """
+        Starts a background thread that reloads the catalog whenever its file changes.
+
+        :param interval: Seconds between checks of the catalog file.
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """
+        Stops the background thread watching the catalog file.
+        """
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _find_catalog_file(self) -> str:
+        """
+        Finds the file the catalog should be loaded from now.
+
+        :return: File path of the catalog.
+        """
+        return self._locate_catalog() if self._locate_catalog is not None else self.catalog_file
+
+    @staticmethod
+    def _get_file_state(catalog_file: str) -> Union[tuple, None]:
+        """
+        Fetches the path, size and modified time of a catalog file, so moving to another file counts as a change.
+
+        :param catalog_file: File path of the catalog.
+        :return: Tuple of (path, size, mtime in ns), or None if the file can't be read.
+        """
+        try:
+            stat = os.stat(catalog_file)
+        except OSError:
+            return None
+        return catalog_file, stat.st_size, stat.st_mtime_ns
+
+    def _watch(self, interval: Union[int, float]) -> None:
+        """
+        Checks the catalog file every interval, reloading it when its size or modified time changes or the catalog
+        moves to another file.
+        """
+        while not self._stop_watching.wait(interval):
+            file_state = self._get_file_state(self._find_catalog_file())
+            if file_state is None or file_state == self._file_state:
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                # A half written file is retried on the next check, the current snapshot keeps being served
+                print(f"Catalog could not be reloaded: {e}")
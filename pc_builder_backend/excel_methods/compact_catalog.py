@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+
+# Separates part names in the name buffer, scraped names never contain it
+NAME_SEPARATOR = "\x00"
+
+
+class CatalogPart:
+    __slots__ = ('part_type', 'name', 'price')
+
+    def __init__(self, part_type: str, name: str, price: float):
+        """
+        Initialises a single part read out of a CompactCatalog.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param name: Name of the part.
+        :param price: Price of the part in pounds.
+        """
+        self.part_type = part_type
+        self.name = name
+        self.price = price
+
+    def to_list(self) -> list:
+        """
+        Converts the part to a list in the column order of components.xlsx.
+
+        :return: List of [type, name, price].
+        """
+        return [self.part_type, self.name, self.price]
+
+    def to_dict(self) -> dict:
+        """
+        Converts the part to a dictionary in the form parts are stored in a build.
+
+        :return: Dictionary of the part's type, name (as value) and price.
+        """
+        return {"type": self.part_type, "value": self.name, "price": self.price}
+
+    def __repr__(self):
+        return f"CatalogPart: {self.part_type} - {self.name} - £{self.price:.2f}"
+
+
+class CompactCatalog:
+    __slots__ = ('type_labels', 'type_codes', 'name_buffer', 'name_offsets', 'prices_pence', 'version')
+
+    def __init__(self, type_labels, type_codes: np.ndarray, name_buffer: np.ndarray, name_offsets: np.ndarray,
+                 prices_pence: np.ndarray, version: str = None):
+        """
+        Initialises an array backed parts catalog.
+
+        Each part is a row across the arrays. Types are small integer codes into a table of labels, names are
+        slices of one UTF-8 buffer found through an offsets array, and prices are whole pence. This holds the
+        catalog in a handful of arrays rather than a Python object per value.
+
+        :param type_labels: Sequence of part type names, indexed by type code.
+        :param type_codes: Integer array of the type code of each part, int8 unless there are many types.
+        :param name_buffer: uint8 array holding every name encoded as UTF-8, separated by NAME_SEPARATOR.
+        :param name_offsets: int64 array of where each name starts in the buffer, with one extra entry at the end.
+        :param prices_pence: int32 array of the price of each part in pence.
+        :param version: Version already worked out for these exact arrays, such as the one stored with a published
+                        segment, None if it hasn't been.
+        :raises ValueError: If the arrays don't all describe the same number of parts.
+        """
+        if not len(type_codes) == len(prices_pence) == len(name_offsets) - 1:
+            raise ValueError("Catalog arrays must all have one entry per part.")
+
+        self.type_labels = tuple(type_labels)
+        self.type_codes = type_codes
+        self.name_buffer = name_buffer
+        self.name_offsets = name_offsets
+        self.prices_pence = prices_pence
+        self.version = version
+
+        for array in (type_codes, name_buffer, name_offsets, prices_pence):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_columns(cls, part_types, names, prices) -> 'CompactCatalog':
+        """
+        Builds a compact catalog from columns of types, names and prices.
+
+        :param part_types: Sequence of part types.
+        :param names: Sequence of part names.
+        :param prices: Sequence of prices in pounds.
+        :return: A CompactCatalog holding the parts.
+        """
+        categories = pd.Categorical(np.asarray(part_types, dtype=object).astype(str))
+        name_buffer = np.frombuffer(NAME_SEPARATOR.join(map(str, names)).encode('utf-8'), dtype=np.uint8)
+        prices_pence = np.rint(np.asarray(prices, dtype=np.float64) * 100).astype(np.int32)
+        type_labels = categories.categories.tolist()
+        return cls(type_labels=type_labels,
+                   type_codes=categories.codes.astype(cls.type_code_dtype(len(type_labels))),
+                   name_buffer=name_buffer,
+                   name_offsets=cls.find_name_offsets(name_buffer, len(prices_pence)),
+                   prices_pence=prices_pence)
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pd.DataFrame) -> 'CompactCatalog':
+        """
+        Builds a compact catalog from a parts DataFrame.
+
+        :param dataframe: DataFrame containing 'Type', 'Name' and 'Price' columns.
+        :return: A CompactCatalog holding the parts.
+        """
+        return cls.from_columns(dataframe['Type'], dataframe['Name'], dataframe['Price'])
+
+    @staticmethod
+    def type_code_dtype(num_types: int) -> type:
+        """
+        Picks the smallest integer type that can hold a code for every part type.
+
+        :param num_types: Number of part types in the catalog.
+        :return: NumPy integer type for the type codes.
+        """
+        return np.int8 if num_types <= np.iinfo(np.int8).max + 1 else np.int16
+
+    @staticmethod
+    def find_name_offsets(name_buffer: np.ndarray, num_parts: int) -> np.ndarray:
+        """
+        Finds where each name starts in a buffer of names separated by NAME_SEPARATOR.
+
+        :param name_buffer: uint8 array of UTF-8 encoded names.
+        :param num_parts: Number of names in the buffer.
+        :return: int64 array of name start positions, with one extra entry as if another name followed the last.
+        """
+        if num_parts == 0:
+            return np.zeros(1, dtype=np.int64)
+        separators = np.flatnonzero(name_buffer == ord(NAME_SEPARATOR))
+        offsets = np.empty(num_parts + 1, dtype=np.int64)
+        offsets[0] = 0
+        offsets[1:-1] = separators + 1
+        offsets[-1] = len(name_buffer) + 1
+        return offsets
+
+    def __len__(self):
+        return len(self.prices_pence)
+
+    def __getitem__(self, row: int) -> CatalogPart:
+        return CatalogPart(self.part_type(row), self.name(row), self.price(row))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Number of bytes held by the catalog's arrays.
+        """
+        return sum(array.nbytes for array in (self.type_codes, self.name_buffer, self.name_offsets,
+                                              self.prices_pence))
+
+    def name(self, row: int) -> str:
+        """
+        Decodes the name of a single part.
+
+        :param row: Row of the part.
+        :return: The part name.
+        """
+        start, end = self.name_offsets[row], self.name_offsets[row + 1] - 1
+        return self.name_buffer[start:end].tobytes().decode('utf-8')
+
+    def names(self, rows=None) -> list:
+        """
+        Decodes the names of many parts.
+
+        :param rows: Rows of the parts, every part if not provided.
+        :return: List of part names in the order of the rows.
+        """
+        if rows is None:
+            if len(self) == 0:
+                return []
+            return self.name_buffer.tobytes().decode('utf-8').split(NAME_SEPARATOR)
+        return [self.name(row) for row in rows]
+
+    def part_type(self, row: int) -> str:
+        """
+        Fetches the type of a single part.
+
+        :param row: Row of the part.
+        :return: The part type.
+        """
+        return self.type_labels[self.type_codes[row]]
+
+    def price(self, row: int) -> float:
+        """
+        Fetches the price of a single part in pounds.
+
+        :param row: Row of the part.
+        :return: The part price.
+        """
+        return int(self.prices_pence[row]) / 100
+
+    def take(self, rows: np.ndarray) -> 'CompactCatalog':
+        """
+        Builds a new catalog holding the parts in the given rows, in the order of the rows.
+
+        :param rows: Rows of the parts to keep.
+        :return: A CompactCatalog of the parts, sharing this catalog's type labels.
+        """
+        names = self.names()
+        name_buffer = np.frombuffer(NAME_SEPARATOR.join([names[row] for row in rows]).encode('utf-8'), dtype=np.uint8)
+        return CompactCatalog(type_labels=self.type_labels,
+                              type_codes=self.type_codes[rows],
+                              name_buffer=name_buffer,
+                              name_offsets=self.find_name_offsets(name_buffer, len(rows)),
+                              prices_pence=self.prices_pence[rows])
+
+    def to_lists(self) -> list:
+        """
+        Converts every part to a list of [type, name, price], in the column order of components.xlsx.
+
+        :return: List of part lists.
+        """
+        part_types = np.array(self.type_labels, dtype=object)[self.type_codes].tolist() if len(self) else []
+        prices = (self.prices_pence / 100).tolist()
+        return list(map(list, zip(part_types, self.names(), prices)))
+
+    def iter_lists(self, chunk_size: int = 10000):
+        """
+        Converts the parts to lists of [type, name, price] a chunk at a time, so only one chunk of names is decoded
+        at once.
+
+        :param chunk_size: Number of parts decoded together.
+        :return: Generator of part lists, in catalog order.
+        """
+        type_labels = np.array(self.type_labels, dtype=object)
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            names = self.name_buffer[self.name_offsets[start]:self.name_offsets[stop] - 1].tobytes()
+            yield from map(list, zip(type_labels[self.type_codes[start:stop]].tolist(),
+                                     names.decode('utf-8').split(NAME_SEPARATOR),
+                                     (self.prices_pence[start:stop] / 100).tolist()))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Converts the catalog to a parts DataFrame.
+
+        :return: DataFrame containing 'Type', 'Name' and 'Price' columns.
+        """
+        part_types = np.array(self.type_labels, dtype=object)[self.type_codes] if len(self) else []
+        return pd.DataFrame({'Type': part_types, 'Name': self.names(), 'Price': self.prices_pence / 100})
@@ -1,9 +1,44 @@
+import base64
+import json
+import os
+import random
+import tempfile
 from typing import Union
+
+import numpy as np
+import openpyxl
 import pandas as pd
 
-from pc_builder_backend.constants import PART_COST_RANGE
+from pc_builder_backend.constants import PART_COST_RANGE, OPTIMIZE_TIME_BUDGET_MS, FALLBACK_COST_RANGES, \
+    FALLBACK_NEAREST_PARTS, PARTS_PAGE_SIZE
+from pc_builder_backend.excel_methods.build_solver import solve_build
+from pc_builder_backend.excel_methods.candidate_cache import CandidatePoolCache
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex, to_pence_bounds
 from pc_builder_backend.pc_build import PCBuild
 
+# Maps each slot of a build to the part types that can fill it and the PCBuild setter used to store it
+BUILD_SLOTS = {
+    "CPU": (("CPU",), PCBuild.set_cpu),
+    "GPU": (("GPU",), PCBuild.set_gpu),
+    "RAM": (("RAM",), PCBuild.set_ram),
+    "Storage": (("HDD", "SSD"), PCBuild.set_storage),
+    "Motherboard": (("Motherboard",), PCBuild.set_motherboard),
+    "Power Supply": (("Power Supply",), PCBuild.set_power_supply),
+    "Case": (("Case",), PCBuild.set_case),
+}
+
+# Keys used for the slots when a build is stored that differ from the BUILD_SLOTS names
+STORED_SLOT_NAMES = {"PowerSupply": "Power Supply"}
+
+# Ways generate_build_from_excel can choose the components of a build
+BUILD_MODES = ("random", "optimize")
+
+# Upper limit of each budget tier used by allocate_budget, a budget belongs to the first tier it fits under
+BUDGET_TIER_LIMITS = (500, 1000, 1500, 2000)
+
+# Orders a page of parts can be sorted in, by price then name
+PARTS_PAGE_SORTS = ("asc", "desc")
+
 
 def read_excel_data(filepath: str) -> pd.DataFrame:
     """
@@ -18,19 +53,49 @@ def read_excel_data(filepath: str) -> pd.DataFrame:
 
 def write_excel_data(filepath: str, dataframe: pd.DataFrame) -> None:
     """
-    Clears the contents of the Excel sheet and writes the DataFrame to it.
+    Replaces the Excel file with a new workbook holding the DataFrame.
 
     :param filepath: File path of the Excel file.
     :param dataframe: DataFrame to be written to the Excel file.
     :raises FileNotFoundError: If the specified file path does not exist or cannot be accessed.
     """
+    write_excel_rows(filepath=filepath, columns=dataframe.columns.tolist(),
+                     rows=dataframe.itertuples(index=False, name=None))
+
+
+def write_excel_rows(filepath: str, columns: list, rows) -> None:
+    """
+    Streams rows into a new Excel file, replacing the old file once the new one is fully written.
+
+    The workbook is written with openpyxl's write-only mode, which writes each row out as it is appended rather than
+    holding every cell in memory, to a temporary file that is renamed over the old file.
+
+    :param filepath: File path of the Excel file.
+    :param columns: List of the column headings.
+    :param rows: Iterable of the rows, each a sequence of values in the order of the columns.
+    :raises FileNotFoundError: If the specified file path does not exist or cannot be accessed.
+    """
     try:
-        # Create an Excel writer object - write mode will clear the object first
-        with pd.ExcelWriter(filepath, mode='w', engine='openpyxl') as writer:
-            # Write the DataFrame to the Excel file
-            dataframe.to_excel(writer, index=False)
+        file_descriptor, temp_file = tempfile.mkstemp(dir=os.path.dirname(filepath) or '.', suffix='.xlsx.tmp')
     except FileNotFoundError as e:
         raise FileNotFoundError(f"Error accessing the file '{filepath}': {e}") from e
+    os.close(file_descriptor)
+
+    try:
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title='Sheet1')
+        sheet.append(list(columns))
+        for row in rows:
+            sheet.append(row)
+        workbook.save(temp_file)
+        # Temporary files are only readable by their owner, the export is made readable like any other file
+        os.chmod(temp_file, 0o644)
+        os.replace(temp_file, filepath)
+    except Exception:
+        # Rows that fail part way through leave the old file in place
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
 
 
 def fetch_valid_parts(part_name: str, parts_dataframe: pd.DataFrame, target_price: Union[int, float]) \
@@ -53,8 +118,7 @@ def fetch_valid_parts(part_name: str, parts_dataframe: pd.DataFrame, target_pric
         raise ValueError("target_price must be a numeric value.")
 
     part_type = part_name
-    target_plus = target_price + (target_price * PART_COST_RANGE / 100)
-    target_minus = target_price - (target_price * PART_COST_RANGE / 100)
+    target_minus, target_plus = get_price_range(target_price)
     query_string = '(Type == @part_type) & (@target_minus <= Price <= @target_plus)'
     trimmed_dataframe = parts_dataframe.query(query_string)
     if len(trimmed_dataframe) == 0:
@@ -63,6 +127,19 @@ def fetch_valid_parts(part_name: str, parts_dataframe: pd.DataFrame, target_pric
     return trimmed_dataframe
 
 
+def get_price_range(target_price: Union[int, float], cost_range: Union[int, float] = PART_COST_RANGE) -> tuple:
+    """
+    Works out the range of prices accepted for a part around its target price.
+
+    :param target_price: Target price for the part.
+    :param cost_range: Percentage the price may be above or below the target.
+    :return: Tuple containing the lowest and highest accepted prices.
+    """
+    target_plus = target_price + (target_price * cost_range / 100)
+    target_minus = target_price - (target_price * cost_range / 100)
+    return target_minus, target_plus
+
+
 def allocate_budget(build_budget: Union[int, float]) -> dict:
     """
     Allocates budget for different PC components based on the given build budget.
@@ -136,67 +213,422 @@ def get_component_info(df):
     return name, price
 
 
-def generate_build_from_excel(build_price: Union[int, float], complete_parts_df: pd.DataFrame) -> PCBuild:
+def sample_component(parts: np.ndarray, prices: np.ndarray) -> tuple:
+    """
+    Picks a random component from aligned arrays of parts and prices.
+
+    :param parts: Array of parts, either their catalog rows or names.
+    :param prices: Array of part prices, aligned with the parts.
+    :return: Tuple containing the part and price of the sampled component, (None, 0) if there are no parts.
+    """
+    if len(parts) == 0:
+        print("No items found")
+        return None, 0
+    position = random.randrange(len(parts))
+    return parts[position], float(prices[position])
+
+
+def fetch_slot_candidates(catalog_index: CatalogIndex, part_types: tuple, target_price: Union[int, float],
+                          cost_range: Union[int, float] = PART_COST_RANGE) -> tuple:
+    """
+    Fetches the parts of every given type that fall within the price range of a slot's target price.
+
+    :param catalog_index: Price index of the parts catalog.
+    :param part_types: Part types that can fill the slot (e.g. HDD and SSD for storage).
+    :param target_price: Target price for the slot.
+    :param cost_range: Percentage the price may be above or below the target.
+    :return: Tuple of (rows, prices) arrays of the parts' catalog rows and prices, both empty if nothing fits.
+    """
+    min_price, max_price = get_price_range(target_price, cost_range)
+    if len(part_types) == 1:
+        return catalog_index.fetch_rows_in_range(part_types[0], min_price, max_price)
+
+    candidates = [catalog_index.fetch_rows_in_range(part_type, min_price, max_price) for part_type in part_types]
+    return (np.concatenate([rows for rows, _ in candidates]),
+            np.concatenate([prices for _, prices in candidates]))
+
+
+def fetch_nearest_candidates(catalog_index: CatalogIndex, part_types: tuple, target_price: Union[int, float],
+                             k: int) -> tuple:
+    """
+    Fetches the k parts across every given type whose prices are closest to a slot's target price.
+
+    :param catalog_index: Price index of the parts catalog.
+    :param part_types: Part types that can fill the slot.
+    :param target_price: Target price for the slot.
+    :param k: Number of parts wanted.
+    :return: Tuple of (rows, prices) arrays, empty only if none of the types are in the catalog.
+    """
+    candidates = [catalog_index.nearest_rows(part_type, target_price, k) for part_type in part_types]
+    rows = np.concatenate([rows for rows, _ in candidates])
+    prices = np.concatenate([prices for _, prices in candidates])
+
+    # Each type gives its own k nearest, so only the closest k of those are kept
+    closest = np.argsort(np.abs(prices - target_price), kind='stable')[:k]
+    return rows[closest], prices[closest]
+
+
+def fetch_slot_candidates_with_fallback(catalog_index: CatalogIndex, part_types: tuple,
+                                        target_price: Union[int, float]) -> tuple:
+    """
+    Fetches the candidate parts for a slot, falling back to wider searches when nothing is within range.
+
+    The price range is widened through each of FALLBACK_COST_RANGES, and if that still finds nothing the
+    FALLBACK_NEAREST_PARTS parts with the closest prices are used instead.
+
+    :param catalog_index: Price index of the parts catalog.
+    :param part_types: Part types that can fill the slot.
+    :param target_price: Target price for the slot.
+    :return: Tuple of (rows, prices, fallback) - fallback is True if the normal price range had no parts.
+    """
+    rows, prices = fetch_slot_candidates(catalog_index=catalog_index, part_types=part_types,
+                                         target_price=target_price)
+    if len(rows) > 0:
+        return rows, prices, False
+
+    for cost_range in FALLBACK_COST_RANGES:
+        rows, prices = fetch_slot_candidates(catalog_index=catalog_index, part_types=part_types,
+                                             target_price=target_price, cost_range=cost_range)
+        if len(rows) > 0:
+            return rows, prices, True
+
+    rows, prices = fetch_nearest_candidates(catalog_index=catalog_index, part_types=part_types,
+                                            target_price=target_price, k=FALLBACK_NEAREST_PARTS)
+    return rows, prices, True
+
+
+def get_stored_slot_name(slot: str) -> str:
+    """
+    Finds the key a slot is stored under in a build dictionary.
+
+    :param slot: Slot of the build, either its BUILD_SLOTS name or its stored key.
+    :return: Key the slot is stored under (e.g. PowerSupply for Power Supply).
+    """
+    for stored_name, slot_name in STORED_SLOT_NAMES.items():
+        if slot == slot_name:
+            return stored_name
+    return slot
+
+
+def fetch_alternative_parts(catalog_index: CatalogIndex, slot: str, target_price: Union[int, float], k: int,
+                            max_price: Union[int, float] = None, exclude_name: str = None) -> list:
+    """
+    Fetches the k parts that could fill a slot whose prices are closest to a target price.
+
+    :param catalog_index: Price index of the parts catalog.
+    :param slot: Slot of the build, either its BUILD_SLOTS name or the key it is stored under (e.g. PowerSupply).
+    :param target_price: Price the parts should be closest to, usually the price of the current part.
+    :param k: Number of parts wanted.
+    :param max_price: Highest price accepted, the parts closest to the target below it are used if given.
+    :param exclude_name: Name of a part to leave out, usually the current part.
+    :return: List of (part type, name, price) tuples ordered from closest to furthest from the target price.
+    :raises ValueError: If the slot isn't recognised or k isn't positive.
+    """
+    slot = STORED_SLOT_NAMES.get(slot, slot)
+    if slot not in BUILD_SLOTS:
+        raise ValueError(f"slot must be one of {', '.join(BUILD_SLOTS)}.")
+    if k <= 0:
+        raise ValueError("k must be positive.")
+
+    alternatives = []
+    for part_type in BUILD_SLOTS[slot][0]:
+        # One extra part is fetched in case the excluded part is among the closest
+        rows, prices = catalog_index.nearest_rows(part_type, target_price, k + 1, max_price=max_price)
+        names = catalog_index.catalog.names(rows)
+        alternatives.extend((part_type, name, float(price)) for name, price in zip(names, prices)
+                            if name != exclude_name)
+
+    alternatives.sort(key=lambda alternative: abs(alternative[2] - target_price))
+    return alternatives[:k]
+
+
+def encode_parts_cursor(part_type: str, price_pence: int, name: str, sort: str) -> str:
+    """
+    Encodes the position after a part as an opaque cursor for the next page of a parts query.
+
+    :param part_type: Type of the part.
+    :param price_pence: Price of the part in pence.
+    :param name: Name of the part.
+    :param sort: Order of the query the cursor belongs to.
+    :return: URL safe cursor string.
+    """
+    cursor = json.dumps([part_type, price_pence, name, sort], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(cursor).decode('ascii').rstrip('=')
+
+
+def decode_parts_cursor(cursor: str) -> tuple:
+    """
+    Decodes a cursor made by encode_parts_cursor.
+
+    :param cursor: Cursor string.
+    :return: Tuple of (part type, price in pence, name, sort).
+    :raises ValueError: If the cursor isn't one made by encode_parts_cursor.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        part_type, price_pence, name, sort = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("cursor is not valid.") from e
+    if not (isinstance(part_type, str) and isinstance(price_pence, int) and isinstance(name, str)):
+        raise ValueError("cursor is not valid.")
+    return part_type, price_pence, name, sort
+
+
+def fetch_parts_page(catalog_index: CatalogIndex, part_type: str, min_price: Union[int, float] = 0,
+                     max_price: Union[int, float] = None, limit: int = PARTS_PAGE_SIZE, cursor: str = None,
+                     sort: str = "asc") -> tuple:
+    """
+    Fetches a page of the parts of a type within a price range, ordered by price and then name.
+
+    The page starts from the cursor's price with a binary search, so a deep page costs the same as the first. Only
+    the runs of parts sharing a price at the edges of the page are sorted by name, and only the names on the page
+    are decoded. Cursors hold the price and name of the last part rather than a position, so they stay valid
+    across catalog reloads.
+
+    :param catalog_index: Price index of the parts catalog.
+    :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+    :param min_price: Lowest price accepted.
+    :param max_price: Highest price accepted, no limit if not provided.
+    :param limit: Most parts on the page.
+    :param cursor: Cursor returned with the previous page, the first page is fetched if not provided.
+    :param sort: Either "asc" for cheapest first or "desc" for most expensive first.
+    :return: Tuple of (parts, next_cursor) - parts is a list of (part type, name, price) tuples, next_cursor is None
+             on the last page.
+    :raises ValueError: If the limit isn't positive, the sort isn't recognised or the cursor doesn't match the query.
+    """
+    if limit <= 0:
+        raise ValueError("limit must be positive.")
+    if sort not in PARTS_PAGE_SORTS:
+        raise ValueError(f"sort must be one of {', '.join(PARTS_PAGE_SORTS)}.")
+
+    pence = catalog_index.pence(part_type)
+    min_pence, max_pence = to_pence_bounds(min_price, float('inf') if max_price is None else max_price)
+    start = int(np.searchsorted(pence, min_pence, side='left'))
+    stop = int(np.searchsorted(pence, max_pence, side='right'))
+
+    after = None
+    if cursor is not None:
+        cursor_type, cursor_pence, cursor_name, cursor_sort = decode_parts_cursor(cursor)
+        if cursor_type != part_type or cursor_sort != sort:
+            raise ValueError("cursor does not match the query.")
+        after = (cursor_pence, cursor_name)
+        # Parts priced before the cursor were on earlier pages, so the search starts from its price
+        if sort == "asc":
+            start = max(start, int(np.searchsorted(pence, cursor_pence, side='left')))
+        else:
+            stop = min(stop, int(np.searchsorted(pence, cursor_pence, side='right')))
+
+    # One more part than the limit is gathered to find out whether there is a next page. Each chunk is widened to
+    # whole runs of the same price, so sorting a chunk by (price, name) puts it in its final order
+    page = []
+    while len(page) <= limit and start < stop:
+        wanted = limit + 1 - len(page)
+        if sort == "asc":
+            end = min(start + wanted, stop)
+            end = min(int(np.searchsorted(pence, pence[end - 1], side='right')), stop)
+            chunk = sorted(zip(pence[start:end].tolist(), catalog_index.catalog.names(
+                catalog_index.rows(part_type, start, end))))
+            page.extend(part for part in chunk if after is None or part > after)
+            start = end
+        else:
+            begin = max(stop - wanted, start)
+            begin = max(int(np.searchsorted(pence, pence[begin], side='left')), start)
+            chunk = sorted(zip(pence[begin:stop].tolist(), catalog_index.catalog.names(
+                catalog_index.rows(part_type, begin, stop))), reverse=True)
+            page.extend(part for part in chunk if after is None or part < after)
+            stop = begin
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_parts_cursor(part_type, page[-1][0], page[-1][1], sort)
+
+    return [(part_type, name, price_pence / 100) for price_pence, name in page], next_cursor
+
+
+def generate_build_from_excel(build_price: Union[int, float], complete_parts_df: pd.DataFrame,
+                              catalog_index: CatalogIndex = None, mode: str = "random",
+                              time_budget_ms: Union[int, float] = OPTIMIZE_TIME_BUDGET_MS,
+                              candidate_cache: CandidatePoolCache = None) -> PCBuild:
     """
     Generates a PC build based on a given budget and available parts information.
 
+    In "random" mode each component is picked at random from the parts within range of its share of the budget.
+    In "optimize" mode the components are chosen from the same ranges to use as much of the budget as possible
+    without going over. If a component has nothing in range a wider search is used, and the component is recorded in
+    the build's fallback_slots.
+
     :param build_price: The budget allocated for the PC build.
-    :param complete_parts_df: DataFrame containing information about available parts.
+    :param complete_parts_df: DataFrame containing information about available parts, only used if no
+                              catalog_index is provided.
+    :param catalog_index: Price index built from complete_parts_df, built on the fly if not provided.
+    :param mode: How the components are chosen, either "random" or "optimize".
+    :param time_budget_ms: Time in milliseconds the optimize search may run for before its best build is used.
+    :param candidate_cache: Cache the candidate parts of each component are fetched through, if provided.
     :return: An instance of the PCBuild class representing the generated PC build.
+    :raises ValueError: If the mode isn't recognised or the budget is out of range.
     """
+    if mode not in BUILD_MODES:
+        raise ValueError(f"mode must be one of {', '.join(BUILD_MODES)}.")
+
+    if catalog_index is None:
+        catalog_index = CatalogIndex(complete_parts_df)
+
     new_build = PCBuild()
+    new_build.catalog_version = catalog_index.version
 
     price_ratios = allocate_budget(build_budget=build_price)  # Finds the % of each part as per the budget
 
-    # Calculates the price of each component by finding the percentage of the overall price
-    cpu_price = build_price * price_ratios["CPU"]
-    gpu_price = build_price * price_ratios["GPU"]
-    ram_price = build_price * price_ratios["RAM"]
-    storage_price = build_price * price_ratios["Storage"]
-    motherboard_price = build_price * price_ratios["Motherboard"]
-    psu_price = build_price * price_ratios["Power Supply"]
-    case_price = build_price * price_ratios["Case"]
-
-    # Fetches dataframes of parts that fit the specifications for each of the components
-    valid_cpu_df = fetch_valid_parts(part_name="CPU", parts_dataframe=complete_parts_df, target_price=cpu_price)
-    valid_gpu_df = fetch_valid_parts(part_name="GPU", parts_dataframe=complete_parts_df, target_price=gpu_price)
-    valid_ram_df = fetch_valid_parts(part_name="RAM", parts_dataframe=complete_parts_df, target_price=ram_price)
-
-    # Below will fetch both hdd and ssd to the same dataframe
-    valid_storage_df = fetch_valid_parts(part_name="HDD", parts_dataframe=complete_parts_df, target_price=storage_price)
-    valid_storage_df = pd.concat([valid_storage_df, fetch_valid_parts(part_name="SSD",
-                                                                      parts_dataframe=complete_parts_df,
-                                                                      target_price=storage_price)], ignore_index=True)
-
-    valid_motherboard_df = fetch_valid_parts(part_name="Motherboard", parts_dataframe=complete_parts_df,
-                                             target_price=motherboard_price)
-
-    valid_psu_df = fetch_valid_parts(part_name="Power Supply", parts_dataframe=complete_parts_df,
-                                     target_price=psu_price)
-
-    valid_case_df = fetch_valid_parts(part_name="Case", parts_dataframe=complete_parts_df, target_price=case_price)
-
-    # Gets the information of each component
-    cpu_name, cpu_price = get_component_info(valid_cpu_df)
-    gpu_name, gpu_price = get_component_info(valid_gpu_df)
-    ram_name, ram_price = get_component_info(valid_ram_df)
-    storage_name, storage_price = get_component_info(valid_storage_df)
-    motherboard_name, motherboard_price = get_component_info(valid_motherboard_df)
-    psu_name, psu_price = get_component_info(valid_psu_df)
-    case_name, case_price = get_component_info(valid_case_df)
-
-    # Appends these parts into the build
-    new_build.set_cpu(cpu_name, cpu_price)
-    new_build.set_gpu(gpu_name, gpu_price)
-    new_build.set_ram(ram_name, ram_price)
-    new_build.set_storage(storage_name, storage_price)
-    new_build.set_motherboard(motherboard_name, motherboard_price)
-    new_build.set_power_supply(psu_name, psu_price)
-    new_build.set_case(case_name, case_price)
+    # Fetches the parts that fit the specifications for each of the components, using the % of the overall price
+    slot_candidates = {}
+    for slot, (part_types, _) in BUILD_SLOTS.items():
+        if candidate_cache is not None:
+            rows, prices, fallback = candidate_cache.get_candidates(
+                catalog_index=catalog_index, part_types=part_types, target_price=build_price * price_ratios[slot],
+                fetch_candidates=fetch_slot_candidates_with_fallback)
+        else:
+            rows, prices, fallback = fetch_slot_candidates_with_fallback(
+                catalog_index=catalog_index, part_types=part_types, target_price=build_price * price_ratios[slot])
+
+        slot_candidates[slot] = (rows, prices)
+        if fallback:
+            new_build.fallback_slots.append(slot)
+
+    if mode == "random":
+        selection = {slot: sample_component(*candidates) for slot, candidates in slot_candidates.items()}
+    else:
+        selection, _ = solve_build(slot_candidates=slot_candidates, budget=build_price,
+                                   time_budget_ms=time_budget_ms)
+        if selection is None:
+            print("No combination of parts fits the budget")
+            selection = {}
+
+    # Appends these parts into the build, only the names of the chosen parts are decoded from the catalog
+    for slot, (_, set_part) in BUILD_SLOTS.items():
+        row, price = selection.get(slot, (None, 0))
+        set_part(new_build, None if row is None else catalog_index.name(row), price)
 
     return new_build
 
 
+def allocate_budgets(build_budgets: np.ndarray) -> dict:
+    """
+    Allocates budget for the components of many builds at once, the vectorised form of allocate_budget.
+
+    :param build_budgets: Array of budgets allocated for each PC build.
+    :return: A dictionary mapping each component to an array of target prices, one per build.
+    :raises ValueError: If any budget is out of range.
+    """
+    build_budgets = np.asarray(build_budgets, dtype=np.float64)
+    tiers = np.searchsorted(BUDGET_TIER_LIMITS, build_budgets, side='left')
+    if np.any(tiers == len(BUDGET_TIER_LIMITS)):
+        raise ValueError("Budget out of range")
+
+    # Each tier's limit falls within the tier, so allocate_budget gives the ratios used for the whole tier
+    tier_ratios = [allocate_budget(build_budget=limit) for limit in BUDGET_TIER_LIMITS]
+
+    target_prices = {}
+    for component in tier_ratios[0]:
+        ratios = np.array([ratios[component] for ratios in tier_ratios])
+        target_prices[component] = build_budgets * ratios[tiers]
+    return target_prices
+
+
+def sample_slot_batch(catalog_index: CatalogIndex, part_types: tuple, target_prices: np.ndarray,
+                      rng: np.random.Generator) -> tuple:
+    """
+    Picks a random part for one slot of every build in a batch with a single draw from the generator.
+
+    The candidates of each build are the parts of every given type within the price range of its target price,
+    treated as one list so that a slot filled by several types (e.g. HDD and SSD) is sampled evenly.
+
+    :param catalog_index: Price index of the parts catalog.
+    :param part_types: Part types that can fill the slot.
+    :param target_prices: Array of target prices for the slot, one per build.
+    :param rng: Random number generator used for the draw.
+    :return: Tuple of (names, prices, fallbacks) lists - fallbacks is True where a build had nothing in range and
+             its part came from fetch_slot_candidates_with_fallback, a name is None if even that found nothing.
+    """
+    min_prices, max_prices = get_price_range(target_prices)
+
+    # Finds the candidate window of every build in each of the part types
+    starts, counts = [], []
+    for part_type in part_types:
+        type_starts, type_stops = catalog_index.price_windows(part_type, min_prices, max_prices)
+        starts.append(type_starts)
+        counts.append(type_stops - type_starts)
+
+    counts = np.array(counts)
+    total_counts = counts.sum(axis=0)
+
+    # One draw for the whole batch, scaled into each build's candidate count
+    picks = np.floor(rng.random(len(target_prices)) * total_counts).astype(np.int64)
+
+    names = [None] * len(target_prices)
+    chosen_prices = [0] * len(target_prices)
+    offsets = np.zeros(len(target_prices), dtype=np.int64)
+    for type_position, part_type in enumerate(part_types):
+        in_type = (total_counts > 0) & (picks >= offsets) & (picks < offsets + counts[type_position])
+        positions = starts[type_position] + picks - offsets
+        build_positions = np.flatnonzero(in_type)
+        rows = catalog_index.rows_at(part_type, positions[build_positions])
+        type_prices = catalog_index.pence(part_type)[positions[build_positions]] / 100
+        for build_position, row, price in zip(build_positions, rows, type_prices.tolist()):
+            names[build_position] = catalog_index.name(row)
+            chosen_prices[build_position] = price
+        offsets += counts[type_position]
+
+    # Builds with nothing in range fall back to a wider search one at a time, these should be rare
+    fallbacks = (total_counts == 0).tolist()
+    for build_position in np.flatnonzero(total_counts == 0):
+        fallback_rows, fallback_prices, _ = fetch_slot_candidates_with_fallback(
+            catalog_index=catalog_index, part_types=part_types, target_price=target_prices[build_position])
+        if len(fallback_rows) > 0:
+            position = int(rng.integers(len(fallback_rows)))
+            names[build_position] = catalog_index.name(fallback_rows[position])
+            chosen_prices[build_position] = float(fallback_prices[position])
+
+    return names, chosen_prices, fallbacks
+
+
+def generate_builds_batch(budgets, complete_parts_df: pd.DataFrame, seed: int = None,
+                          catalog_index: CatalogIndex = None) -> list:
+    """
+    Generates a PC build for each budget given, sampling every component of the batch in one go.
+
+    :param budgets: Sequence of budgets, one per build.
+    :param complete_parts_df: DataFrame containing information about available parts, only used if no
+                              catalog_index is provided.
+    :param seed: Seed for the random number generator, allows a batch to be reproduced.
+    :param catalog_index: Price index built from complete_parts_df, built on the fly if not provided.
+    :return: List of PCBuild objects in the same order as the budgets.
+    :raises ValueError: If the budgets are not numeric or any budget is out of range.
+    """
+    try:
+        budgets = np.asarray(budgets, dtype=np.float64).reshape(-1)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"budgets must be a sequence of numeric values: {e}") from e
+
+    if catalog_index is None:
+        catalog_index = CatalogIndex(complete_parts_df)
+
+    rng = np.random.default_rng(seed)
+    target_prices = allocate_budgets(build_budgets=budgets)
+
+    new_builds = [PCBuild() for _ in range(len(budgets))]
+    for new_build in new_builds:
+        new_build.catalog_version = catalog_index.version
+    for slot, (part_types, set_part) in BUILD_SLOTS.items():
+        names, prices, fallbacks = sample_slot_batch(catalog_index=catalog_index, part_types=part_types,
+                                                     target_prices=target_prices[slot], rng=rng)
+        for new_build, name, price, fallback in zip(new_builds, names, prices, fallbacks):
+            set_part(new_build, name, price)
+            if fallback:
+                new_build.fallback_slots.append(slot)
+
+    return new_builds
+
+
 def create_data_frame(part_type: str, part_dict: dict) -> pd.DataFrame:
     """
     Creates a pandas DataFrame from a dictionary of part names and prices.
@@ -223,6 +655,23 @@ def create_data_frame(part_type: str, part_dict: dict) -> pd.DataFrame:
     return created_df
 
 
+def create_catalog_data_frame(part_rows) -> pd.DataFrame:
+    """
+    Creates the parts DataFrame of the whole catalog from a stream of part rows.
+
+    A part listed more than once keeps the position it was first listed in and the price it was last listed at.
+
+    :param part_rows: Iterable of (type, name, price) for each part.
+    :return: DataFrame with columns 'Type', 'Name', and 'Price' representing parts and their prices.
+    """
+    part_prices = {}
+    for part_type, name, price in part_rows:
+        part_prices[(part_type, name)] = price
+
+    return pd.DataFrame([(part_type, name, price) for (part_type, name), price in part_prices.items()],
+                        columns=['Type', 'Name', 'Price'])
+
+
 def combine_dataframes(*args) -> pd.DataFrame:
     """
     Combines multiple DataFrames into a single DataFrame.
@@ -0,0 +1,139 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+# Names are split into runs of letters and runs of digits, so "RTX4070" is found by searching "rtx 40"
+TOKEN_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+# Sorts after every character that can appear in a token, used to find the end of a prefix range
+PREFIX_END = "\uffff"
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits text into the lowercase tokens used by the search index.
+
+    :param text: Part name or search query.
+    :return: List of tokens in the order they appear.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class NameSearchIndex:
+
+    def __init__(self, catalog):
+        """
+        Builds an inverted index over the part names of a catalog.
+
+        Every distinct token is kept in a sorted vocabulary, and the catalog rows containing each token are stored
+        together in vocabulary order. All the tokens starting with a prefix are next to each other in the vocabulary,
+        so their rows are a single slice of the postings. A second set of postings holds only the first token of each
+        name, to find the names that start with the query.
+
+        :param catalog: CompactCatalog of the parts.
+        """
+        self.catalog = catalog
+        names = catalog.names()
+
+        token_rows, first_token_rows = {}, {}
+        for row, name in enumerate(names):
+            tokens = tokenize(name)
+            if tokens:
+                first_token_rows.setdefault(tokens[0], []).append(row)
+            for token in dict.fromkeys(tokens):
+                token_rows.setdefault(token, []).append(row)
+
+        self._vocabulary = sorted(token_rows)
+        self._offsets, self._postings = self._build_postings(token_rows)
+        self._first_offsets, self._first_postings = self._build_postings(first_token_rows)
+
+        # Position of each name in alphabetical order, used to order matches without decoding their names
+        lowered_names = [name.lower() for name in names]
+        self._name_order = np.empty(len(names), dtype=np.int32)
+        self._name_order[sorted(range(len(names)), key=lowered_names.__getitem__)] = np.arange(len(names))
+
+    def _build_postings(self, token_rows: dict) -> tuple:
+        """
+        Lays out the rows of each token in vocabulary order.
+
+        :param token_rows: Dictionary mapping tokens to the ascending rows they appear in.
+        :return: Tuple of (offsets, postings) - the rows of the i-th vocabulary token are
+                 postings[offsets[i]:offsets[i + 1]].
+        """
+        counts = [len(token_rows.get(token, ())) for token in self._vocabulary]
+        offsets = np.zeros(len(self._vocabulary) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        postings = np.empty(offsets[-1], dtype=np.int32)
+        for position, token in enumerate(self._vocabulary):
+            if token in token_rows:
+                postings[offsets[position]:offsets[position + 1]] = token_rows[token]
+        return offsets, postings
+
+    def _prefix_range(self, prefix: str) -> tuple:
+        """
+        Finds the vocabulary positions of every token starting with a prefix.
+        """
+        return bisect_left(self._vocabulary, prefix), bisect_left(self._vocabulary, prefix + PREFIX_END)
+
+    def _prefix_postings(self, offsets: np.ndarray, postings: np.ndarray, prefix: str) -> np.ndarray:
+        """
+        Fetches the rows of every token starting with a prefix, a row appears more than once if several tokens in its
+        name start with the prefix.
+        """
+        low, high = self._prefix_range(prefix)
+        return postings[offsets[low]:offsets[high]]
+
+    def _row_mask(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Marks rows in a mask over the whole catalog, which is quicker than sorting to dedupe or intersect them.
+        """
+        mask = np.zeros(len(self._name_order), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def __len__(self):
+        return len(self._vocabulary)
+
+    def search(self, query: str, part_type: str = None, limit: int = 10) -> np.ndarray:
+        """
+        Finds the parts whose names contain a token starting with each word of the query.
+
+        Names starting with the first word of the query are ranked first, then matches are ordered alphabetically.
+
+        :param query: Search text, such as "rtx 40".
+        :param part_type: Type the parts must be, any type if not provided.
+        :param limit: Most parts returned.
+        :return: Array of the catalog rows of the matching parts, best match first.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return np.empty(0, dtype=np.int32)
+
+        # Starts from the word matching the fewest rows, so the other words are only checked against a few rows
+        first_word = tokens[0]
+        token_ranges = {token: self._prefix_range(token) for token in tokens}
+        tokens.sort(key=lambda token: self._offsets[token_ranges[token][1]] - self._offsets[token_ranges[token][0]])
+
+        low, high = token_ranges[tokens[0]]
+        matches = self._postings[self._offsets[low]:self._offsets[high]]
+        if high - low > 1:
+            # Several tokens start with the word, so a row may be listed more than once
+            matches = np.flatnonzero(self._row_mask(matches))
+
+        if part_type is not None:
+            if part_type not in self.catalog.type_labels:
+                return np.empty(0, dtype=np.int32)
+            matches = matches[self.catalog.type_codes[matches] == self.catalog.type_labels.index(part_type)]
+
+        for token in tokens[1:]:
+            if len(matches) == 0:
+                break
+            matches = matches[self._row_mask(self._prefix_postings(self._offsets, self._postings, token))[matches]]
+
+        starts_with_query = self._row_mask(self._prefix_postings(self._first_offsets, self._first_postings,
+                                                                 first_word))[matches]
+        rank = np.where(starts_with_query, 0, len(self._name_order)) + self._name_order[matches]
+        if len(matches) > limit:
+            best = np.argpartition(rank, limit - 1)[:limit]
+            return matches[best[np.argsort(rank[best])]]
+        return matches[np.argsort(rank)]
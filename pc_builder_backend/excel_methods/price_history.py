@@ -0,0 +1,275 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from pc_builder_backend.excel_methods.catalog_diff import CatalogDiff
+
+# Price change records, each segment holds them sorted by part then time
+HISTORY_DTYPE = np.dtype([('part_id', '<u4'), ('recorded_at', '<i8'), ('price_pence', '<i4')])
+# Price recorded when a part stops being listed
+REMOVED_PRICE = -1
+# File in the history directory listing the [type, name] of each part, a part's id is its line number
+PART_KEYS_FILE = "parts.jsonl"
+# Segments are numbered in the order they were written
+SEGMENT_PREFIX = "segment-"
+
+
+def merge_records(records: np.ndarray) -> np.ndarray:
+    """
+    Sorts records by part then time, dropping records repeated across segments.
+
+    Records of a part at the same time keep the order of their segments, so runs scraped within the same second keep
+    the order they were appended in.
+
+    :param records: Array of HISTORY_DTYPE records, in the order of the segments they were read from.
+    :return: Array of the sorted records.
+    """
+    _, first_indices = np.unique(records, return_index=True)
+    records = records[np.sort(first_indices)]
+    return records[np.lexsort((records['recorded_at'], records['part_id']))]
+
+
+def get_history_dir(excel_file: str) -> str:
+    """
+    Works out the directory the price history of an Excel catalog is kept in, next to the catalog itself.
+
+    :param excel_file: File path of the Excel catalog.
+    :return: Directory path of the price history.
+    """
+    directory, filename = os.path.split(excel_file)
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}.history")
+
+
+class PriceHistoryStore:
+
+    def __init__(self, history_dir: str):
+        """
+        Initialises an append-only log of the price changes of every part in the catalog.
+
+        Each scraper run appends one segment holding only the parts that were added, removed or repriced, as an array
+        of HISTORY_DTYPE records sorted by part. Segments are never modified, they are memory mapped and a part's
+        records are found in each by binary search, so reading a part's history doesn't read the rest of the log.
+        Compacting merges the segments into one so the number of segments searched stays small.
+
+        :param history_dir: Directory the history is kept in, created when the first changes are appended.
+        """
+        self.history_dir = history_dir
+        self._lock = threading.Lock()
+        # Ids of the parts read from the part keys file so far, and how many bytes of it have been read
+        self._part_ids = {}
+        self._types_by_name = {}
+        self._keys_read = 0
+        # Memory mapped segments, which never change once written
+        self._segments = {}
+
+    @property
+    def part_keys_file(self) -> str:
+        return os.path.join(self.history_dir, PART_KEYS_FILE)
+
+    def _refresh_part_ids(self) -> None:
+        """
+        Reads any parts appended to the part keys file since it was last read, ignoring a partly written last line.
+        """
+        try:
+            with open(self.part_keys_file, 'rb') as file:
+                file.seek(self._keys_read)
+                appended = file.read()
+        except FileNotFoundError:
+            return
+
+        complete = appended[:appended.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            part_type, name = json.loads(line)
+            self._part_ids[(part_type, name)] = len(self._part_ids)
+            self._types_by_name.setdefault(name, []).append(part_type)
+        self._keys_read += len(complete)
+
+    def _add_part_ids(self, part_keys: list) -> None:
+        """
+        Gives ids to the parts that don't have one yet, appending them to the part keys file.
+        """
+        new_keys = list(dict.fromkeys(key for key in part_keys if key not in self._part_ids))
+        if not new_keys:
+            return
+
+        os.makedirs(self.history_dir, exist_ok=True)
+        lines = "".join(json.dumps(list(key), ensure_ascii=False) + "\n" for key in new_keys).encode('utf-8')
+        with open(self.part_keys_file, 'ab') as file:
+            # A line left partly written by a run that failed would corrupt the next line appended after it
+            file.truncate(self._keys_read)
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        self._keys_read += len(lines)
+        for part_type, name in new_keys:
+            self._part_ids[(part_type, name)] = len(self._part_ids)
+            self._types_by_name.setdefault(name, []).append(part_type)
+
+    def segment_files(self) -> list:
+        """
+        Lists the segments of the history in the order they were written.
+
+        :return: List of file paths of the segments.
+        """
+        return sorted(glob.glob(os.path.join(self.history_dir, f"{SEGMENT_PREFIX}*.npy")))
+
+    def _next_segment_file(self) -> str:
+        """
+        Works out the file path of the segment written after every existing segment.
+        """
+        segment_files = self.segment_files()
+        last = int(os.path.basename(segment_files[-1])[len(SEGMENT_PREFIX):-4]) if segment_files else 0
+        return os.path.join(self.history_dir, f"{SEGMENT_PREFIX}{last + 1:08d}.npy")
+
+    def _write_segment(self, records: np.ndarray) -> str:
+        """
+        Writes records to a new segment, writing to a temporary file first so a partly written segment is never read.
+        """
+        segment_file = self._next_segment_file()
+        file_descriptor, temp_file = tempfile.mkstemp(dir=self.history_dir, suffix='.npy.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                np.save(file, records, allow_pickle=False)
+            # Temporary files are only readable by their owner, the segment is made readable like any other file
+            os.chmod(temp_file, 0o644)
+            os.replace(temp_file, segment_file)
+        except OSError:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        return segment_file
+
+    def append(self, diff: CatalogDiff, recorded_at: int = None) -> int:
+        """
+        Appends the changes between two versions of the catalog to the history as a new segment.
+
+        Added and repriced parts are recorded at their new price and removed parts at REMOVED_PRICE.
+
+        :param diff: CatalogDiff of the changes.
+        :param recorded_at: Unix time the changes were scraped at, now if not provided.
+        :return: Number of records appended, no segment is written if there were no changes.
+        """
+        if recorded_at is None:
+            recorded_at = int(time.time())
+        changes = [(part_type, name, price) for part_type, name, price in diff.added]
+        changes += [(part_type, name, new_price) for part_type, name, _, new_price in diff.repriced]
+        changes += [(part_type, name, REMOVED_PRICE) for part_type, name, _ in diff.removed]
+        if not changes:
+            return 0
+
+        with self._lock:
+            self._refresh_part_ids()
+            self._add_part_ids([(part_type, name) for part_type, name, _ in changes])
+
+            records = np.empty(len(changes), dtype=HISTORY_DTYPE)
+            records['part_id'] = [self._part_ids[(part_type, name)] for part_type, name, _ in changes]
+            records['recorded_at'] = recorded_at
+            records['price_pence'] = [price for _, _, price in changes]
+            records.sort(order=('part_id', 'recorded_at'))
+            self._write_segment(records)
+
+        return len(records)
+
+    def compact(self) -> int:
+        """
+        Merges every segment into one, so reading a part's history searches a single segment.
+
+        The merged segment is written before the old segments are removed, a reader listing the segments in between
+        sees each record twice, which history drops.
+
+        :return: Number of segments merged, segments are only merged if there is more than one.
+        """
+        with self._lock:
+            segment_files = self.segment_files()
+            if len(segment_files) < 2:
+                return 0
+
+            records = merge_records(np.concatenate([np.load(segment_file) for segment_file in segment_files]))
+            self._write_segment(records)
+            for segment_file in segment_files:
+                os.remove(segment_file)
+                self._segments.pop(segment_file, None)
+
+        return len(segment_files)
+
+    def _load_segment(self, segment_file: str):
+        """
+        Memory maps a segment, reusing the mapping made the last time it was read.
+
+        :return: Array of the segment's records, or None if the segment was removed by compacting.
+        """
+        segment = self._segments.get(segment_file)
+        if segment is None:
+            try:
+                segment = np.load(segment_file, mmap_mode='r')
+            except FileNotFoundError:
+                return None
+            self._segments[segment_file] = segment
+        return segment
+
+    def find_types(self, name: str) -> list:
+        """
+        Finds the types of the parts with a name that have a history.
+
+        :param name: Name of the part.
+        :return: List of the part types, in the order their history started.
+        """
+        with self._lock:
+            self._refresh_part_ids()
+            return list(self._types_by_name.get(name, ()))
+
+    def history(self, part_type: str, name: str) -> list:
+        """
+        Reads the price history of a part.
+
+        :param part_type: Type of the part (e.g., CPU, GPU, RAM).
+        :param name: Name of the part.
+        :return: List of (unix time, price in pounds) of each change in time order, where the price is None from when
+                 the part stopped being listed. Empty if the part has no history.
+        """
+        with self._lock:
+            self._refresh_part_ids()
+            part_id = self._part_ids.get((part_type, name))
+            if part_id is None:
+                return []
+
+            segment_files = self.segment_files()
+            # Mappings of segments removed by compacting are released
+            for segment_file in set(self._segments) - set(segment_files):
+                del self._segments[segment_file]
+
+            matches = []
+            for segment_file in segment_files:
+                segment = self._load_segment(segment_file)
+                if segment is None:
+                    continue
+                part_ids = segment['part_id']
+                start, end = np.searchsorted(part_ids, [part_id, part_id + 1])
+                matches.append(np.array(segment[start:end]))
+
+        if not matches:
+            return []
+        # Drops records read from both a merged segment and the segments it replaced
+        records = merge_records(np.concatenate(matches))
+        return [(recorded_at, price_pence / 100 if price_pence != REMOVED_PRICE else None)
+                for _, recorded_at, price_pence in records.tolist()]
+
+    def stats(self) -> dict:
+        """
+        Reports the size of the history.
+
+        :return: Dictionary of the number of parts with a history, segments and records.
+        """
+        with self._lock:
+            self._refresh_part_ids()
+            segment_files = self.segment_files()
+            records = 0
+            for segment_file in segment_files:
+                segment = self._load_segment(segment_file)
+                records += len(segment) if segment is not None else 0
+            return {"parts": len(self._part_ids), "segments": len(segment_files), "records": records}
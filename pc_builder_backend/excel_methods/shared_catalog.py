@@ -0,0 +1,238 @@
+import glob
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Union
+
+import numpy as np
+
+from pc_builder_backend.excel_methods.catalog_index import is_index_ordered
+from pc_builder_backend.excel_methods.catalog_loader import load_compact_catalog
+from pc_builder_backend.excel_methods.catalog_snapshot import get_catalog_version
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+
+# Marks the start of a catalog segment file
+SEGMENT_MAGIC = b"PCBCATLG"
+# Bumped whenever the layout of a segment changes so old segments are published again
+SEGMENT_FORMAT = 1
+# Arrays start on cache line boundaries so the views workers take of them are aligned
+SEGMENT_ALIGNMENT = 64
+# File in the segment directory naming the segment workers should attach to
+CURRENT_SEGMENT_FILE = "current"
+# CompactCatalog arrays written to a segment, in the order they are laid out
+SEGMENT_ARRAYS = ("type_codes", "prices_pence", "name_offsets", "name_buffer")
+
+# Magic followed by the length of the JSON header
+SEGMENT_PREAMBLE = struct.Struct("<8sQ")
+
+
+def get_segment_dir(excel_file: str) -> str:
+    """
+    Works out the directory the shared segments of an Excel catalog are published to, next to the catalog itself.
+
+    :param excel_file: File path of the Excel catalog.
+    :return: Directory path of the segments.
+    """
+    directory, filename = os.path.split(excel_file)
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}.segments")
+
+
+def _align(offset: int) -> int:
+    """
+    Rounds an offset up to the next multiple of SEGMENT_ALIGNMENT.
+    """
+    return -(-offset // SEGMENT_ALIGNMENT) * SEGMENT_ALIGNMENT
+
+
+def write_segment(segment_file: str, catalog: CompactCatalog, version: str, source: dict) -> None:
+    """
+    Writes a catalog to a segment file, writing to a temporary file first so a partly written segment is never read.
+
+    The file starts with SEGMENT_MAGIC and the length of a JSON header. The header holds the catalog version, the
+    details of its source file, the type labels and the dtype, offset and length of each array. The arrays follow,
+    each aligned to SEGMENT_ALIGNMENT bytes, with offsets counted from the end of the header.
+
+    :param segment_file: File path of the segment.
+    :param catalog: CompactCatalog to write.
+    :param version: Version of the catalog.
+    :param source: Details of the catalog file the catalog was read from.
+    """
+    layout, offset = {}, 0
+    for name in SEGMENT_ARRAYS:
+        array = getattr(catalog, name)
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": len(array)}
+        offset += array.nbytes
+
+    header = json.dumps({
+        "format": SEGMENT_FORMAT,
+        "version": version,
+        "source": source,
+        "num_parts": len(catalog),
+        "type_labels": list(catalog.type_labels),
+        "arrays": layout,
+    }).encode('utf-8')
+    data_start = _align(SEGMENT_PREAMBLE.size + len(header))
+
+    directory = os.path.dirname(segment_file) or '.'
+    file_descriptor, temp_file = tempfile.mkstemp(dir=directory, suffix='.seg.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(SEGMENT_PREAMBLE.pack(SEGMENT_MAGIC, len(header)))
+            file.write(header)
+            for name in SEGMENT_ARRAYS:
+                file.seek(data_start + layout[name]["offset"])
+                file.write(getattr(catalog, name).tobytes())
+            file.truncate(data_start + offset)
+        # Temporary files are only readable by their owner, workers may run as other users
+        os.chmod(temp_file, 0o644)
+        os.replace(temp_file, segment_file)
+    except OSError:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def read_segment_header(segment_file: str) -> Union[dict, None]:
+    """
+    Reads the header of a segment file.
+
+    :param segment_file: File path of the segment.
+    :return: Dictionary of the header with the position its arrays start from, or None if it can't be read.
+    """
+    try:
+        with open(segment_file, 'rb') as file:
+            magic, header_length = SEGMENT_PREAMBLE.unpack(file.read(SEGMENT_PREAMBLE.size))
+            if magic != SEGMENT_MAGIC:
+                return None
+            header = json.loads(file.read(header_length).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+    if header.get("format") != SEGMENT_FORMAT:
+        return None
+    header["data_start"] = _align(SEGMENT_PREAMBLE.size + header_length)
+    return header
+
+
+def attach_catalog(segment_file: str) -> CompactCatalog:
+    """
+    Attaches to a published segment, the catalog's arrays are read-only views of the memory mapped file.
+
+    Every worker attached to the same segment shares one copy of the catalog through the page cache. The mapping
+    stays open for as long as any of the arrays are in use, even after the segment is replaced or removed.
+
+    :param segment_file: File path of the segment.
+    :return: CompactCatalog whose arrays are views of the segment.
+    :raises ValueError: If the file isn't a segment or its arrays don't fit in it.
+    """
+    header = read_segment_header(segment_file)
+    if header is None:
+        raise ValueError(f"'{segment_file}' is not a catalog segment.")
+
+    with open(segment_file, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        arrays[name] = np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=spec["length"],
+                                     offset=header["data_start"] + spec["offset"])
+    # The version was worked out from these arrays when they were published, so isn't hashed again by each worker
+    return CompactCatalog(type_labels=header["type_labels"], version=header["version"], **arrays)
+
+
+def get_current_segment(segment_dir: str) -> Union[str, None]:
+    """
+    Finds the segment workers should currently attach to.
+
+    :param segment_dir: Directory the segments are published to.
+    :return: File path of the current segment, or None if nothing has been published.
+    """
+    try:
+        with open(os.path.join(segment_dir, CURRENT_SEGMENT_FILE), 'r') as file:
+            segment_name = file.read().strip()
+    except OSError:
+        return None
+    return os.path.join(segment_dir, segment_name) if segment_name else None
+
+
+def publish_catalog(catalog: CompactCatalog, segment_dir: str, source: dict) -> str:
+    """
+    Publishes a catalog to a new segment named after its version, then points the current segment at it.
+
+    The catalog is written grouped by type and sorted by price, so workers can use its arrays as their price index
+    without building private copies. Segments older than the new and previous ones are removed.
+
+    :param catalog: CompactCatalog to publish.
+    :param segment_dir: Directory the segments are published to.
+    :param source: Details of the catalog file the catalog was read from.
+    :return: File path of the published segment.
+    """
+    if not is_index_ordered(catalog):
+        catalog = catalog.take(np.lexsort((catalog.prices_pence, catalog.type_codes)))
+    version = get_catalog_version(catalog)
+
+    os.makedirs(segment_dir, exist_ok=True)
+    previous_segment = get_current_segment(segment_dir)
+    segment_file = os.path.join(segment_dir, f"catalog-{version}.seg")
+    write_segment(segment_file=segment_file, catalog=catalog, version=version, source=source)
+
+    file_descriptor, temp_file = tempfile.mkstemp(dir=segment_dir, suffix='.tmp')
+    with os.fdopen(file_descriptor, 'w') as file:
+        file.write(os.path.basename(segment_file))
+    os.chmod(temp_file, 0o644)
+    os.replace(temp_file, os.path.join(segment_dir, CURRENT_SEGMENT_FILE))
+
+    _remove_old_segments(segment_dir=segment_dir, keep={segment_file, previous_segment})
+    return segment_file
+
+
+def load_shared_catalog(catalog_file: str, segment_dir: str = None) -> CompactCatalog:
+    """
+    Loads the parts catalog by attaching to the segment published for the current catalog file, publishing one first
+    if the catalog file has changed since the current segment was published.
+
+    The first worker to see a change publishes the new segment and the others attach to it. If the segment can't be
+    published the worker keeps a private copy of the catalog instead.
+
+    :param catalog_file: File path of the columnar catalog, or of the Excel catalog.
+    :param segment_dir: Directory the segments are published to, kept next to the catalog if not provided.
+    :return: CompactCatalog of the parts.
+    """
+    if segment_dir is None:
+        segment_dir = get_segment_dir(catalog_file)
+
+    stat = os.stat(catalog_file)
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    segment_file = get_current_segment(segment_dir)
+    if segment_file is not None:
+        header = read_segment_header(segment_file)
+        if header is not None and header["source"] == source:
+            try:
+                return attach_catalog(segment_file)
+            except (OSError, ValueError) as e:
+                # Replaced while attaching, the catalog is loaded and published again below
+                print(f"Catalog segment '{segment_file}' could not be attached: {e}")
+
+    catalog = load_compact_catalog(catalog_file)
+    try:
+        segment_file = publish_catalog(catalog=catalog, segment_dir=segment_dir, source=source)
+        return attach_catalog(segment_file)
+    except (OSError, ValueError) as e:
+        print(f"Catalog could not be shared through '{segment_dir}': {e}")
+        return catalog
+
+
+def _remove_old_segments(segment_dir: str, keep: set) -> None:
+    """
+    Removes published segments other than those kept, workers still attached to one keep their mapping of it.
+    """
+    for segment_file in glob.glob(os.path.join(segment_dir, "catalog-*.seg")):
+        if segment_file in keep:
+            continue
+        try:
+            os.remove(segment_file)
+        except OSError as e:
+            print(f"Old catalog segment '{segment_file}' could not be removed: {e}")
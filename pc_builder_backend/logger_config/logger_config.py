@@ -1,18 +1,25 @@
 import logging
 import os
 
+from pc_builder_backend.constants import LOG_DIR
 
-def create_logger(filename: str):
+
+def create_logger(filename: str, log_dir: str = LOG_DIR):
     """
     Creates a logger instance with specified filename and sets up logging handlers.
 
     :param filename: Name of the log file.
+    :param log_dir: Directory the log file is written to, logs/ in the project root if not provided.
     :return: Logger instance.
     """
-    # Get the absolute path to the project root
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-
-    log_file_path = os.path.join(project_root, 'logs', filename)
+    if log_dir is None:
+        # Get the absolute path to the project root
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        log_dir = os.path.join(project_root, 'logs')
+
+    # The logs directory isn't tracked, so it is created on first use
+    os.makedirs(log_dir, exist_ok=True)
+    log_file_path = os.path.join(log_dir, filename)
 
     # Create a new logger instance with a unique name
     logger_instance = logging.getLogger(f"logger_{filename}")
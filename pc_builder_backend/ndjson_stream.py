@@ -0,0 +1,52 @@
+from typing import Iterable, Iterator
+
+from flask import Request, Response, current_app, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Lines are gathered into chunks of about this size before being written, rather than one write per record
+NDJSON_CHUNK_BYTES = 64 * 1024
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    Checks if the client asked for newline delimited JSON, it has to be preferred over JSON in the Accept header.
+
+    :param request: The incoming request.
+    :return: True if the response should be streamed as NDJSON.
+    """
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def encode_ndjson(records: Iterable) -> Iterator[bytes]:
+    """
+    Encodes records as JSON lines, one record per line, in chunks of about NDJSON_CHUNK_BYTES.
+
+    Records are encoded the same way as jsonify, so a record reads the same in either response format.
+
+    :param records: Iterable of JSON serialisable records, only read as the chunks are needed.
+    :return: Iterator of encoded chunks.
+    """
+    dumps = current_app.json.dumps
+    lines, size = [], 0
+    for record in records:
+        line = (dumps(record, separators=(',', ':')) + "\n").encode('utf-8')
+        lines.append(line)
+        size += len(line)
+        if size >= NDJSON_CHUNK_BYTES:
+            yield b"".join(lines)
+            lines, size = [], 0
+    if lines:
+        yield b"".join(lines)
+
+
+def make_ndjson_response(records: Iterable, status: int = 200, headers: dict = None) -> Response:
+    """
+    Builds a response streaming records as newline delimited JSON, so the whole result is never held in memory.
+
+    :param records: Iterable of JSON serialisable records, read lazily while the response is sent.
+    :param status: Status code of the response.
+    :param headers: Extra headers to send with the response.
+    :return: Flask Response streaming the records.
+    """
+    return Response(stream_with_context(encode_ndjson(records)), status=status, headers=headers,
+                    mimetype=NDJSON_MIMETYPE)
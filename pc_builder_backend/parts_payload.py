@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import json
+import threading
+
+from flask import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Compression levels trade a slower build once per catalog version for smaller responses on every request
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+# Content encodings the payload can be sent with, in order of preference
+PAYLOAD_ENCODINGS = ("br", "gzip", "identity") if brotli is not None else ("gzip", "identity")
+
+
+class PartsPayload:
+
+    def __init__(self, snapshot):
+        """
+        Serialises the parts of a catalog snapshot once, so every request for that version is sent the same bytes.
+
+        :param snapshot: CatalogSnapshot whose parts are listed.
+        """
+        self.version = snapshot.version
+        self.num_parts = len(snapshot.catalog)
+        self._bodies = {"identity": json.dumps({"catalog_version": snapshot.version,
+                                                "parts": snapshot.catalog.to_lists()},
+                                               separators=(',', ':')).encode('utf-8')}
+        self._tag = hashlib.sha256(self._bodies["identity"]).hexdigest()[:32]
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str = "identity") -> str:
+        """
+        Fetches the strong ETag of the payload, each encoding is a different representation so has its own tag.
+
+        :param encoding: Content encoding of the representation.
+        :return: The ETag, without quotes.
+        """
+        return self._tag if encoding == "identity" else f"{self._tag}-{encoding}"
+
+    def body(self, encoding: str = "identity") -> bytes:
+        """
+        Fetches the payload in a content encoding, compressing it the first time that encoding is asked for.
+
+        :param encoding: One of PAYLOAD_ENCODINGS.
+        :return: The encoded payload.
+        :raises ValueError: If the encoding isn't supported.
+        """
+        if encoding not in PAYLOAD_ENCODINGS:
+            raise ValueError(f"encoding must be one of {', '.join(PAYLOAD_ENCODINGS)}.")
+
+        body = self._bodies.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._bodies.get(encoding)
+                if body is None:
+                    body = self._compress(encoding)
+                    self._bodies[encoding] = body
+        return body
+
+    def _compress(self, encoding: str) -> bytes:
+        """
+        Compresses the identity payload with a content encoding.
+        """
+        if encoding == "gzip":
+            # A fixed mtime keeps the compressed bytes the same for the same payload
+            return gzip.compress(self._bodies["identity"], compresslevel=GZIP_LEVEL, mtime=0)
+        return brotli.compress(self._bodies["identity"], quality=BROTLI_QUALITY)
+
+
+class PartsPayloadCache:
+
+    def __init__(self):
+        """
+        Initialises a cache holding the parts payload of the latest catalog version served.
+        """
+        self._payload = None
+        self._lock = threading.Lock()
+
+    def get(self, snapshot) -> PartsPayload:
+        """
+        Fetches the payload of a snapshot, serialising it if its version hasn't been served before.
+
+        Concurrent requests for a new version wait for one serialisation rather than each building their own.
+
+        :param snapshot: CatalogSnapshot whose parts are listed.
+        :return: The PartsPayload of the snapshot.
+        """
+        payload = self._payload
+        if payload is not None and payload.version == snapshot.version:
+            return payload
+
+        with self._lock:
+            if self._payload is None or self._payload.version != snapshot.version:
+                self._payload = PartsPayload(snapshot)
+            return self._payload
+
+
+def choose_encoding(request: Request) -> str:
+    """
+    Picks the preferred content encoding the client accepts.
+
+    :param request: The incoming request.
+    :return: One of PAYLOAD_ENCODINGS, identity if no compression is accepted.
+    """
+    for encoding in PAYLOAD_ENCODINGS:
+        if encoding != "identity" and request.accept_encodings[encoding] > 0:
+            return encoding
+    return "identity"
+
+
+def make_payload_response(payload: PartsPayload, request: Request) -> Response:
+    """
+    Builds the response for a parts payload, a 304 with no body if the client already holds the current version.
+
+    :param payload: PartsPayload being requested.
+    :param request: The incoming request, its If-None-Match and Accept-Encoding headers are used.
+    :return: Flask Response with the ETag and caching headers set.
+    """
+    encoding = choose_encoding(request)
+    etag = payload.etag(encoding)
+
+    if request.if_none_match.contains(etag) or request.if_none_match.star_tag:
+        response = Response(status=304)
+    else:
+        response = Response(payload.body(encoding), status=200, mimetype='application/json')
+        if encoding != "identity":
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Clients may keep the payload but must check it is still current before using it
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
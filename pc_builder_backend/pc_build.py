@@ -17,6 +17,10 @@ class PCBuild:
         self.power_supply = None
         self.case = None
         self.build_id = str(uuid.uuid4())
+        # Components that had no parts within their price range and were filled by a wider search
+        self.fallback_slots = []
+        # Version of the parts catalog the build was generated from
+        self.catalog_version = None
 
         # Initialise prices as 0
         self.overall_price: float = 0
@@ -153,5 +157,6 @@ class PCBuild:
             "OverallPrice": self.overall_price,
             "build_id": self.build_id,
             "user_id": user_id,
+            "catalog_version": self.catalog_version,
             "created_at": datetime.datetime.now()
         }
@@ -0,0 +1,174 @@
+import time
+import unittest
+
+from pc_builder_backend.excel_methods.build_pool import BuildPool
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """
+    Polls a condition until it is true or the timeout passes.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestBuildPool(unittest.TestCase):
+
+    def setUp(self):
+        catalog = create_test_catalog()
+        index = CatalogIndex(catalog)
+        self.generated = []
+
+        def generate_build(budget):
+            build = generate_build_from_excel(build_price=budget, complete_parts_df=catalog, catalog_index=index)
+            self.generated.append(budget)
+            return build
+
+        self.generate_build = generate_build
+
+    def test_fills_and_refills(self):
+        """
+        Test that every budget is filled to the pool depth and refilled after a build is taken.
+        """
+        pool = BuildPool(budgets=[500, 1000], depth=3, refill_per_second=1000, generate_build=self.generate_build)
+        pool.start()
+        try:
+            self.assertTrue(wait_for(lambda: pool.stats()['ready_builds'] == {'500': 3, '1000': 3}))
+            build = pool.take(1000)
+            self.assertTrue(build.is_valid())
+            self.assertTrue(wait_for(lambda: pool.stats()['ready_builds']['1000'] == 3))
+            stats = pool.stats()
+            self.assertEqual(stats['hits'], 1)
+            self.assertGreater(stats['max_refill_lag_ms'], 0)
+        finally:
+            pool.stop(timeout=1)
+
+    def test_miss_for_budget_not_pooled(self):
+        """
+        Test that budgets that aren't pooled, or have no ready builds, are counted as misses.
+        """
+        pool = BuildPool(budgets=[1000], depth=2, refill_per_second=1000, generate_build=self.generate_build)
+        self.assertIsNone(pool.take(1000))
+        self.assertIsNone(pool.take(750))
+        self.assertEqual(pool.stats()['misses'], 2)
+
+    def test_clear_discards_builds(self):
+        """
+        Test that clearing the pool throws away every ready build and the builds taken waiting to be replaced.
+        """
+        pool = BuildPool(budgets=[1000], depth=2, refill_per_second=1000, generate_build=self.generate_build)
+        pool.start()
+        try:
+            self.assertTrue(wait_for(lambda: pool.stats()['ready_builds']['1000'] == 2))
+            pool.stop(timeout=1)
+            self.assertIsNotNone(pool.take(1000))
+            pool.clear()
+            self.assertEqual(pool.stats()['discarded'], 1)
+            self.assertIsNone(pool.take(1000))
+            # The build taken before the clear isn't counted against the refills after it
+            self.assertEqual(len(pool._taken_at[1000]), 0)
+        finally:
+            pool.stop(timeout=1)
+
+    def test_invalid_builds_not_pooled(self):
+        """
+        Test that a budget the catalog can't build for is marked unfillable after max_failures attempts in a row,
+        instead of being retried forever.
+        """
+        attempts = []
+
+        def generate_build(budget):
+            attempts.append(budget)
+            return None
+
+        pool = BuildPool(budgets=[1000], depth=2, refill_per_second=1000, generate_build=generate_build,
+                         max_failures=3, retry_backoff=0.01)
+        pool.start()
+        try:
+            self.assertTrue(wait_for(lambda: pool.stats()['unfillable_budgets'] == [1000]))
+            self.assertIsNone(pool.take(1000))
+            time.sleep(0.1)
+            self.assertEqual(len(attempts), 3)
+        finally:
+            pool.stop(timeout=1)
+
+    def test_failures_are_retried(self):
+        """
+        Test that a budget whose builds fail a few times, by raising or by being invalid, is backed off and then
+        filled rather than being given up on.
+        """
+        failures = [RuntimeError("database unavailable"), None]
+
+        def generate_build(budget):
+            if failures:
+                failure = failures.pop(0)
+                if failure is not None:
+                    raise failure
+                return None
+            return self.generate_build(budget)
+
+        pool = BuildPool(budgets=[1000], depth=2, refill_per_second=1000, generate_build=generate_build,
+                         max_failures=3, retry_backoff=0.01)
+        pool.start()
+        try:
+            self.assertTrue(wait_for(lambda: pool.stats()['ready_builds']['1000'] == 2))
+            stats = pool.stats()
+            self.assertEqual(stats['unfillable_budgets'], [])
+            self.assertEqual(stats['failing_budgets'], {})
+        finally:
+            pool.stop(timeout=1)
+
+    def test_failed_budget_backed_off(self):
+        """
+        Test that a budget isn't tried again until its backoff has passed, while other budgets keep being filled.
+        """
+        def generate_build(budget):
+            if budget == 500:
+                return None
+            return self.generate_build(budget)
+
+        pool = BuildPool(budgets=[500, 1000], depth=2, refill_per_second=1000, generate_build=generate_build,
+                         max_failures=3, retry_backoff=60)
+        pool.start()
+        try:
+            self.assertTrue(wait_for(lambda: pool.stats()['ready_builds']['1000'] == 2))
+            self.assertEqual(pool.stats()['failing_budgets'], {'500': 1})
+            self.assertEqual(pool.stats()['unfillable_budgets'], [])
+        finally:
+            pool.stop(timeout=1)
+
+    def test_refill_rate_limited(self):
+        """
+        Test that the background thread generates no more builds than the refill rate allows.
+        """
+        pool = BuildPool(budgets=[500, 1000], depth=50, refill_per_second=20, generate_build=self.generate_build)
+        pool.start()
+        time.sleep(0.25)
+        pool.stop(timeout=1)
+        self.assertLessEqual(len(self.generated), 7)
+
+    def test_invalid_input(self):
+        """
+        Test that a ValueError is raised for a depth, refill rate, failure limit or backoff that isn't positive.
+        """
+        with self.assertRaises(ValueError):
+            BuildPool(budgets=[1000], depth=0, refill_per_second=10, generate_build=self.generate_build)
+        with self.assertRaises(ValueError):
+            BuildPool(budgets=[1000], depth=5, refill_per_second=0, generate_build=self.generate_build)
+        with self.assertRaises(ValueError):
+            BuildPool(budgets=[1000], depth=5, refill_per_second=10, generate_build=self.generate_build,
+                      max_failures=0)
+        with self.assertRaises(ValueError):
+            BuildPool(budgets=[1000], depth=5, refill_per_second=10, generate_build=self.generate_build,
+                      retry_backoff=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
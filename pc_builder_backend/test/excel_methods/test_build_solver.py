@@ -0,0 +1,95 @@
+import itertools
+import unittest
+
+import numpy as np
+from pc_builder_backend.excel_methods.build_solver import solve_build
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+def create_slot_candidates(rng: np.random.Generator, num_slots: int, num_candidates: int) -> dict:
+    """
+    Creates random candidates for a number of slots, prices are in whole pence.
+    """
+    slot_candidates = {}
+    for slot in range(num_slots):
+        prices = np.round(rng.uniform(10, 300, size=num_candidates), 2)
+        names = np.array([f"Part {slot}-{position}" for position in range(num_candidates)], dtype=object)
+        slot_candidates[f"Slot {slot}"] = (names, prices)
+    return slot_candidates
+
+
+class TestBuildSolver(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        """
+        Test that the solver finds the same best total as trying every combination.
+        """
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            slot_candidates = create_slot_candidates(rng, num_slots=4, num_candidates=6)
+            budget = float(rng.integers(100, 900))
+
+            best = -1
+            for combination in itertools.product(*[prices for _, prices in slot_candidates.values()]):
+                total = round(sum(combination) * 100)
+                if best < total <= budget * 100:
+                    best = total
+
+            selection, complete = solve_build(slot_candidates, budget, time_budget_ms=1000)
+            self.assertTrue(complete)
+            if best < 0:
+                self.assertIsNone(selection)
+            else:
+                self.assertEqual(round(sum(price for _, price in selection.values()) * 100), best)
+
+    def test_selection_uses_candidates(self):
+        """
+        Test that every slot gets one of its own candidates.
+        """
+        rng = np.random.default_rng(1)
+        slot_candidates = create_slot_candidates(rng, num_slots=7, num_candidates=30)
+        selection, _ = solve_build(slot_candidates, 1000, time_budget_ms=1000)
+        self.assertEqual(set(selection), set(slot_candidates))
+        for slot, (name, price) in selection.items():
+            names, prices = slot_candidates[slot]
+            self.assertAlmostEqual(prices[list(names).index(name)], price)
+
+    def test_time_budget_returns_best_so_far(self):
+        """
+        Test that a search that runs out of time still returns a selection within budget.
+        """
+        rng = np.random.default_rng(2)
+        slot_candidates = create_slot_candidates(rng, num_slots=7, num_candidates=400)
+        selection, _ = solve_build(slot_candidates, 1234.56, time_budget_ms=0)
+        self.assertIsNotNone(selection)
+        self.assertLessEqual(round(sum(price for _, price in selection.values()), 2), 1234.56)
+
+    def test_no_combination_fits(self):
+        """
+        Test that None is returned when even the cheapest parts go over budget, or a slot has no candidates.
+        """
+        slot_candidates = {'CPU': (np.array(['A']), np.array([80.0])), 'GPU': (np.array(['B']), np.array([50.0]))}
+        self.assertIsNone(solve_build(slot_candidates, 100, time_budget_ms=10)[0])
+        slot_candidates['RAM'] = (np.array([]), np.array([]))
+        self.assertIsNone(solve_build(slot_candidates, 1000, time_budget_ms=10)[0])
+
+    def test_generate_build_optimize_mode(self):
+        """
+        Test that optimize mode gives a valid build that doesn't go over budget.
+        """
+        catalog = create_test_catalog()
+        build = generate_build_from_excel(build_price=1000, complete_parts_df=catalog, mode="optimize")
+        self.assertTrue(build.is_valid())
+        self.assertLessEqual(build.overall_price, 1000)
+
+    def test_generate_build_invalid_mode(self):
+        """
+        Test that a ValueError is raised for an unknown build mode.
+        """
+        with self.assertRaises(ValueError):
+            generate_build_from_excel(build_price=1000, complete_parts_df=create_test_catalog(), mode="cheapest")
+
+
+if __name__ == '__main__':
+    unittest.main()
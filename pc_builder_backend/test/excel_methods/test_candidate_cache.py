@@ -0,0 +1,110 @@
+import unittest
+
+from pc_builder_backend.excel_methods.candidate_cache import CandidatePoolCache
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.excel_helper_methods import BUILD_SLOTS, allocate_budget, fetch_slot_candidates, \
+    fetch_slot_candidates_with_fallback, generate_build_from_excel
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+class TestCandidatePoolCache(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = create_test_catalog()
+        self.index = CatalogIndex(self.catalog)
+
+    def test_hits_for_nearby_target_prices(self):
+        """
+        Test that target prices rounding to the same step share a pool and are counted as hits.
+        """
+        cache = CandidatePoolCache(max_entries=10, price_step=5)
+        first = cache.get_candidates(self.index, ('GPU',), 299, fetch_slot_candidates)
+        second = cache.get_candidates(self.index, ('GPU',), 301, fetch_slot_candidates)
+        self.assertIs(first, second)
+        self.assertEqual(first[1].tolist(), [300])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_evicted(self):
+        """
+        Test that the least recently used pool is evicted once the cache is full.
+        """
+        cache = CandidatePoolCache(max_entries=2, price_step=5)
+        cache.get_candidates(self.index, ('CPU',), 100, fetch_slot_candidates)
+        cache.get_candidates(self.index, ('CPU',), 200, fetch_slot_candidates)
+        cache.get_candidates(self.index, ('CPU',), 100, fetch_slot_candidates)
+        cache.get_candidates(self.index, ('CPU',), 300, fetch_slot_candidates)
+        stats = cache.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['evictions'], 1)
+        # The pool for 200 was evicted, 100 was used more recently so is still held
+        cache.get_candidates(self.index, ('CPU',), 100, fetch_slot_candidates)
+        self.assertEqual(cache.hits, 2)
+        cache.get_candidates(self.index, ('CPU',), 200, fetch_slot_candidates)
+        self.assertEqual(cache.misses, 4)
+
+    def test_invalidated_on_new_catalog(self):
+        """
+        Test that the pools are dropped when a different catalog index is used.
+        """
+        cache = CandidatePoolCache(max_entries=10, price_step=5)
+        cache.get_candidates(self.index, ('RAM',), 100, fetch_slot_candidates)
+
+        reloaded_catalog = self.catalog.copy()
+        reloaded_catalog.loc[reloaded_catalog['Name'] == 'RAM 100', 'Price'] = 110.0
+        reloaded_index = CatalogIndex(reloaded_catalog)
+        _, prices = cache.get_candidates(reloaded_index, ('RAM',), 100, fetch_slot_candidates)
+
+        self.assertEqual(prices.tolist(), [80, 110])
+        self.assertEqual(cache.stats()['invalidations'], 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_pools_are_read_only(self):
+        """
+        Test that the pools handed out can't be modified.
+        """
+        cache = CandidatePoolCache(max_entries=10, price_step=5)
+        _, prices = cache.get_candidates(self.index, ('HDD', 'SSD'), 150, fetch_slot_candidates)
+        with self.assertRaises(ValueError):
+            prices[0] = 1
+
+    def test_invalid_input(self):
+        """
+        Test that a ValueError is raised for a cache size or price step that isn't positive.
+        """
+        with self.assertRaises(ValueError):
+            CandidatePoolCache(max_entries=0, price_step=5)
+        with self.assertRaises(ValueError):
+            CandidatePoolCache(max_entries=10, price_step=0)
+
+    def test_small_targets_keep_their_parts(self):
+        """
+        Test that the cache gives the same candidates as fetching them directly for the slots of low budgets.
+        """
+        cheap_catalog = create_test_catalog()
+        cheap_catalog['Price'] = cheap_catalog['Price'] / 20
+        index = CatalogIndex(cheap_catalog)
+        cache = CandidatePoolCache(max_entries=256, price_step=5)
+        self.assertEqual(cache.quantize(2), 2)
+        for build_price in (20, 30, 40, 50, 60):
+            for slot, (part_types, _) in BUILD_SLOTS.items():
+                target_price = build_price * allocate_budget(build_price)[slot]
+                cached = cache.get_candidates(index, part_types, target_price, fetch_slot_candidates_with_fallback)
+                direct = fetch_slot_candidates_with_fallback(index, part_types, target_price)
+                self.assertEqual(cached[0].tolist(), direct[0].tolist(), f"{slot} at {build_price}")
+                self.assertEqual(cached[2], direct[2])
+
+    def test_generate_build_through_cache(self):
+        """
+        Test that repeated builds at the same budget are served from the cache.
+        """
+        cache = CandidatePoolCache(max_entries=64, price_step=5)
+        for _ in range(3):
+            build = generate_build_from_excel(build_price=1000, complete_parts_df=self.catalog,
+                                              catalog_index=self.index, candidate_cache=cache)
+            self.assertTrue(build.is_valid())
+        self.assertEqual(cache.misses, 7)
+        self.assertEqual(cache.hits, 14)
+
+
+if __name__ == '__main__':
+    unittest.main()
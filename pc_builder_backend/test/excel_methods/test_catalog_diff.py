@@ -0,0 +1,47 @@
+import unittest
+
+import pandas as pd
+from pc_builder_backend.excel_methods.catalog_diff import diff_catalogs
+
+
+class TestCatalogDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = pd.DataFrame({'Type': ['CPU', 'CPU', 'GPU', 'RAM'],
+                                      'Name': ['Intel i5', 'AMD Ryzen 5', 'NVIDIA RTX 4070', 'Corsair 16GB'],
+                                      'Price': [200.0, 179.99, 549.99, 45.0]})
+
+    def test_diff_catalogs(self):
+        """
+        Test that parts are matched by type and name, and sorted into added, removed and repriced in catalog order.
+        """
+        current = pd.DataFrame({'Type': ['CPU', 'CPU', 'GPU', 'SSD', 'GPU'],
+                                'Name': ['Intel i5', 'AMD Ryzen 5', 'NVIDIA RTX 4070', 'Samsung 990 Pro', 'Intel i5'],
+                                'Price': [189.0, 179.99, 499.0, 120.5, 99.0]})
+        diff = diff_catalogs(self.previous, current)
+
+        self.assertEqual(diff.added, [('SSD', 'Samsung 990 Pro', 12050), ('GPU', 'Intel i5', 9900)])
+        self.assertEqual(diff.removed, [('RAM', 'Corsair 16GB', 4500)])
+        self.assertEqual(diff.repriced, [('CPU', 'Intel i5', 20000, 18900), ('GPU', 'NVIDIA RTX 4070', 54999, 49900)])
+        self.assertEqual(len(diff), 5)
+        self.assertEqual(diff.summary(), {"added": 2, "removed": 1, "repriced": 2})
+
+    def test_unchanged_catalog(self):
+        """
+        Test that a catalog with the same prices, reordered and with floating point error, has no changes.
+        """
+        current = self.previous.iloc[::-1].reset_index(drop=True)
+        current.loc[0, 'Price'] = 45.0 + 1e-9
+        self.assertEqual(len(diff_catalogs(self.previous, current)), 0)
+
+    def test_first_catalog(self):
+        """
+        Test that every part of the first catalog is added.
+        """
+        diff = diff_catalogs(pd.DataFrame(columns=['Type', 'Name', 'Price']), self.previous)
+        self.assertEqual(len(diff.added), 4)
+        self.assertEqual(diff.summary(), {"added": 4, "removed": 0, "repriced": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+import pandas as pd
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel, fetch_valid_parts, \
+    get_price_range
+
+
+def create_test_catalog() -> pd.DataFrame:
+    """
+    Creates a small catalog with a few parts of every type used in a build.
+    """
+    part_types = ['CPU', 'GPU', 'RAM', 'HDD', 'SSD', 'Motherboard', 'Power Supply', 'Case']
+    rows = []
+    for part_type in part_types:
+        for price in [40, 60, 80, 100, 150, 200, 300, 400, 600]:
+            rows.append({'Type': part_type, 'Name': f"{part_type} {price}", 'Price': float(price)})
+    return pd.DataFrame(rows)
+
+
+class TestCatalogIndex(unittest.TestCase):
+
+    def test_prices_sorted_per_type(self):
+        """
+        Test that the index sorts the prices of each part type and keeps the names aligned.
+        """
+        test_data = pd.DataFrame({'Type': ['CPU', 'GPU', 'CPU', 'CPU'],
+                                  'Name': ['Intel i7', 'NVIDIA GTX 1080', 'Intel i3', 'Intel i5'],
+                                  'Price': [300, 400, 100, 200]})
+        index = CatalogIndex(test_data)
+        self.assertEqual(index.prices('CPU').tolist(), [100, 200, 300])
+        self.assertEqual(index.names('CPU').tolist(), ['Intel i3', 'Intel i5', 'Intel i7'])
+        self.assertEqual(len(index), 4)
+        self.assertCountEqual(index.part_types(), ['CPU', 'GPU'])
+
+    def test_fetch_parts_in_range_inclusive(self):
+        """
+        Test that the bounds of a price range are both included.
+        """
+        index = CatalogIndex(create_test_catalog())
+        names, prices = index.fetch_parts_in_range('RAM', 60, 150)
+        self.assertEqual(prices.tolist(), [60, 80, 100, 150])
+        self.assertEqual(names.tolist(), ['RAM 60', 'RAM 80', 'RAM 100', 'RAM 150'])
+
+    def test_fetch_parts_in_range_empty(self):
+        """
+        Test that empty arrays are returned for unknown types and ranges with no parts.
+        """
+        index = CatalogIndex(create_test_catalog())
+        self.assertEqual(len(index.fetch_parts_in_range('Monitor', 0, 1000)[0]), 0)
+        self.assertEqual(len(index.fetch_parts_in_range('CPU', 1000, 2000)[0]), 0)
+
+    def test_index_is_read_only(self):
+        """
+        Test that the arrays handed out by the index can't be modified.
+        """
+        index = CatalogIndex(create_test_catalog())
+        with self.assertRaises(ValueError):
+            index.prices('CPU')[0] = 1
+
+    def test_matches_fetch_valid_parts(self):
+        """
+        Test that the index returns the same parts as the DataFrame query for every type and target price.
+        """
+        catalog = create_test_catalog()
+        index = CatalogIndex(catalog)
+        for part_type in index.part_types():
+            for target_price in [50, 90, 120, 250, 500]:
+                expected = fetch_valid_parts(part_type, catalog, target_price)
+                _, prices = index.fetch_parts_in_range(part_type, *get_price_range(target_price))
+                expected_prices = [] if expected is None else sorted(expected['Price'].tolist())
+                self.assertEqual(prices.tolist(), expected_prices)
+
+    def test_nearest_parts(self):
+        """
+        Test that the parts closest in price are found on either side of the target and at the ends of the catalog.
+        """
+        index = CatalogIndex(create_test_catalog())
+        self.assertEqual(index.nearest_parts('GPU', 130, 3)[1].tolist(), [80, 100, 150])
+        self.assertEqual(index.nearest_parts('GPU', 5, 2)[1].tolist(), [40, 60])
+        self.assertEqual(index.nearest_parts('GPU', 5000, 2)[1].tolist(), [400, 600])
+        self.assertEqual(len(index.nearest_parts('GPU', 100, 50)[1]), 9)
+        self.assertEqual(len(index.nearest_parts('Monitor', 100, 5)[1]), 0)
+
+    def test_invalid_input(self):
+        """
+        Test that a ValueError is raised when the index isn't built from a DataFrame.
+        """
+        with self.assertRaises(ValueError):
+            CatalogIndex('not a dataframe')
+
+    def test_generate_build_from_index(self):
+        """
+        Test that a build generated from the index is valid and uses parts from the catalog.
+        """
+        catalog = create_test_catalog()
+        index = CatalogIndex(catalog)
+        build = generate_build_from_excel(build_price=1000, complete_parts_df=catalog, catalog_index=index)
+        self.assertTrue(build.is_valid())
+        self.assertIn(build.gpu, catalog['Name'].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from pc_builder_backend.excel_methods import catalog_loader
+from pc_builder_backend.excel_methods.catalog_loader import load_catalog, get_cache_path, encode_catalog, \
+    decode_catalog, load_compact_catalog, write_catalog, get_catalog_path, find_catalog_file
+from pc_builder_backend.excel_methods.excel_helper_methods import write_excel_data
+
+
+class TestCatalogLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.excel_file = os.path.join(self.temp_dir.name, 'components.xlsx')
+        self.catalog = pd.DataFrame({'Type': ['CPU', 'GPU', 'SSD'],
+                                     'Name': ['Intel i5', 'NVIDIA RTX 4070 – 12GB', 'Samsung 990 Pro'],
+                                     'Price': [200.0, 549.99, 120.5]})
+        self.catalog.to_excel(self.excel_file, index=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_encode_decode_round_trip(self):
+        """
+        Test that a catalog decodes back to the same DataFrame, including non-ASCII names.
+        """
+        result = decode_catalog(encode_catalog(self.catalog))
+        pd.testing.assert_frame_equal(result, self.catalog)
+
+    def test_cache_written_then_used(self):
+        """
+        Test that the first load reads the Excel file and writes the cache, and the next load skips the Excel file.
+        """
+        first = load_catalog(self.excel_file)
+        self.assertTrue(os.path.exists(get_cache_path(self.excel_file)))
+        pd.testing.assert_frame_equal(first, self.catalog)
+
+        with patch.object(catalog_loader, 'read_excel_data') as mock_read_excel_data:
+            second = load_catalog(self.excel_file)
+            mock_read_excel_data.assert_not_called()
+        pd.testing.assert_frame_equal(second, self.catalog)
+
+    def test_load_compact_catalog(self):
+        """
+        Test that the compact catalog loads the same parts from the Excel file and from the cache.
+        """
+        first = load_compact_catalog(self.excel_file)
+        with patch.object(catalog_loader, 'read_excel_data') as mock_read_excel_data:
+            second = load_compact_catalog(self.excel_file)
+            mock_read_excel_data.assert_not_called()
+        self.assertEqual(first.to_lists(), self.catalog.values.tolist())
+        self.assertEqual(second.to_lists(), self.catalog.values.tolist())
+
+    def test_touched_file_uses_cache(self):
+        """
+        Test that a new modified time with the same contents is matched by hash without reading the Excel file.
+        """
+        load_catalog(self.excel_file)
+        stat = os.stat(self.excel_file)
+        os.utime(self.excel_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        with patch.object(catalog_loader, 'read_excel_data') as mock_read_excel_data:
+            load_catalog(self.excel_file)
+            mock_read_excel_data.assert_not_called()
+
+    def test_changed_file_rebuilds_cache(self):
+        """
+        Test that a changed Excel file is read again and replaces the cache.
+        """
+        load_catalog(self.excel_file)
+        updated = self.catalog.assign(Price=[180.0, 499.99, 99.5])
+        updated.to_excel(self.excel_file, index=False)
+        stat = os.stat(self.excel_file)
+        os.utime(self.excel_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        pd.testing.assert_frame_equal(load_catalog(self.excel_file), updated)
+        with patch.object(catalog_loader, 'read_excel_data') as mock_read_excel_data:
+            pd.testing.assert_frame_equal(load_catalog(self.excel_file), updated)
+            mock_read_excel_data.assert_not_called()
+
+    def test_corrupt_cache_ignored(self):
+        """
+        Test that an unreadable cache falls back to the Excel file.
+        """
+        with open(get_cache_path(self.excel_file), 'wb') as cache:
+            cache.write(b'not a cache')
+        pd.testing.assert_frame_equal(load_catalog(self.excel_file), self.catalog)
+
+    def test_write_catalog(self):
+        """
+        Test that the columnar catalog is found in place of the Excel file, and loads without reading an Excel file.
+        """
+        catalog_file = get_catalog_path(self.excel_file)
+        self.assertEqual(catalog_file, os.path.join(self.temp_dir.name, 'components.npz'))
+        self.assertEqual(find_catalog_file(self.excel_file), self.excel_file)
+
+        write_catalog(catalog_file, self.catalog)
+        self.assertEqual(find_catalog_file(self.excel_file), catalog_file)
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ['components.npz', 'components.xlsx'])
+
+        with patch.object(catalog_loader, 'read_excel_data') as mock_read_excel_data:
+            pd.testing.assert_frame_equal(load_catalog(catalog_file), self.catalog)
+            self.assertEqual(load_compact_catalog(catalog_file).to_lists(), self.catalog.values.tolist())
+            mock_read_excel_data.assert_not_called()
+        self.assertFalse(os.path.exists(get_cache_path(self.excel_file)))
+
+    def test_write_catalog_replaces_whole_file(self):
+        """
+        Test that rewriting the catalog swaps in the new file, and a catalog that fails to write leaves the old one.
+        """
+        catalog_file = get_catalog_path(self.excel_file)
+        write_catalog(catalog_file, self.catalog)
+        updated = self.catalog.assign(Price=[180.0, 499.99, 99.5])
+        write_catalog(catalog_file, updated)
+        pd.testing.assert_frame_equal(load_catalog(catalog_file), updated)
+
+        with patch.object(catalog_loader.np, 'savez', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_catalog(catalog_file, self.catalog)
+        pd.testing.assert_frame_equal(load_catalog(catalog_file), updated)
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ['components.npz', 'components.xlsx'])
+
+    def test_invalid_catalog_file(self):
+        """
+        Test that a columnar catalog file that can't be read raises a ValueError.
+        """
+        catalog_file = get_catalog_path(self.excel_file)
+        with open(catalog_file, 'wb') as file:
+            file.write(b'not a catalog')
+        with self.assertRaises(ValueError):
+            load_catalog(catalog_file)
+
+    def test_write_excel_data(self):
+        """
+        Test that the streamed Excel export reads back as the same catalog and replaces the old workbook.
+        """
+        updated = self.catalog.assign(Price=[180.0, 499.99, 99.5])
+        write_excel_data(self.excel_file, updated)
+
+        pd.testing.assert_frame_equal(pd.read_excel(self.excel_file), updated)
+        self.assertEqual(os.listdir(self.temp_dir.name), ['components.xlsx'])
+        with self.assertRaises(FileNotFoundError):
+            write_excel_data(os.path.join(self.temp_dir.name, 'missing', 'components.xlsx'), updated)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+from pc_builder_backend.excel_methods.catalog_snapshot import CatalogStore, CatalogSnapshot
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.catalog_file = os.path.join(self.temp_dir.name, 'components.pkl')
+        self.catalog = create_test_catalog()
+        self.catalog.to_pickle(self.catalog_file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_catalog(self, dataframe: pd.DataFrame) -> None:
+        """
+        Writes a new catalog file with a modified time that is guaranteed to differ from the last one.
+        """
+        mtime_ns = os.stat(self.catalog_file).st_mtime_ns
+        dataframe.to_pickle(self.catalog_file)
+        os.utime(self.catalog_file, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+
+    def test_version_follows_contents(self):
+        """
+        Test that identical catalogs share a version and a changed price gives a new one.
+        """
+        changed = self.catalog.copy()
+        changed.loc[0, 'Price'] += 1
+        self.assertEqual(CatalogSnapshot(self.catalog).version, CatalogSnapshot(self.catalog.copy()).version)
+        self.assertNotEqual(CatalogSnapshot(self.catalog).version, CatalogSnapshot(changed).version)
+
+    def test_reload_swaps_snapshot(self):
+        """
+        Test that a reload swaps in the new catalog while the old snapshot stays usable, and listeners are told.
+        """
+        store = CatalogStore(catalog_file=self.catalog_file, load_catalog=pd.read_pickle)
+        swapped = []
+        store.add_listener(swapped.append)
+        old_snapshot = store.current()
+
+        self.write_catalog(self.catalog.assign(Price=self.catalog['Price'] * 2))
+        self.assertTrue(store.reload())
+
+        new_snapshot = store.current()
+        self.assertIsNot(new_snapshot, old_snapshot)
+        self.assertEqual(swapped, [new_snapshot])
+        self.assertEqual(new_snapshot.index.prices('CPU')[0], 80)
+        # A request holding the old snapshot still generates from the old version
+        build = generate_build_from_excel(build_price=1000, complete_parts_df=old_snapshot.dataframe,
+                                          catalog_index=old_snapshot.index)
+        self.assertEqual(build.catalog_version, old_snapshot.version)
+        self.assertTrue(build.is_valid())
+
+    def test_reload_unchanged_catalog(self):
+        """
+        Test that reloading a catalog with the same contents keeps the current snapshot.
+        """
+        store = CatalogStore(catalog_file=self.catalog_file, load_catalog=pd.read_pickle)
+        old_snapshot = store.current()
+        self.assertFalse(store.reload())
+        self.assertIs(store.current(), old_snapshot)
+
+    def test_watcher_reloads_changed_file(self):
+        """
+        Test that the watcher swaps in a new snapshot after the catalog file changes.
+        """
+        store = CatalogStore(catalog_file=self.catalog_file, load_catalog=pd.read_pickle)
+        old_version = store.current().version
+        store.start_watching(interval=0.01)
+        try:
+            self.write_catalog(self.catalog.iloc[:10])
+            deadline = time.monotonic() + 5
+            while store.current().version == old_version and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(store.current().dataframe), 10)
+        finally:
+            store.stop_watching()
+
+    def test_watcher_moves_to_new_catalog_file(self):
+        """
+        Test that the watcher loads the catalog from the file locate_catalog returns, when it moves to a file written
+        after the store was created.
+        """
+        new_catalog_file = os.path.join(self.temp_dir.name, 'components.new.pkl')
+
+        def locate_catalog():
+            return new_catalog_file if os.path.exists(new_catalog_file) else self.catalog_file
+
+        store = CatalogStore(catalog_file=self.catalog_file, load_catalog=pd.read_pickle,
+                             locate_catalog=locate_catalog)
+        self.assertEqual(store.catalog_file, self.catalog_file)
+        old_version = store.current().version
+        store.start_watching(interval=0.01)
+        try:
+            self.catalog.iloc[:5].to_pickle(new_catalog_file)
+            deadline = time.monotonic() + 5
+            while store.current().version == old_version and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(store.current().dataframe), 5)
+            self.assertEqual(store.catalog_file, new_catalog_file)
+        finally:
+            store.stop_watching()
+
+    def test_failed_reload_keeps_snapshot(self):
+        """
+        Test that a catalog file that can't be loaded leaves the current snapshot in place.
+        """
+        store = CatalogStore(catalog_file=self.catalog_file, load_catalog=pd.read_pickle)
+        old_snapshot = store.current()
+        with open(self.catalog_file, 'wb') as file:
+            file.write(b'half written')
+        with self.assertRaises(Exception):
+            store.reload()
+        self.assertIs(store.current(), old_snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+class TestCompactCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.dataframe = pd.DataFrame({'Type': ['CPU', 'GPU', 'CPU'],
+                                       'Name': ['Intel i7', 'Radeon™ RX 7800 – 16GB', ''],
+                                       'Price': [299.99, 449.5, 0.01]})
+        self.catalog = CompactCatalog.from_dataframe(self.dataframe)
+
+    def test_row_access(self):
+        """
+        Test that each row decodes to the type, name and price it was built from, including non-ASCII and empty names.
+        """
+        self.assertEqual(len(self.catalog), 3)
+        self.assertEqual(self.catalog[1].to_list(), ['GPU', 'Radeon™ RX 7800 – 16GB', 449.5])
+        self.assertEqual(self.catalog.name(2), '')
+        self.assertEqual(self.catalog.part_type(2), 'CPU')
+        self.assertEqual(self.catalog.price(0), 299.99)
+        self.assertEqual(self.catalog.names([2, 0]), ['', 'Intel i7'])
+
+    def test_to_lists_matches_dataframe(self):
+        """
+        Test that the catalog lists its parts in the same form as the DataFrame it was built from.
+        """
+        self.assertEqual(self.catalog.to_lists(), self.dataframe.values.tolist())
+        pd.testing.assert_frame_equal(self.catalog.to_dataframe(), self.dataframe)
+
+    def test_iter_lists_matches_to_lists(self):
+        """
+        Test that listing the parts a chunk at a time gives the same parts as listing them all at once.
+        """
+        for chunk_size in (1, 2, 3, 10):
+            self.assertEqual(list(self.catalog.iter_lists(chunk_size=chunk_size)), self.catalog.to_lists())
+        self.assertEqual(list(CompactCatalog.from_columns([], [], []).iter_lists()), [])
+
+    def test_compact_types(self):
+        """
+        Test that the catalog is held in small fixed width arrays that can't be modified.
+        """
+        self.assertEqual(self.catalog.type_codes.dtype, np.int8)
+        self.assertEqual(self.catalog.prices_pence.dtype, np.int32)
+        self.assertEqual(self.catalog.prices_pence.tolist(), [29999, 44950, 1])
+        with self.assertRaises(ValueError):
+            self.catalog.prices_pence[0] = 1
+        with self.assertRaises(AttributeError):
+            self.catalog.extra = 1
+
+    def test_empty_catalog(self):
+        """
+        Test that a catalog with no parts can be built and listed.
+        """
+        catalog = CompactCatalog.from_columns([], [], [])
+        self.assertEqual(len(catalog), 0)
+        self.assertEqual(catalog.to_lists(), [])
+        self.assertEqual(len(CatalogIndex(catalog)), 0)
+
+    def test_mismatched_arrays(self):
+        """
+        Test that a ValueError is raised when the arrays describe different numbers of parts.
+        """
+        with self.assertRaises(ValueError):
+            CompactCatalog(type_labels=['CPU'], type_codes=np.zeros(2, dtype=np.int8),
+                           name_buffer=np.zeros(0, dtype=np.uint8), name_offsets=np.zeros(2, dtype=np.int64),
+                           prices_pence=np.zeros(2, dtype=np.int32))
+
+    def test_index_resolves_rows(self):
+        """
+        Test that the rows handed out by the index point at the matching parts of the catalog.
+        """
+        catalog = CompactCatalog.from_dataframe(create_test_catalog())
+        index = CatalogIndex(catalog)
+        rows, prices = index.fetch_rows_in_range('SSD', 80, 150)
+        self.assertEqual([catalog.name(row) for row in rows], ['SSD 80', 'SSD 100', 'SSD 150'])
+        self.assertEqual(prices.tolist(), [catalog.price(row) for row in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 import unittest
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 from pc_builder_backend.excel_methods.excel_helper_methods import allocate_budget, fetch_valid_parts, read_excel_data, \
-    get_component_info
+    get_component_info, allocate_budgets, generate_builds_batch, fetch_slot_candidates_with_fallback, \
+    fetch_alternative_parts, get_stored_slot_name, fetch_parts_page, create_catalog_data_frame
+from pc_builder_backend.excel_methods.catalog_index import CatalogIndex
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
 
 
 class TestExcelHelperMethods(unittest.TestCase):
@@ -23,6 +27,20 @@ class TestExcelHelperMethods(unittest.TestCase):
             # Assert that the result is equal to the expected test data
             self.assertTrue(result.equals(test_data))
 
+    def test_create_catalog_data_frame(self):
+        """
+        Test that streamed part rows build one DataFrame, with a part listed twice keeping its first position and last
+        price.
+        """
+        part_rows = iter([('CPU', 'Ryzen 5', 179.0), ('CPU', 'Core i5', 199.0), ('GPU', 'RX 7600', 249.99),
+                          ('CPU', 'Ryzen 5', 169.0)])
+        result = create_catalog_data_frame(part_rows)
+
+        self.assertEqual(list(result.columns), ['Type', 'Name', 'Price'])
+        self.assertEqual(result.values.tolist(), [['CPU', 'Ryzen 5', 169.0], ['CPU', 'Core i5', 199.0],
+                                                  ['GPU', 'RX 7600', 249.99]])
+        self.assertEqual(list(create_catalog_data_frame(iter([])).columns), ['Type', 'Name', 'Price'])
+
     def test_fetch_valid_parts_valid_input(self):
         """
         Test the fetch_valid_parts function with valid input parameters.
@@ -79,6 +97,183 @@ class TestExcelHelperMethods(unittest.TestCase):
             self.assertEqual(name, 'Intel i5')
             self.assertEqual(price, 200)
 
+    def test_allocate_budgets_matches_allocate_budget(self):
+        """
+        Test that the vectorised allocate_budgets gives the same target prices as allocate_budget for every tier.
+        """
+        budgets = [100, 500, 501, 750, 1000, 1200, 1500, 1999, 2000]
+        result = allocate_budgets(np.array(budgets))
+        for position, budget in enumerate(budgets):
+            for component, ratio in allocate_budget(budget).items():
+                self.assertAlmostEqual(result[component][position], budget * ratio)
+
+    def test_allocate_budgets_invalid_input(self):
+        """
+        Test that a ValueError is raised when any budget of a batch is out of range.
+        """
+        with self.assertRaises(ValueError):
+            allocate_budgets(np.array([750, 2500]))
+
+    def test_generate_builds_batch(self):
+        """
+        Test that a batch gives one valid build per budget, with parts priced within range of their target.
+        """
+        catalog = create_test_catalog()
+        builds = generate_builds_batch([400, 1000, 1000, 1800], catalog, seed=1)
+        self.assertEqual(len(builds), 4)
+        for build in builds:
+            self.assertTrue(build.is_valid())
+        # GPU target of a 1000 budget is 300, so the GPU must be between 225 and 375
+        self.assertEqual(builds[1].gpu_price, 300)
+
+    def test_generate_builds_batch_seeded(self):
+        """
+        Test that the same seed reproduces the same batch of builds.
+        """
+        catalog = create_test_catalog()
+        first = generate_builds_batch([1000] * 10, catalog, seed=7)
+        second = generate_builds_batch([1000] * 10, catalog, seed=7)
+        self.assertEqual([build.storage for build in first], [build.storage for build in second])
+
+    def test_generate_builds_batch_fallback(self):
+        """
+        Test that a slot with no parts in range falls back to a wider search and is reported for that build only.
+        """
+        catalog = create_test_catalog()
+        catalog = catalog[~((catalog['Type'] == 'GPU') & (catalog['Price'] < 100))]
+        builds = generate_builds_batch([200, 1000], catalog, seed=3)
+        # GPU target of a 200 budget is 50, nothing is within 50% so the closest is within 100%
+        self.assertEqual(builds[0].gpu_price, 100)
+        self.assertIn('GPU', builds[0].fallback_slots)
+        self.assertTrue(builds[0].is_valid())
+        self.assertEqual(builds[1].fallback_slots, [])
+
+    def test_generate_builds_batch_missing_type(self):
+        """
+        Test that a slot whose part type isn't in the catalog at all is left empty, making the build invalid.
+        """
+        catalog = create_test_catalog()
+        catalog = catalog[catalog['Type'] != 'Case']
+        builds = generate_builds_batch([1000], catalog, seed=3)
+        self.assertIsNone(builds[0].case)
+        self.assertFalse(builds[0].is_valid())
+
+    def test_fetch_slot_candidates_with_fallback(self):
+        """
+        Test that the price range is widened in steps before falling back to the closest priced parts.
+        """
+        catalog = pd.DataFrame({'Type': ['GPU'] * 6, 'Name': [f"GPU {price}" for price in [10, 20, 30, 40, 50, 1000]],
+                                'Price': [10.0, 20.0, 30.0, 40.0, 50.0, 1000.0]})
+        index = CatalogIndex(catalog)
+        _, prices, fallback = fetch_slot_candidates_with_fallback(index, ('GPU',), 40)
+        self.assertEqual((prices.tolist(), fallback), ([30, 40, 50], False))
+        _, prices, fallback = fetch_slot_candidates_with_fallback(index, ('GPU',), 100)
+        self.assertEqual((prices.tolist(), fallback), ([50], True))
+        _, prices, fallback = fetch_slot_candidates_with_fallback(index, ('GPU',), 400)
+        self.assertEqual((sorted(prices.tolist()), fallback), ([10, 20, 30, 40, 50], True))
+
+    def test_generate_builds_batch_invalid_input(self):
+        """
+        Test that a ValueError is raised for non-numeric budgets.
+        """
+        with self.assertRaises(ValueError):
+            generate_builds_batch(['cheap'], create_test_catalog())
+
+    def test_fetch_alternative_parts(self):
+        """
+        Test that the closest priced parts of the slot's type are returned, leaving out the current part.
+        """
+        index = CatalogIndex(create_test_catalog())
+        alternatives = fetch_alternative_parts(index, 'GPU', 150, k=3, exclude_name='GPU 150')
+        self.assertEqual([price for _, _, price in alternatives], [100, 200, 80])
+
+    def test_fetch_alternative_parts_max_price(self):
+        """
+        Test that no alternative costs more than the max price, and storage alternatives include both drive types.
+        """
+        index = CatalogIndex(create_test_catalog())
+        alternatives = fetch_alternative_parts(index, 'Storage', 150, k=4, max_price=120)
+        self.assertTrue(all(price <= 120 for _, _, price in alternatives))
+        self.assertEqual({part_type for part_type, _, _ in alternatives}, {'HDD', 'SSD'})
+        self.assertEqual(len(alternatives), 4)
+
+    def test_fetch_alternative_parts_invalid_input(self):
+        """
+        Test that a ValueError is raised for an unknown slot or a k that isn't positive.
+        """
+        index = CatalogIndex(create_test_catalog())
+        with self.assertRaises(ValueError):
+            fetch_alternative_parts(index, 'Monitor', 150, k=3)
+        with self.assertRaises(ValueError):
+            fetch_alternative_parts(index, 'GPU', 150, k=0)
+
+    def test_stored_slot_names(self):
+        """
+        Test that slots are translated to the keys they're stored under, and stored keys are accepted as slots.
+        """
+        self.assertEqual(get_stored_slot_name('Power Supply'), 'PowerSupply')
+        self.assertEqual(get_stored_slot_name('GPU'), 'GPU')
+        index = CatalogIndex(create_test_catalog())
+        self.assertEqual(len(fetch_alternative_parts(index, 'PowerSupply', 60, k=2)), 2)
+
+    def fetch_all_pages(self, index, **query) -> list:
+        """
+        Follows the cursors of a parts query to the last page, collecting every part.
+        """
+        parts, cursor = fetch_parts_page(index, **query)
+        while cursor is not None:
+            page, cursor = fetch_parts_page(index, cursor=cursor, **query)
+            self.assertTrue(len(page) > 0)
+            parts.extend(page)
+        return parts
+
+    def test_fetch_parts_page(self):
+        """
+        Test that following the cursors lists every part in range exactly once, ordered by price then name.
+        """
+        catalog = pd.DataFrame({'Type': ['GPU'] * 7 + ['CPU'],
+                                'Name': ['G', 'C', 'A', 'F', 'B', 'E', 'D', 'X'],
+                                'Price': [100, 200, 200, 300, 200, 50, 200, 200]})
+        index = CatalogIndex(catalog)
+        gpus = sorted((price, name) for part_type, name, price in catalog.values.tolist() if part_type == 'GPU')
+        for limit in [1, 2, 3, 10]:
+            parts = self.fetch_all_pages(index, part_type='GPU', limit=limit)
+            self.assertEqual([(price, name) for _, name, price in parts], gpus)
+            parts = self.fetch_all_pages(index, part_type='GPU', limit=limit, sort='desc')
+            self.assertEqual([(price, name) for _, name, price in parts], gpus[::-1])
+
+        parts, cursor = fetch_parts_page(index, part_type='GPU', min_price=100, max_price=200, limit=10)
+        self.assertEqual([name for _, name, _ in parts], ['G', 'A', 'B', 'C', 'D'])
+        self.assertIsNone(cursor)
+        self.assertEqual(fetch_parts_page(index, part_type='Monitor'), ([], None))
+
+    def test_fetch_parts_page_cursor_survives_reload(self):
+        """
+        Test that a cursor continues after the same part when parts are added before it in a new catalog version.
+        """
+        catalog = create_test_catalog()
+        first_page, cursor = fetch_parts_page(CatalogIndex(catalog), part_type='RAM', limit=3)
+        reloaded = pd.concat([catalog, pd.DataFrame({'Type': ['RAM'], 'Name': ['RAM cheap'], 'Price': [10.0]})])
+        second_page, _ = fetch_parts_page(CatalogIndex(reloaded), part_type='RAM', limit=3, cursor=cursor)
+        self.assertEqual([price for _, _, price in first_page + second_page], [40, 60, 80, 100, 150, 200])
+
+    def test_fetch_parts_page_invalid_input(self):
+        """
+        Test that a ValueError is raised for a bad limit, sort or cursor.
+        """
+        index = CatalogIndex(create_test_catalog())
+        _, cursor = fetch_parts_page(index, part_type='CPU', limit=1)
+        with self.assertRaises(ValueError):
+            fetch_parts_page(index, part_type='CPU', limit=0)
+        with self.assertRaises(ValueError):
+            fetch_parts_page(index, part_type='CPU', sort='name')
+        with self.assertRaises(ValueError):
+            fetch_parts_page(index, part_type='CPU', cursor='not a cursor')
+        with self.assertRaises(ValueError):
+            fetch_parts_page(index, part_type='GPU', cursor=cursor)
+        with self.assertRaises(ValueError):
+            fetch_parts_page(index, part_type='CPU', cursor=cursor, sort='desc')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import pandas as pd
+from pc_builder_backend.excel_methods.catalog_snapshot import CatalogSnapshot
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+from pc_builder_backend.excel_methods.name_search import NameSearchIndex, tokenize
+
+
+class TestNameSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = CompactCatalog.from_dataframe(pd.DataFrame({
+            'Type': ['GPU', 'GPU', 'GPU', 'GPU', 'CPU', 'Case'],
+            'Name': ['NVIDIA GeForce RTX 4070 Ti', 'ASUS Dual RTX4060', 'NVIDIA GeForce RTX 3080',
+                     'AMD Radeon RX 7800 XT', 'AMD Ryzen 7 7800X3D', 'NZXT H5 Flow RTX Edition'],
+            'Price': [749.99, 299.0, 499.0, 479.0, 339.0, 95.0]}))
+        self.index = NameSearchIndex(self.catalog)
+
+    def search_names(self, query: str, **kwargs) -> list:
+        return self.catalog.names(self.index.search(query, **kwargs))
+
+    def test_tokenize(self):
+        """
+        Test that names are split into lowercase runs of letters and digits.
+        """
+        self.assertEqual(tokenize("ASUS Dual RTX4060-8GB"), ['asus', 'dual', 'rtx', '4060', '8', 'gb'])
+        self.assertEqual(tokenize("  --  "), [])
+
+    def test_every_word_matches_a_prefix(self):
+        """
+        Test that each word of the query has to start a word in the name, in any order.
+        """
+        self.assertCountEqual(self.search_names("rtx 40"), ['NVIDIA GeForce RTX 4070 Ti', 'ASUS Dual RTX4060'])
+        self.assertEqual(self.search_names("40 RTX geforce"), ['NVIDIA GeForce RTX 4070 Ti'])
+        self.assertCountEqual(self.search_names("7800"), ['AMD Radeon RX 7800 XT', 'AMD Ryzen 7 7800X3D'])
+        self.assertEqual(self.search_names("rtx 50"), [])
+        self.assertEqual(self.search_names("vidia"), [])
+
+    def test_names_starting_with_query_first(self):
+        """
+        Test that names starting with the query are ranked before other matches, then matches are alphabetical.
+        """
+        self.assertEqual(self.search_names("nv"), ['NVIDIA GeForce RTX 3080', 'NVIDIA GeForce RTX 4070 Ti'])
+        self.assertEqual(self.search_names("n"), ['NVIDIA GeForce RTX 3080', 'NVIDIA GeForce RTX 4070 Ti',
+                                                  'NZXT H5 Flow RTX Edition'])
+        self.assertEqual(self.search_names("rtx"), ['ASUS Dual RTX4060', 'NVIDIA GeForce RTX 3080',
+                                                    'NVIDIA GeForce RTX 4070 Ti', 'NZXT H5 Flow RTX Edition'])
+        self.assertEqual(self.search_names("rtx", limit=2), ['ASUS Dual RTX4060', 'NVIDIA GeForce RTX 3080'])
+
+        catalog = CompactCatalog.from_columns(['Case', 'Case'], ['Apex Zeta', 'Zeta Mesh'], [50, 60])
+        self.assertEqual(catalog.names(NameSearchIndex(catalog).search("zeta")), ['Zeta Mesh', 'Apex Zeta'])
+
+    def test_type_filter(self):
+        """
+        Test that only parts of the given type are returned.
+        """
+        self.assertEqual(self.search_names("amd", part_type='CPU'), ['AMD Ryzen 7 7800X3D'])
+        self.assertEqual(self.search_names("rtx", part_type='Case'), ['NZXT H5 Flow RTX Edition'])
+        self.assertEqual(self.search_names("rtx", part_type='Monitor'), [])
+
+    def test_empty_query(self):
+        """
+        Test that a query with no words finds nothing.
+        """
+        self.assertEqual(self.search_names(" - "), [])
+        self.assertEqual(self.search_names("rtx", limit=0), [])
+
+    def test_built_once_per_snapshot(self):
+        """
+        Test that a snapshot builds its search index on first use and keeps it.
+        """
+        snapshot = CatalogSnapshot(self.catalog)
+        self.assertIs(snapshot.search_index, snapshot.search_index)
+        self.assertIs(snapshot.build_search_index(), snapshot.search_index)
+        self.assertEqual(len(snapshot.search_index.search("geforce")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
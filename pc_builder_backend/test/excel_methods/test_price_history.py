@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from pc_builder_backend.excel_methods.catalog_diff import diff_catalogs
+from pc_builder_backend.excel_methods.price_history import PriceHistoryStore, get_history_dir, PART_KEYS_FILE
+
+
+def create_catalog(prices: dict) -> pd.DataFrame:
+    return pd.DataFrame([(part_type, name, price) for (part_type, name), price in prices.items()],
+                        columns=['Type', 'Name', 'Price'])
+
+
+class TestPriceHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.history_dir = get_history_dir(os.path.join(self.temp_dir.name, 'components.xlsx'))
+        self.store = PriceHistoryStore(self.history_dir)
+
+        # Three scraper runs, the Ryzen is repriced twice, the RTX removed and the SSD added
+        self.runs = [
+            {('CPU', 'AMD Ryzen 5'): 179.99, ('GPU', 'NVIDIA RTX 4070'): 549.99, ('CPU', 'Intel i5'): 200.0},
+            {('CPU', 'AMD Ryzen 5'): 169.0, ('CPU', 'Intel i5'): 200.0, ('SSD', 'Samsung 990 Pro / 2TB'): 120.5},
+            {('CPU', 'AMD Ryzen 5'): 174.5, ('CPU', 'Intel i5'): 200.0, ('SSD', 'Samsung 990 Pro / 2TB'): 120.5},
+        ]
+
+    def record_runs(self, store: PriceHistoryStore) -> None:
+        previous = create_catalog({})
+        for recorded_at, prices in enumerate(self.runs, start=1):
+            current = create_catalog(prices)
+            store.append(diff_catalogs(previous, current), recorded_at=recorded_at * 1000)
+            previous = current
+
+    def test_history_of_each_part(self):
+        """
+        Test that each part's history has a change for each run its price changed in, with None once it was removed.
+        """
+        self.record_runs(self.store)
+
+        self.assertEqual(get_history_dir('/parts/components.xlsx'), '/parts/.components.history')
+        self.assertEqual(len(self.store.segment_files()), 3)
+        self.assertEqual(self.store.history('CPU', 'AMD Ryzen 5'), [(1000, 179.99), (2000, 169.0), (3000, 174.5)])
+        self.assertEqual(self.store.history('GPU', 'NVIDIA RTX 4070'), [(1000, 549.99), (2000, None)])
+        self.assertEqual(self.store.history('CPU', 'Intel i5'), [(1000, 200.0)])
+        self.assertEqual(self.store.history('SSD', 'Samsung 990 Pro / 2TB'), [(2000, 120.5)])
+        self.assertEqual(self.store.history('GPU', 'AMD Ryzen 5'), [])
+        self.assertEqual(self.store.find_types('AMD Ryzen 5'), ['CPU'])
+        self.assertEqual(self.store.stats(), {"parts": 4, "segments": 3, "records": 7})
+
+    def test_only_changes_appended(self):
+        """
+        Test that a run without changes writes no segment, and each segment only holds the parts that changed.
+        """
+        self.record_runs(self.store)
+        unchanged = create_catalog(self.runs[-1])
+        self.assertEqual(self.store.append(diff_catalogs(unchanged, unchanged)), 0)
+
+        segment_sizes = [len(np.load(segment_file)) for segment_file in self.store.segment_files()]
+        self.assertEqual(segment_sizes, [3, 3, 1])
+
+    def test_read_by_another_store(self):
+        """
+        Test that a store reading the history, as the app does, sees the runs appended by the scraper's store.
+        """
+        reader = PriceHistoryStore(self.history_dir)
+        self.assertEqual(reader.history('CPU', 'AMD Ryzen 5'), [])
+
+        self.record_runs(self.store)
+        self.assertEqual(reader.history('CPU', 'AMD Ryzen 5'), [(1000, 179.99), (2000, 169.0), (3000, 174.5)])
+
+    def test_compact(self):
+        """
+        Test that compacting merges the segments into one without changing any part's history.
+        """
+        self.record_runs(self.store)
+        reader = PriceHistoryStore(self.history_dir)
+        before = reader.history('CPU', 'AMD Ryzen 5')
+
+        self.assertEqual(self.store.compact(), 3)
+        self.assertEqual(len(self.store.segment_files()), 1)
+        self.assertEqual(reader.history('CPU', 'AMD Ryzen 5'), before)
+        self.assertEqual(self.store.compact(), 0)
+
+        # Runs after compacting are appended after the merged segment
+        self.store.append(diff_catalogs(create_catalog(self.runs[-1]), create_catalog({})), recorded_at=4000)
+        self.assertEqual(reader.history('CPU', 'Intel i5'), [(1000, 200.0), (4000, None)])
+
+    def test_partly_written_part_keys(self):
+        """
+        Test that a part key left partly written by a failed run is ignored and overwritten by the next run.
+        """
+        self.record_runs(self.store)
+        with open(os.path.join(self.history_dir, PART_KEYS_FILE), 'ab') as file:
+            file.write(b'["CPU", "Intel i')
+
+        store = PriceHistoryStore(self.history_dir)
+        self.assertEqual(store.stats()['parts'], 4)
+        store.append(diff_catalogs(create_catalog({}), create_catalog({('CPU', 'Intel i9'): 499.0})), recorded_at=4000)
+
+        self.assertEqual(PriceHistoryStore(self.history_dir).history('CPU', 'Intel i9'), [(4000, 499.0)])
+        self.assertEqual(PriceHistoryStore(self.history_dir).history('CPU', 'AMD Ryzen 5')[0], (1000, 179.99))
+
+
+if __name__ == '__main__':
+    unittest.main()
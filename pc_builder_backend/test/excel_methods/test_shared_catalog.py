@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from pc_builder_backend.excel_methods import catalog_snapshot, shared_catalog
+from pc_builder_backend.excel_methods.catalog_snapshot import CatalogSnapshot
+from pc_builder_backend.excel_methods.compact_catalog import CompactCatalog
+from pc_builder_backend.excel_methods.excel_helper_methods import generate_build_from_excel
+from pc_builder_backend.excel_methods.shared_catalog import load_shared_catalog, publish_catalog, attach_catalog, \
+    get_current_segment, get_segment_dir
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+def attach_in_worker(segment_file: str) -> list:
+    """
+    Attaches to a segment from another process and lists the catalog it holds.
+    """
+    return attach_catalog(segment_file).to_lists()
+
+
+class TestSharedCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.segment_dir = os.path.join(self.temp_dir.name, 'segments')
+        # Shuffled so publishing has to put the parts in index order
+        self.dataframe = create_test_catalog().sample(frac=1, random_state=0).reset_index(drop=True)
+        self.catalog = CompactCatalog.from_dataframe(self.dataframe)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def sorted_parts(self) -> list:
+        return self.dataframe.sort_values(['Type', 'Price'], kind='stable').values.tolist()
+
+    def test_publish_and_attach(self):
+        """
+        Test that an attached catalog holds the published parts, sorted by type and price, as read-only views.
+        """
+        segment_file = publish_catalog(self.catalog, self.segment_dir, source={})
+        self.assertEqual(get_current_segment(self.segment_dir), segment_file)
+
+        attached = attach_catalog(segment_file)
+        self.assertEqual(attached.to_lists(), self.sorted_parts())
+        self.assertFalse(attached.prices_pence.flags.owndata)
+        with self.assertRaises(ValueError):
+            attached.prices_pence[0] = 1
+
+    def test_snapshot_of_attached_catalog(self):
+        """
+        Test that builds are generated from an attached catalog without the index sorting a private copy.
+        """
+        snapshot = CatalogSnapshot(attach_catalog(publish_catalog(self.catalog, self.segment_dir, source={})))
+        self.assertIsNone(snapshot.index._sorted_rows)
+        build = generate_build_from_excel(build_price=1000, complete_parts_df=None, catalog_index=snapshot.index)
+        self.assertTrue(build.is_valid())
+        self.assertIn(build.gpu, self.dataframe['Name'].tolist())
+
+    def test_attached_catalog_keeps_published_version(self):
+        """
+        Test that an attached catalog carries the version published with it, matching the version of its arrays,
+        so snapshots don't hash the segment again.
+        """
+        attached = attach_catalog(publish_catalog(self.catalog, self.segment_dir, source={}))
+        self.assertIsNotNone(attached.version)
+        with patch.object(catalog_snapshot, 'get_catalog_version') as get_catalog_version:
+            self.assertEqual(CatalogSnapshot(attached).version, attached.version)
+        get_catalog_version.assert_not_called()
+        self.assertEqual(attached.version, catalog_snapshot.get_catalog_version(attached))
+        self.assertEqual(attached.version, CatalogSnapshot(self.dataframe.sort_values(
+            ['Type', 'Price'], kind='stable').reset_index(drop=True)).version)
+
+    def test_attach_from_other_process(self):
+        """
+        Test that a separate process attaches to a published segment and reads the same catalog.
+        """
+        segment_file = publish_catalog(self.catalog, self.segment_dir, source={})
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            self.assertEqual(pool.apply(attach_in_worker, (segment_file,)), self.sorted_parts())
+
+    def test_load_reuses_published_segment(self):
+        """
+        Test that loading an unchanged Excel file attaches to the current segment instead of reading the catalog.
+        """
+        excel_file = os.path.join(self.temp_dir.name, 'components.xlsx')
+        self.dataframe.to_excel(excel_file, index=False)
+        first = load_shared_catalog(excel_file)
+        self.assertTrue(os.path.isdir(get_segment_dir(excel_file)))
+
+        with patch.object(shared_catalog, 'load_compact_catalog') as mock_load_compact_catalog:
+            second = load_shared_catalog(excel_file)
+            mock_load_compact_catalog.assert_not_called()
+        self.assertEqual(second.to_lists(), first.to_lists())
+
+    def test_new_version_published_to_new_segment(self):
+        """
+        Test that a changed catalog is published to a new segment, and a catalog attached to the old one stays usable.
+        """
+        old_segment = publish_catalog(self.catalog, self.segment_dir, source={})
+        old_catalog = attach_catalog(old_segment)
+
+        changed = CompactCatalog.from_dataframe(self.dataframe.assign(Price=self.dataframe['Price'] * 2))
+        new_segment = publish_catalog(changed, self.segment_dir, source={})
+        self.assertNotEqual(new_segment, old_segment)
+        self.assertEqual(get_current_segment(self.segment_dir), new_segment)
+        self.assertEqual(old_catalog.to_lists(), self.sorted_parts())
+
+        # Only the new and previous segments are kept
+        publish_catalog(CompactCatalog.from_dataframe(self.dataframe.iloc[:5]), self.segment_dir, source={})
+        self.assertFalse(os.path.exists(old_segment))
+        self.assertTrue(os.path.exists(new_segment))
+        self.assertEqual(old_catalog.name(0), self.sorted_parts()[0][1])
+
+    def test_unpublishable_catalog_kept_private(self):
+        """
+        Test that a catalog that can't be published is still loaded.
+        """
+        excel_file = os.path.join(self.temp_dir.name, 'components.xlsx')
+        self.dataframe.to_excel(excel_file, index=False)
+        with patch.object(shared_catalog, 'publish_catalog', side_effect=OSError("read-only file system")):
+            catalog = load_shared_catalog(excel_file)
+        self.assertEqual(catalog.to_lists(), pd.read_excel(excel_file).values.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
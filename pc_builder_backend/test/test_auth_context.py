@@ -0,0 +1,184 @@
+import time
+import unittest
+
+import jwt
+from flask import Flask, jsonify
+
+from pc_builder_backend.auth_context import TokenAuthenticator, TokenClaimsCache, TokenError, get_request_claims, \
+    hash_token
+from pc_builder_backend.test.test_token_blacklist import FakeCollection
+from pc_builder_backend.token_blacklist import TokenBlacklist
+
+SECRET_KEY = "test-secret"
+
+
+def make_token(user="alice", admin=False, expires_in=1800):
+    return jwt.encode({'user': user, 'admin': admin, 'exp': int(time.time()) + expires_in}, SECRET_KEY,
+                      algorithm='HS256')
+
+
+class TestTokenClaimsCache(unittest.TestCase):
+
+    def test_put_and_get(self):
+        cache = TokenClaimsCache(max_entries=10, max_ttl=60)
+        token = make_token()
+        self.assertIsNone(cache.get(token))
+        cache.put(token, {'user': 'alice'})
+        self.assertEqual(cache.get(token), {'user': 'alice'})
+        self.assertEqual(cache.stats(), {"entries": 1, "hits": 1, "misses": 1})
+
+    def test_keyed_by_hash(self):
+        cache = TokenClaimsCache(max_entries=10, max_ttl=60)
+        token = make_token()
+        cache.put(token, {'user': 'alice'})
+        self.assertIn(hash_token(token), cache._entries)
+        self.assertNotIn(token, cache._entries)
+
+    def test_expires_at_token_exp(self):
+        cache = TokenClaimsCache(max_entries=10, max_ttl=60)
+        cache.put("token", {'user': 'alice', 'exp': time.time() - 1})
+        self.assertIsNone(cache.get("token"))
+        self.assertEqual(len(cache), 0)
+
+    def test_expires_after_max_ttl(self):
+        cache = TokenClaimsCache(max_entries=10, max_ttl=0.05)
+        cache.put("token", {'user': 'alice', 'exp': time.time() + 1800})
+        self.assertIsNotNone(cache.get("token"))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("token"))
+
+    def test_evicts_least_recently_used(self):
+        cache = TokenClaimsCache(max_entries=2, max_ttl=60)
+        cache.put("first", {'user': 'first'})
+        cache.put("second", {'user': 'second'})
+        cache.get("first")
+        cache.put("third", {'user': 'third'})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNotNone(cache.get("first"))
+
+    def test_invalidate(self):
+        cache = TokenClaimsCache(max_entries=10, max_ttl=60)
+        cache.put("token", {'user': 'alice'})
+        cache.invalidate("token")
+        cache.invalidate("missing")
+        self.assertIsNone(cache.get("token"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenClaimsCache(max_entries=0, max_ttl=60)
+        with self.assertRaises(ValueError):
+            TokenClaimsCache(max_entries=10, max_ttl=0)
+
+
+class TestTokenAuthenticator(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = FakeCollection()
+        self.blacklist = TokenBlacklist(self.collection, capacity=100, error_rate=0.01)
+        self.blacklist.sync()
+        self.authenticator = TokenAuthenticator(SECRET_KEY, self.blacklist,
+                                                cache=TokenClaimsCache(max_entries=10, max_ttl=60))
+
+    def test_repeat_tokens_skip_decoding(self):
+        token = make_token()
+        self.assertEqual(self.authenticator.authenticate(token)['user'], 'alice')
+        self.assertEqual(self.authenticator.authenticate(token)['user'], 'alice')
+        self.assertEqual(self.authenticator.cache.stats()["hits"], 1)
+        self.assertEqual(self.collection.lookups, 0)
+
+    def test_missing_token(self):
+        with self.assertRaisesRegex(TokenError, "missing"):
+            self.authenticator.authenticate(None)
+
+    def test_invalid_tokens_are_not_cached(self):
+        token = jwt.encode({'user': 'alice'}, "other-secret", algorithm='HS256')
+        for _ in range(2):
+            with self.assertRaisesRegex(TokenError, "Error decoding token"):
+                self.authenticator.authenticate(token)
+        self.assertEqual(len(self.authenticator.cache), 0)
+
+    def test_expired_token(self):
+        with self.assertRaisesRegex(TokenError, "Error decoding token"):
+            self.authenticator.authenticate(make_token(expires_in=-10))
+
+    def test_revoke(self):
+        token = make_token()
+        self.authenticator.authenticate(token)
+        self.assertTrue(self.authenticator.revoke(token))
+        with self.assertRaisesRegex(TokenError, "blacklisted"):
+            self.authenticator.authenticate(token)
+        self.assertEqual(self.collection.documents[0]["expires_at"].timestamp(), jwt.decode(
+            token, SECRET_KEY, algorithms=['HS256'])['exp'])
+
+    def test_revoke_unusable_tokens(self):
+        token = make_token()
+        self.authenticator.revoke(token)
+        self.assertFalse(self.authenticator.revoke(token))
+        self.assertFalse(self.authenticator.revoke(make_token(expires_in=-10)))
+        self.assertFalse(self.authenticator.revoke(None))
+        self.assertEqual(len(self.collection.documents), 1)
+
+    def test_revoked_by_another_worker(self):
+        token = make_token()
+        self.authenticator.authenticate(token)
+        TokenBlacklist(self.collection, capacity=100, error_rate=0.01).revoke(token, expires_at=None)
+        # Accepted until this worker's filter is synced
+        self.authenticator.authenticate(token)
+        self.blacklist.sync()
+        with self.assertRaisesRegex(TokenError, "blacklisted"):
+            self.authenticator.authenticate(token)
+
+
+class TestRequestClaims(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = FakeCollection()
+        blacklist = TokenBlacklist(self.collection, capacity=100, error_rate=0.01)
+        blacklist.sync()
+        authenticator = TokenAuthenticator(SECRET_KEY, blacklist,
+                                           cache=TokenClaimsCache(max_entries=10, max_ttl=60))
+        self.decodes = 0
+        original_authenticate = authenticator.authenticate
+
+        def counted_authenticate(token):
+            self.decodes += 1
+            return original_authenticate(token)
+
+        authenticator.authenticate = counted_authenticate
+
+        app = Flask(__name__)
+
+        @app.route('/whoami')
+        def whoami():
+            try:
+                get_request_claims(authenticator)
+                claims = get_request_claims(authenticator)
+            except TokenError as e:
+                try:
+                    get_request_claims(authenticator)
+                except TokenError:
+                    pass
+                return jsonify({'message': str(e)}), 401
+            return jsonify({'user': claims['user']})
+
+        self.client = app.test_client()
+
+    def test_checked_once_per_request(self):
+        token = make_token()
+        for _ in range(3):
+            response = self.client.get('/whoami', headers={'x-access-token': token})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json(), {'user': 'alice'})
+        self.assertEqual(self.decodes, 3)
+        self.assertEqual(self.collection.lookups, 0)
+
+    def test_failure_is_kept_for_the_request(self):
+        response = self.client.get('/whoami')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json(), {'message': 'Token is missing'})
+        self.assertEqual(self.decodes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from pc_builder_backend.logger_config.logger_config import create_logger
+
+
+class TestCreateLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_creates_log_dir(self):
+        """
+        Test that the log directory is created if it doesn't exist and messages are written to the log file.
+        """
+        log_dir = os.path.join(self.temp_dir.name, 'logs')
+        logger = create_logger('Test.log', log_dir=log_dir)
+        self.addCleanup(self._remove_handlers, logger)
+
+        logger.info("New Build added")
+        for handler in logger.handlers:
+            handler.flush()
+
+        with open(os.path.join(log_dir, 'Test.log')) as log_file:
+            self.assertIn("INFO - New Build added", log_file.read())
+
+    @staticmethod
+    def _remove_handlers(logger):
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
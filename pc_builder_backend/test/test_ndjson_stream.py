@@ -0,0 +1,78 @@
+import datetime
+import json
+import unittest
+
+from flask import Flask, jsonify, request
+from pc_builder_backend import ndjson_stream
+from pc_builder_backend.ndjson_stream import NDJSON_MIMETYPE, make_ndjson_response, wants_ndjson
+
+
+class TestNdjsonStream(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [{"user_id": str(number), "registration_date": datetime.datetime(2024, 1, 1 + number)}
+                        for number in range(5)]
+        self.records_read = 0
+
+        app = Flask(__name__)
+
+        @app.route('/records')
+        def records():
+            if wants_ndjson(request):
+                return make_ndjson_response(self.read_records())
+            return jsonify({'records': self.records})
+
+        self.client = app.test_client()
+
+    def read_records(self):
+        for record in self.records:
+            self.records_read += 1
+            yield record
+
+    def test_opt_in_with_accept_header(self):
+        """
+        Test that NDJSON is only sent when the client prefers it over JSON.
+        """
+        cases = [('application/x-ndjson', NDJSON_MIMETYPE), ('application/x-ndjson, application/json;q=0.5',
+                                                              NDJSON_MIMETYPE),
+                 ('*/*', 'application/json'), ('application/json, application/x-ndjson', 'application/json')]
+        for accept, mimetype in cases:
+            self.assertEqual(self.client.get('/records', headers={'Accept': accept}).mimetype, mimetype)
+        self.assertEqual(self.client.get('/records').mimetype, 'application/json')
+
+    def test_one_record_per_line(self):
+        """
+        Test that each record is sent on its own line, encoded the same as the JSON response.
+        """
+        streamed = self.client.get('/records', headers={'Accept': NDJSON_MIMETYPE})
+        lines = streamed.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         self.client.get('/records').json['records'])
+
+    def test_records_read_lazily(self):
+        """
+        Test that records are only read as the response is sent, and are gathered into chunks.
+        """
+        original_chunk_bytes = ndjson_stream.NDJSON_CHUNK_BYTES
+        ndjson_stream.NDJSON_CHUNK_BYTES = 1
+        self.addCleanup(setattr, ndjson_stream, 'NDJSON_CHUNK_BYTES', original_chunk_bytes)
+
+        response = self.client.get('/records', headers={'Accept': NDJSON_MIMETYPE}, buffered=False)
+        chunks = response.iter_encoded()
+        self.assertEqual(json.loads(next(chunks))['user_id'], '0')
+        self.assertEqual(self.records_read, 1)
+        self.assertEqual(len(list(chunks)), 4)
+        response.close()
+
+    def test_empty_stream(self):
+        """
+        Test that no records give an empty body.
+        """
+        self.records = []
+        response = self.client.get('/records', headers={'Accept': NDJSON_MIMETYPE})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
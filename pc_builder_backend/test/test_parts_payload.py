@@ -0,0 +1,89 @@
+import gzip
+import json
+import unittest
+
+from flask import Flask, request
+from pc_builder_backend import parts_payload
+from pc_builder_backend.excel_methods.catalog_snapshot import CatalogSnapshot
+from pc_builder_backend.parts_payload import PartsPayloadCache, PartsPayload, make_payload_response
+from pc_builder_backend.test.excel_methods.test_catalog_index import create_test_catalog
+
+
+class TestPartsPayload(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = create_test_catalog()
+        self.snapshot = CatalogSnapshot(self.catalog)
+        self.cache = PartsPayloadCache()
+
+        app = Flask(__name__)
+
+        @app.route('/parts')
+        def parts():
+            return make_payload_response(payload=self.cache.get(self.snapshot), request=request)
+
+        self.client = app.test_client()
+
+    def test_payload_matches_catalog(self):
+        """
+        Test that the payload lists every part of the catalog with its version.
+        """
+        response = self.client.get('/parts')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {'catalog_version': self.snapshot.version,
+                                         'parts': self.catalog.values.tolist()})
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+
+    def test_serialised_once_per_version(self):
+        """
+        Test that the payload is reused for the same version and rebuilt for a new one.
+        """
+        first = self.cache.get(self.snapshot)
+        self.assertIs(self.cache.get(self.snapshot), first)
+        changed = CatalogSnapshot(self.catalog.assign(Price=self.catalog['Price'] + 1))
+        second = self.cache.get(changed)
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second.etag(), first.etag())
+
+    def test_gzip_response(self):
+        """
+        Test that clients accepting gzip are sent the compressed payload with its own ETag.
+        """
+        plain = self.client.get('/parts')
+        compressed = self.client.get('/parts', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(compressed.get_data())), plain.json)
+        self.assertNotEqual(compressed.headers['ETag'], plain.headers['ETag'])
+        self.assertIn('Accept-Encoding', compressed.headers['Vary'])
+
+    def test_if_none_match_gets_304(self):
+        """
+        Test that a request holding the current ETag gets a 304 with no body, and a stale ETag gets the payload.
+        """
+        etag = self.client.get('/parts', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        response = self.client.get('/parts', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        response = self.client.get('/parts', headers={'If-None-Match': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_unsupported_encoding(self):
+        """
+        Test that a ValueError is raised for an encoding the payload can't be sent in.
+        """
+        with self.assertRaises(ValueError):
+            PartsPayload(self.snapshot).body('compress')
+
+    @unittest.skipIf(parts_payload.brotli is None, "brotli is not installed")
+    def test_brotli_preferred(self):
+        """
+        Test that brotli is preferred over gzip when the client accepts both.
+        """
+        response = self.client.get('/parts', headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+
+
+if __name__ == '__main__':
+    unittest.main()
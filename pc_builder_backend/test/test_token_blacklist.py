@@ -0,0 +1,184 @@
+import datetime
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from pymongo.errors import PyMongoError
+
+from pc_builder_backend.token_blacklist import BloomFilter, TokenBlacklist
+
+
+class FakeCollection:
+    """
+    Stands in for the blacklisted tokens collection, counting the tokens looked up one at a time.
+    """
+
+    def __init__(self):
+        self.documents = []
+        self.indexes = {}
+        self.lookups = 0
+        self.fail = False
+
+    def create_index(self, key, **kwargs):
+        self.indexes[key] = kwargs
+
+    def insert_one(self, document):
+        self.documents.append(dict(document))
+
+    def find_one(self, query):
+        self.lookups += 1
+        return next((document for document in self.documents if document["token"] == query["token"]), None)
+
+    def find(self, query, projection):
+        if self.fail:
+            raise PyMongoError("connection refused")
+        return [{"token": document["token"]} for document in self.documents]
+
+    def expire(self):
+        # What the TTL index does in the background
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        self.documents = [document for document in self.documents
+                          if document.get("expires_at") is None or document["expires_at"] > now]
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_added_tokens_are_found(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        tokens = [f"token-{number}" for number in range(1000)]
+        for token in tokens:
+            bloom_filter.add(token)
+        self.assertTrue(all(token in bloom_filter for token in tokens))
+        self.assertEqual(bloom_filter.num_tokens, 1000)
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for number in range(1000):
+            bloom_filter.add(f"token-{number}")
+        false_positives = sum(f"other-{number}" in bloom_filter for number in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_empty(self):
+        self.assertNotIn("token", BloomFilter(capacity=10, error_rate=0.01))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=0, error_rate=0.01)
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=10, error_rate=1)
+
+
+class TestTokenBlacklist(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = FakeCollection()
+        self.blacklist = TokenBlacklist(self.collection, capacity=100, error_rate=0.01)
+
+    def test_looks_up_every_token_until_synced(self):
+        self.assertFalse(self.blacklist.is_blacklisted("token"))
+        self.assertEqual(self.collection.lookups, 1)
+
+    def test_sync_creates_indexes(self):
+        self.blacklist.sync()
+        self.assertEqual(self.collection.indexes, {"expires_at": {"expireAfterSeconds": 0}, "token": {}})
+
+    def test_tokens_not_revoked_skip_the_collection(self):
+        self.blacklist.sync()
+        for number in range(100):
+            self.assertFalse(self.blacklist.is_blacklisted(f"token-{number}"))
+        self.assertLess(self.collection.lookups, 5)
+
+    def test_revoke(self):
+        self.blacklist.sync()
+        expires_at = int(time.time()) + 1800
+        self.blacklist.revoke("token", expires_at=expires_at)
+        self.assertTrue(self.blacklist.is_blacklisted("token"))
+        self.assertEqual(self.collection.documents, [{"token": "token", "expires_at": datetime.datetime.fromtimestamp(
+            expires_at, tz=datetime.timezone.utc)}])
+
+    def test_false_positives_are_looked_up(self):
+        self.blacklist.sync()
+        self.blacklist._filter.add("token")
+        self.assertFalse(self.blacklist.is_blacklisted("token"))
+        self.assertEqual(self.blacklist.stats()["false_positives"], 1)
+
+    def test_sync_picks_up_other_workers(self):
+        self.blacklist.sync()
+        TokenBlacklist(self.collection, capacity=100, error_rate=0.01).revoke("token", expires_at=None)
+        self.assertFalse(self.blacklist.is_blacklisted("token"))
+        self.assertEqual(self.blacklist.sync(), 1)
+        self.assertTrue(self.blacklist.is_blacklisted("token"))
+
+    def test_sync_drops_expired_tokens(self):
+        self.blacklist.revoke("expired", expires_at=time.time() - 1)
+        self.blacklist.revoke("current", expires_at=time.time() + 1800)
+        self.collection.expire()
+        time.sleep(0.01)
+        self.assertEqual(self.blacklist.sync(), 1)
+        self.assertTrue(self.blacklist.is_blacklisted("current"))
+
+    def test_sync_keeps_tokens_revoked_while_reading(self):
+        find = self.collection.find
+
+        def find_then_revoke(query, projection):
+            documents = find(query, projection)
+            self.blacklist.revoke("token", expires_at=None)
+            return documents
+
+        self.collection.find = find_then_revoke
+        self.blacklist.sync()
+        self.collection.lookups = 0
+        self.assertTrue(self.blacklist.is_blacklisted("token"))
+        self.assertEqual(self.collection.lookups, 1)
+
+    def test_filter_grows_with_the_blacklist(self):
+        for number in range(500):
+            self.blacklist.revoke(f"token-{number}", expires_at=None)
+        self.blacklist.sync()
+        self.assertGreaterEqual(self.blacklist._filter.num_bits, BloomFilter(capacity=1000, error_rate=0.01).num_bits)
+
+    def test_failed_sync_keeps_the_last_filter(self):
+        self.blacklist.sync()
+        bloom_filter = self.blacklist._filter
+        self.collection.fail = True
+        with patch('builtins.print') as mock_print:
+            self.blacklist.start_syncing(interval=60)
+            self.blacklist.stop_syncing()
+        self.assertIs(self.blacklist._filter, bloom_filter)
+        self.assertIn("the filter is 0s old", mock_print.call_args[0][0])
+
+    def test_failed_first_sync(self):
+        self.collection.fail = True
+        with patch('builtins.print') as mock_print:
+            self.blacklist.start_syncing(interval=60)
+            self.blacklist.stop_syncing()
+        self.assertIn("every token is looked up", mock_print.call_args[0][0])
+        self.assertFalse(self.blacklist.is_blacklisted("token"))
+        self.assertEqual(self.collection.lookups, 1)
+
+    def test_counters_are_thread_safe(self):
+        self.blacklist.sync()
+        self.blacklist._filter.add("token")
+        threads = [threading.Thread(target=lambda: [self.blacklist.is_blacklisted("token") for _ in range(200)])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = self.blacklist.stats()
+        self.assertEqual((stats["lookups"], stats["false_positives"]), (800, 800))
+
+    def test_start_syncing(self):
+        self.blacklist.revoke("token", expires_at=None)
+        self.blacklist.start_syncing(interval=60)
+        self.blacklist.stop_syncing()
+        self.assertEqual(self.blacklist.stats()["tokens"], 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenBlacklist(self.collection, capacity=0, error_rate=0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fixtures')
+
+
+def load_fixture(file_name: str) -> bytes:
+    """
+    Reads a saved page from the fixtures directory.
+
+    :param file_name: Name of the fixture file.
+    :return: Contents of the page.
+    """
+    with open(os.path.join(FIXTURES_DIR, file_name), 'rb') as fixture:
+        return fixture.read()
+
+
+class FixtureServer:
+
+    def __init__(self, pages: dict, latency: float = 0.0, validators: bool = False, failures: dict = None,
+                 retry_after: int = None):
+        """
+        Initialises a local HTTP server standing in for the parts site, serving saved pages after a delay.
+
+        The server speaks HTTP/1.1 so clients can keep connections alive, and records how many connections were
+        opened and the most requests it was handling at once.
+
+        :param pages: Dictionary mapping request paths, including any query string, to the page bodies served.
+        :param latency: Seconds each response is delayed by, to stand in for the round trip to the real site.
+        :param validators: Whether pages are sent with an ETag and Last-Modified, and conditional requests for an
+                           unchanged page get a 304.
+        :param failures: Dictionary mapping request paths to a list of error statuses, each request for the path
+                         gets the next status in its list until none are left, standing in for a flaky site.
+        :param retry_after: Seconds sent in a Retry-After header with each 429 and 503, none sent if not provided.
+        """
+        self.pages = pages
+        self.latency = latency
+        self.validators = validators
+        self.failures = {path: list(statuses) for path, statuses in (failures or {}).items()}
+        self.retry_after = retry_after
+
+        self.requests = []
+        self.statuses = []
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    def _create_handler(self) -> type:
+        """
+        Creates the request handler class bound to this server.
+        """
+        fixture_server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with fixture_server._lock:
+                    fixture_server.connections += 1
+
+            def do_GET(self):
+                with fixture_server._lock:
+                    fixture_server.requests.append(self.path)
+                    fixture_server._in_flight += 1
+                    fixture_server.max_in_flight = max(fixture_server.max_in_flight, fixture_server._in_flight)
+                try:
+                    time.sleep(fixture_server.latency)
+                    with fixture_server._lock:
+                        failures = fixture_server.failures.get(self.path)
+                        failure = failures.pop(0) if failures else None
+                    if failure is not None:
+                        self.send_failure(failure)
+                    else:
+                        self.send_page(fixture_server.pages.get(self.path))
+                finally:
+                    with fixture_server._lock:
+                        fixture_server._in_flight -= 1
+
+            def send_page(self, body):
+                if body is None:
+                    self.send_body(404, b"Not Found", {})
+                    return
+                if not fixture_server.validators:
+                    self.send_body(200, body, {})
+                    return
+
+                # The tag changes whenever the page does, the modified date is fixed as it is only sent back
+                validators = {"ETag": f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+                              "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+                if self.headers.get("If-None-Match") == validators["ETag"]:
+                    self.send_body(304, b"", validators)
+                else:
+                    self.send_body(200, body, validators)
+
+            def send_failure(self, status):
+                headers = {}
+                if status in (429, 503) and fixture_server.retry_after is not None:
+                    headers["Retry-After"] = str(fixture_server.retry_after)
+                self.send_body(status, b"Try again later", headers)
+
+            def send_body(self, status, body, headers):
+                with fixture_server._lock:
+                    fixture_server.statuses.append(status)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return FixtureHandler
+
+    def url(self, path: str) -> str:
+        """
+        Builds the full URL of a path on the server.
+        """
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def start(self) -> 'FixtureServer':
+        """
+        Starts serving requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the server and closes its socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_cache import PageCache, get_page_cache_path
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+from pc_builder_backend.webscraping.part_data_scraper import scrape_part_data
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_file = get_page_cache_path(os.path.join(self.temp_dir.name, 'components.xlsx'))
+        self.pages = {
+            '/browse/cpus': load_fixture('cpus_page1.html'),
+            '/browse/cpus?page=2': load_fixture('cpus_page2.html'),
+        }
+        self.parsed = []
+
+    def start_server(self, validators: bool) -> FixtureServer:
+        server = FixtureServer(self.pages, validators=validators).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def parse(self, html_content: str) -> dict:
+        self.parsed.append(html_content)
+        return scrape_part_data(html_content)
+
+    def run_scraper(self, server: FixtureServer) -> tuple:
+        """
+        Scrapes every page through a cache read from the cache file, then saves it as the scraper does.
+
+        :return: Tuple of (parts scraped from each page, cache stats of the run).
+        """
+        page_cache = PageCache(self.cache_file)
+        with PageFetcher() as fetcher:
+            parts = fetcher.fetch_all([server.url(path) for path in self.pages],
+                                      fetch=lambda url: page_cache.fetch_parts(fetcher, url, parse=self.parse))
+        page_cache.save()
+        return parts, page_cache.stats()
+
+    def test_not_modified_pages_not_parsed(self):
+        """
+        Test that pages the server says are unchanged are neither downloaded nor parsed, and reuse their parts.
+        """
+        server = self.start_server(validators=True)
+        first_parts, first_stats = self.run_scraper(server)
+        self.assertEqual(first_stats['pages_parsed'], 2)
+        self.assertEqual(len(first_parts[0]), 3)
+
+        self.parsed.clear()
+        second_parts, second_stats = self.run_scraper(server)
+        self.assertEqual(second_parts, first_parts)
+        self.assertEqual(self.parsed, [])
+        self.assertEqual(server.statuses[-2:], [304, 304])
+        self.assertEqual(second_stats['pages_not_modified'], 2)
+        self.assertEqual(second_stats['bytes_downloaded'], 0)
+        self.assertEqual(second_stats['bytes_saved'], first_stats['bytes_downloaded'])
+        self.assertGreater(second_stats['parse_seconds_saved'], 0)
+
+    def test_changed_page_parsed_again(self):
+        """
+        Test that only a page that changed is downloaded and parsed again.
+        """
+        server = self.start_server(validators=True)
+        self.run_scraper(server)
+
+        self.parsed.clear()
+        self.pages['/browse/cpus?page=2'] = load_fixture('cpus_page2.html').replace(b'489.00', b'459.00')
+        parts, stats = self.run_scraper(server)
+        self.assertEqual(len(self.parsed), 1)
+        self.assertEqual(parts[1]['AMD Ryzen 9 7950X 4.5GHz 16-Core Processor'], '£459.00')
+        self.assertEqual((stats['pages_not_modified'], stats['pages_parsed']), (1, 1))
+
+    def test_same_content_without_validators(self):
+        """
+        Test that a page downloaded again with the same content as before is not parsed again.
+        """
+        server = self.start_server(validators=False)
+        first_parts, _ = self.run_scraper(server)
+
+        self.parsed.clear()
+        second_parts, stats = self.run_scraper(server)
+        self.assertEqual(second_parts, first_parts)
+        self.assertEqual(self.parsed, [])
+        self.assertEqual(stats['pages_unchanged'], 2)
+
+    def test_unreadable_cache_starts_empty(self):
+        """
+        Test that a cache file that can't be read is treated as an empty cache.
+        """
+        with open(self.cache_file, 'w') as file:
+            file.write("{not json")
+        self.assertEqual(len(PageCache(self.cache_file)), 0)
+        self.assertEqual(PageCache(self.cache_file).conditional_headers('http://127.0.0.1/browse/cpus'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import time
+import unittest
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher, TokenBucket
+from pc_builder_backend.webscraping.part_data_scraper import scrape_part_data
+
+
+class TestPageFetcher(unittest.TestCase):
+
+    def setUp(self):
+        pages = {
+            '/browse/cpus': load_fixture('cpus_page1.html'),
+            '/browse/cpus?page=2': load_fixture('cpus_page2.html'),
+            '/browse/graphics-cards': load_fixture('graphics_cards_page1.html'),
+        }
+        self.server = FixtureServer(pages, latency=0.05).start()
+        self.addCleanup(self.server.stop)
+
+    def test_categories_keep_page_order(self):
+        """
+        Test that each category's pages come back in the order of its URLs, with their parts scraped correctly.
+        """
+        category_urls = {
+            "CPU": [self.server.url('/browse/cpus'), self.server.url('/browse/cpus?page=2')],
+            "GPU": [self.server.url('/browse/graphics-cards')],
+        }
+        with PageFetcher() as fetcher:
+            category_pages = fetcher.fetch_categories(category_urls)
+
+        self.assertEqual(list(category_pages), ["CPU", "GPU"])
+        self.assertEqual(category_pages["CPU"], [load_fixture('cpus_page1.html').decode('utf-8'),
+                                                 load_fixture('cpus_page2.html').decode('utf-8')])
+        self.assertEqual(scrape_part_data(category_pages["CPU"][0]), {
+            'AMD Ryzen 7 7800X3D 4.2GHz 8-Core Processor': '£339.99',
+            'Intel Core i5-13400F 2.5GHz 10-Core Processor': '£179.00',
+            'AMD Ryzen 5 5600 3.5GHz 6-Core Processor': 'Price not available',
+        })
+        self.assertEqual(len(scrape_part_data(category_pages["GPU"][0])), 2)
+
+    def test_per_host_limit(self):
+        """
+        Test that no more than max_per_host requests are sent to the server at once, over kept alive connections.
+        """
+        urls = [self.server.url('/browse/cpus')] * 12
+        with PageFetcher(max_workers=8, max_per_host=3) as fetcher:
+            pages = fetcher.fetch_all(urls)
+
+        self.assertEqual(len(pages), 12)
+        self.assertEqual(self.server.max_in_flight, 3)
+        self.assertLessEqual(self.server.connections, 3)
+
+    def test_failed_page_is_none(self):
+        """
+        Test that a page that can't be fetched gives None without stopping the other pages.
+        """
+        with PageFetcher() as fetcher:
+            pages = fetcher.fetch_all([self.server.url('/browse/missing'), self.server.url('/browse/graphics-cards')])
+
+        self.assertIsNone(pages[0])
+        self.assertIn('RTX 4060', pages[1])
+
+    def test_faster_than_sequential(self):
+        """
+        Test that pages are fetched concurrently, with requests overlapping up to max_per_host at once.
+        """
+        urls = [self.server.url('/browse/cpus')] * 8
+        start = time.perf_counter()
+        with PageFetcher(max_per_host=4) as fetcher:
+            pages = fetcher.fetch_all(urls)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(pages), 8)
+        self.assertGreaterEqual(self.server.max_in_flight, 2)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+        # Only fails if the pages were fetched one after another
+        self.assertLess(elapsed, self.server.latency * len(urls))
+
+    def test_invalid_limits(self):
+        """
+        Test that a ValueError is raised for limits that aren't positive.
+        """
+        with self.assertRaises(ValueError):
+            PageFetcher(max_workers=0)
+        with self.assertRaises(ValueError):
+            PageFetcher(max_per_host=0)
+        with self.assertRaises(ValueError):
+            PageFetcher(rate_per_host=0)
+        with self.assertRaises(ValueError):
+            PageFetcher(burst_per_host=0)
+        with self.assertRaises(ValueError):
+            PageFetcher(max_retries=-1)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=10, burst=0)
+
+
+class TestFetchRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = {
+            '/browse/cpus': load_fixture('cpus_page1.html'),
+            '/browse/cpus?page=2': load_fixture('cpus_page2.html'),
+            '/browse/graphics-cards': load_fixture('graphics_cards_page1.html'),
+        }
+
+    def start_server(self, failures: dict, retry_after: int = None) -> FixtureServer:
+        server = FixtureServer(self.pages, failures=failures, retry_after=retry_after).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def create_fetcher(self, **kwargs) -> PageFetcher:
+        # Backs off for hundredths of a second so the tests don't wait on the real backoff
+        kwargs = {"backoff_base": 0.01, "backoff_max": 0.05, **kwargs}
+        fetcher = PageFetcher(**kwargs)
+        self.addCleanup(fetcher.close)
+        return fetcher
+
+    def test_retries_until_fetched(self):
+        """
+        Test that a page rate limited or failing with server errors is sent again until it is fetched.
+        """
+        server = self.start_server({'/browse/cpus': [503, 429, 500]})
+        fetcher = self.create_fetcher(max_retries=3)
+        url = server.url('/browse/cpus')
+
+        self.assertIn('Ryzen 7 7800X3D', fetcher.fetch(url))
+        self.assertEqual(server.statuses, [503, 429, 500, 200])
+        self.assertEqual(fetcher.statuses[url].to_dict(), {"url": url, "status_code": 200, "attempts": 4,
+                                                           "error": None})
+        stats = fetcher.stats()
+        self.assertEqual((stats['requests'], stats['retries'], stats['pages_retried']), (4, 3, 1))
+        self.assertEqual((stats['pages_fetched'], stats['pages_failed']), (1, 0))
+
+    def test_gives_up_after_max_retries(self):
+        """
+        Test that a page still failing after max_retries is given up on, with the status it last got.
+        """
+        server = self.start_server({'/browse/cpus': [503] * 5})
+        fetcher = self.create_fetcher(max_retries=2, retry_rounds=0)
+        pages = fetcher.fetch_all([server.url('/browse/cpus'), server.url('/browse/graphics-cards')])
+
+        self.assertIsNone(pages[0])
+        self.assertIn('RTX 4060', pages[1])
+        self.assertEqual(server.requests.count('/browse/cpus'), 3)
+        failed, = fetcher.failed_pages()
+        self.assertEqual((failed.url, failed.status_code, failed.attempts), (server.url('/browse/cpus'), 503, 3))
+        self.assertTrue(failed.retryable)
+
+    def test_client_errors_not_retried(self):
+        """
+        Test that a page that doesn't exist is only requested once.
+        """
+        server = self.start_server({})
+        fetcher = self.create_fetcher()
+        self.assertEqual(fetcher.fetch_all([server.url('/browse/missing')]), [None])
+
+        self.assertEqual(server.requests, ['/browse/missing'])
+        self.assertFalse(fetcher.statuses[server.url('/browse/missing')].retryable)
+
+    def test_dropped_connections_retried(self):
+        """
+        Test that a request that never gets a response is retried and fails without a status.
+        """
+        fetcher = self.create_fetcher(max_retries=1, retry_rounds=0)
+        self.assertEqual(fetcher.fetch_all(['http://127.0.0.1:1/browse/cpus']), [None])
+
+        status = fetcher.statuses['http://127.0.0.1:1/browse/cpus']
+        self.assertEqual((status.status_code, status.attempts), (None, 2))
+        self.assertTrue(status.retryable)
+
+    def test_retry_round_skips_fetched_pages(self):
+        """
+        Test that pages that failed are fetched again once the others are done, without fetching the others again.
+        """
+        server = self.start_server({'/browse/cpus': [503, 503]})
+        fetcher = self.create_fetcher(max_retries=1, retry_rounds=1)
+        pages = fetcher.fetch_all([server.url(path) for path in self.pages])
+
+        self.assertTrue(all(page is not None for page in pages))
+        self.assertEqual(server.requests.count('/browse/cpus'), 3)
+        self.assertEqual(server.requests.count('/browse/cpus?page=2'), 1)
+        self.assertEqual(server.requests.count('/browse/graphics-cards'), 1)
+        self.assertEqual(fetcher.failed_pages(), [])
+
+    def test_retry_after(self):
+        """
+        Test that a rate limited request waits as long as the site's Retry-After asks before it is sent again.
+        """
+        server = self.start_server({'/browse/cpus': [429]}, retry_after=1)
+        fetcher = self.create_fetcher(backoff_max=5)
+        start = time.perf_counter()
+        fetcher.fetch(server.url('/browse/cpus'))
+
+        self.assertGreaterEqual(time.perf_counter() - start, 1)
+
+    def test_backoff_delay(self):
+        """
+        Test that backoff delays are random up to a limit doubling with each retry, and never past backoff_max.
+        """
+        fetcher = self.create_fetcher(backoff_base=0.5, backoff_max=4)
+        for retry in range(1, 8):
+            for _ in range(20):
+                self.assertLessEqual(fetcher.backoff_delay(retry), min(4, 0.5 * 2 ** (retry - 1)))
+        self.assertEqual(fetcher.backoff_delay(1, retry_after=3), 3)
+        self.assertEqual(fetcher.backoff_delay(1, retry_after=60), 4)
+
+    def test_rate_limit(self):
+        """
+        Test that requests past the burst are held to the rate allowed for a host.
+        """
+        server = self.start_server({})
+        fetcher = self.create_fetcher(rate_per_host=20, burst_per_host=2)
+        start = time.perf_counter()
+        fetcher.fetch_all([server.url('/browse/cpus')] * 8)
+        elapsed = time.perf_counter() - start
+
+        # Two requests are sent straight away and the other six a twentieth of a second apart
+        self.assertGreaterEqual(elapsed, 6 / 20 - 0.02)
+        self.assertGreater(fetcher.stats()['rate_limited_seconds'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_cache import PageCache
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+from pc_builder_backend.excel_methods.catalog_diff import diff_catalogs
+from pc_builder_backend.excel_methods.price_history import PriceHistoryStore
+from pc_builder_backend.webscraping.part_data_scraper import (get_page_url, iter_part_rows, normalise_price,
+                                                              scrape_categories, scrape_page_rows,
+                                                              load_previous_catalog, record_price_history,
+                                                              is_catalog_complete)
+from pc_builder_backend.webscraping.scrape_categories import ScrapeCategory
+
+
+def create_memory_page(page: int) -> bytes:
+    """
+    Builds a later page of the memory category, its parts are named after the page.
+    """
+    return load_fixture('memory_page1.html').replace(b'Corsair Vengeance', f'Page {page} Vengeance'.encode('utf-8'))
+
+
+class TestPartDataScraper(unittest.TestCase):
+
+    def setUp(self):
+        # CPUs have two pages, graphics cards and hard drives one, and memory seven with the middle ones left out
+        pages = {
+            '/browse/cpus': load_fixture('cpus_page1.html'),
+            '/browse/cpus?page=2': load_fixture('cpus_page2.html'),
+            '/browse/graphics-cards': load_fixture('graphics_cards_page1.html'),
+            '/browse/memory': load_fixture('memory_page1.html'),
+            '/browse/hard-drives': load_fixture('hard_drives_page1.html'),
+        }
+        pages.update({f'/browse/memory?page={page}': create_memory_page(page) for page in range(2, 8)})
+        self.server = FixtureServer(pages).start()
+        self.addCleanup(self.server.stop)
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.categories = [ScrapeCategory("CPU", self.server.url('/browse/cpus')),
+                           ScrapeCategory("GPU", self.server.url('/browse/graphics-cards')),
+                           ScrapeCategory("RAM", self.server.url('/browse/memory')),
+                           ScrapeCategory("HDD", self.server.url('/browse/hard-drives'))]
+
+    def scrape(self, categories: list, **kwargs) -> list:
+        page_cache = PageCache(os.path.join(self.temp_dir.name, '.components.pages.json'))
+        with PageFetcher(backoff_base=0.01, backoff_max=0.05) as fetcher:
+            category_pages = scrape_categories(fetcher, categories, page_cache, **kwargs)
+        page_cache.save()
+        return category_pages
+
+    def test_get_page_url(self):
+        """
+        Test that later pages add a page query to the category URL.
+        """
+        self.assertEqual(get_page_url("https://pcparts.uk/browse/cpus", 1), "https://pcparts.uk/browse/cpus")
+        self.assertEqual(get_page_url("https://pcparts.uk/browse/cpus", 3), "https://pcparts.uk/browse/cpus?page=3")
+        self.assertEqual(get_page_url("https://pcparts.uk/browse/cpus?sort=price", 2),
+                         "https://pcparts.uk/browse/cpus?sort=price&page=2")
+
+    def test_discovers_every_page(self):
+        """
+        Test that every page of each category is fetched once, in order, and no pages past the last are requested.
+        """
+        category_pages = self.scrape(self.categories)
+
+        self.assertEqual([len(pages) for pages in category_pages], [2, 1, 7, 1])
+        self.assertEqual(len(self.server.requests), 11)
+        self.assertEqual(len(set(self.server.requests)), 11)
+        memory_urls = [url for url, _ in category_pages[2]]
+        self.assertEqual(memory_urls, [self.server.url('/browse/memory')] +
+                         [self.server.url(f'/browse/memory?page={page}') for page in range(2, 8)])
+        self.assertIn(['Page 7 Vengeance 32GB (2 x 16GB) DDR5-6000 CL30', 104.99], category_pages[2][6][1])
+        self.assertIn('Intel Core i9-14900K 3.2GHz 24-Core Processor', [name for name, _ in category_pages[0][1][1]])
+
+    def test_page_cap(self):
+        """
+        Test that no more than max_pages pages are fetched from a category.
+        """
+        category_pages = self.scrape(self.categories[2:3], max_pages=3)
+
+        self.assertEqual(len(category_pages[0]), 3)
+        self.assertNotIn('/browse/memory?page=4', self.server.requests)
+
+    def test_normalise_price(self):
+        """
+        Test that prices are converted to pounds, including prices with thousands separators, and parts without a
+        price are left out.
+        """
+        self.assertEqual(normalise_price('£489.00'), 489.0)
+        self.assertEqual(normalise_price('£1,049.99'), 1049.99)
+        self.assertIsNone(normalise_price('Price not available'))
+
+        page = scrape_page_rows(load_fixture('hard_drives_page1.html').decode('utf-8'))
+        self.assertEqual(page['num_pages'], 1)
+        self.assertTrue(all(isinstance(price, float) for _, price in page['rows']))
+
+    def test_iter_part_rows(self):
+        """
+        Test that the rows of every page are streamed in category and page order, tagged with the category's type.
+        """
+        category_pages = self.scrape(self.categories)
+        part_rows = list(iter_part_rows(self.categories, category_pages))
+
+        expected = [(category.part_type, name, price) for category, pages in zip(self.categories, category_pages)
+                    for _, rows in pages for name, price in rows]
+        self.assertEqual(part_rows, expected)
+        self.assertEqual([part_type for part_type, _, _ in part_rows][0], 'CPU')
+        self.assertEqual([part_type for part_type, _, _ in part_rows][-1], 'HDD')
+
+    def test_record_price_history(self):
+        """
+        Test that the first run records every part against an empty previous catalog, and runs past the most segments
+        merge them.
+        """
+        excel_file = os.path.join(self.temp_dir.name, 'components.xlsx')
+        previous = load_previous_catalog(excel_file)
+        self.assertEqual(len(previous), 0)
+
+        price_history = PriceHistoryStore(os.path.join(self.temp_dir.name, '.components.history'))
+        current = pd.DataFrame({'Type': ['CPU'], 'Name': ['Intel i5'], 'Price': [200.0]})
+        for price in (200.0, 190.0, 180.0):
+            current.loc[0, 'Price'] = price
+            record_price_history(price_history, diff_catalogs(previous, current), max_segments=2)
+            previous = current.copy()
+
+        self.assertEqual(len(price_history.segment_files()), 1)
+        self.assertEqual([price for _, price in price_history.history('CPU', 'Intel i5')], [200.0, 190.0, 180.0])
+
+    def test_is_catalog_complete(self):
+        """
+        Test that an empty catalog, or one listing under the kept fraction of the last run's parts, isn't written.
+        """
+        previous = pd.DataFrame({'Type': ['CPU'] * 10, 'Name': [f'CPU {number}' for number in range(10)],
+                                 'Price': [100.0] * 10})
+        empty = previous.iloc[:0]
+        self.assertFalse(is_catalog_complete(empty, empty))
+        self.assertFalse(is_catalog_complete(previous, empty))
+        self.assertFalse(is_catalog_complete(previous, previous.iloc[:4], min_kept_fraction=0.5))
+        self.assertTrue(is_catalog_complete(previous, previous.iloc[:5], min_kept_fraction=0.5))
+        self.assertTrue(is_catalog_complete(empty, previous.iloc[:1]))
+
+    def test_failing_page_reuses_last_run(self):
+        """
+        Test that a page failing after every retry keeps the parts scraped from it last run.
+        """
+        first_pages = self.scrape(self.categories)
+        self.server.failures['/browse/cpus?page=2'] = [503] * 10
+        second_pages = self.scrape(self.categories)
+
+        self.assertEqual(second_pages, first_pages)
+        self.assertEqual(self.server.requests.count('/browse/cpus?page=2'), 1 + 2 * 4)
+
+    def test_failed_first_page(self):
+        """
+        Test that a category whose first page can't be fetched gives a single empty page, without stopping the others.
+        """
+        categories = [ScrapeCategory("SSD", self.server.url('/browse/solid-state-drives'))] + self.categories[:1]
+        category_pages = self.scrape(categories)
+
+        self.assertEqual(category_pages[0], [(self.server.url('/browse/solid-state-drives'), None)])
+        self.assertEqual(len(category_pages[1]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+from pc_builder_backend.test.webscraping.fixture_server import FIXTURES_DIR, load_fixture
+from pc_builder_backend.webscraping import part_parsers
+from pc_builder_backend.webscraping.part_data_scraper import scrape_first_page, scrape_part_data
+from pc_builder_backend.webscraping.part_parsers import PARSER_BACKENDS, find_page_count, get_parser_backend
+
+# Markup the site could send that the saved pages don't cover
+EDGE_CASE_PAGE = """
+<div class="results">
+  <div class="card  card-horizontal featured">
+    <div class="card-body">
+      <div class="title">  Be Quiet! <span>Pure Power 12 M</span> 850W &amp; ATX 3.0 </div>
+      <div class="price in-stock sale">£99.99</div>
+      <div class="price in-stock"><span>£</span>94.99</div>
+    </div>
+  </div>
+  <div class="card card-horizontal"><div class="card-body"><div class="price in-stock">£10.00</div></div></div>
+  <div class="card card-horizontal">
+    <div class="title">Noctua NH-D15<br>chromax.black</div>
+    <div><div class="title">Nested title</div></div>
+  </div>
+  <div class="card card-horizontal"><div class="title">Noctua NH-D15<br>chromax.black</div>
+    <div class="price in-stock">£109.95</div></div>
+</div>
+<ul class="pagination"><li><a href="?page=2">2</a></li><li><a href="#">12</a></li><li><a>40</a></li></ul>
+<div class="pagination"><a href="?page=99">99</a></div>
+"""
+
+
+class TestPartParsers(unittest.TestCase):
+
+    def test_backends_give_identical_output(self):
+        """
+        Test that every backend gives the same parts and page count as a full BeautifulSoup parse.
+        """
+        pages = {file_name: load_fixture(file_name).decode('utf-8') for file_name in sorted(os.listdir(FIXTURES_DIR))}
+        pages['edge case'] = EDGE_CASE_PAGE
+        for name, html_content in pages.items():
+            expected = part_parsers.parse_with_soup(html_content)
+            for backend, parse in PARSER_BACKENDS.items():
+                with self.subTest(page=name, backend=backend):
+                    self.assertEqual(parse(html_content), expected)
+
+    def test_edge_cases(self):
+        """
+        Test how parts are read from unusual markup, for every backend.
+        """
+        for backend in PARSER_BACKENDS:
+            part_info, num_pages = get_parser_backend(backend)(EDGE_CASE_PAGE)
+            self.assertEqual(part_info, {'Be Quiet! Pure Power 12 M 850W & ATX 3.0': '£94.99',
+                                         'Noctua NH-D15chromax.black': '£109.95'})
+            self.assertEqual(num_pages, 12)
+
+    def test_find_page_count(self):
+        """
+        Test that the page count is the highest page linked to by the pagination, or 1 with no pagination.
+        """
+        expected = {'cpus_page1.html': 2, 'cpus_page2.html': 2, 'graphics_cards_page1.html': 1,
+                    'memory_page1.html': 7, 'hard_drives_page1.html': 1}
+        for file_name, num_pages in expected.items():
+            soup = BeautifulSoup(load_fixture(file_name), 'html.parser')
+            self.assertEqual(find_page_count(soup), num_pages, file_name)
+
+    def test_scrape_with_parser(self):
+        """
+        Test that the scraper uses the backend it is given, and raises a ValueError for one that doesn't exist.
+        """
+        html_content = load_fixture('memory_page1.html').decode('utf-8')
+        self.assertEqual(scrape_first_page(html_content, parser='strainer')['num_pages'], 7)
+        self.assertEqual(scrape_part_data(html_content, parser='events'), scrape_part_data(html_content))
+        with self.assertRaises(ValueError):
+            scrape_part_data(html_content, parser='html5lib')
+
+    def test_default_backend(self):
+        """
+        Test that the events backend is the default whether or not lxml is installed.
+        """
+        self.assertIs(get_parser_backend(), part_parsers.parse_with_events)
+
+
+if __name__ == '__main__':
+    unittest.main()
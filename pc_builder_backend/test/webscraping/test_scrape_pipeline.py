@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+from pc_builder_backend.test.webscraping.fixture_server import FixtureServer, load_fixture
+from pc_builder_backend.webscraping.page_cache import PageCache, get_page_cache_path
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+from pc_builder_backend.webscraping.part_data_scraper import scrape_page_rows
+from pc_builder_backend.webscraping.scrape_pipeline import ScrapePipeline
+
+
+def parse_or_fail(html_content: str) -> dict:
+    """
+    Scrapes a page like the scraper does, failing on pages of graphics cards.
+    """
+    if 'GeForce' in html_content:
+        raise RuntimeError("parse failed")
+    return scrape_page_rows(html_content)
+
+
+class TestScrapePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_file = get_page_cache_path(os.path.join(self.temp_dir.name, 'components.xlsx'))
+        self.pages = {
+            '/browse/cpus': load_fixture('cpus_page1.html'),
+            '/browse/cpus?page=2': load_fixture('cpus_page2.html'),
+            '/browse/graphics-cards': load_fixture('graphics_cards_page1.html'),
+            '/browse/memory': load_fixture('memory_page1.html'),
+            '/browse/hard-drives': load_fixture('hard_drives_page1.html'),
+        }
+        self.server = FixtureServer(self.pages, validators=True).start()
+        self.addCleanup(self.server.stop)
+        self.urls = [self.server.url(path) for path in self.pages]
+
+    def scrape(self, parse=scrape_page_rows, **kwargs) -> tuple:
+        """
+        Scrapes every page through a cache read from the cache file, then saves it as the scraper does.
+
+        :return: Tuple of (what was scraped from each page, cache stats of the run).
+        """
+        page_cache = PageCache(self.cache_file)
+        with PageFetcher() as fetcher:
+            scraped = ScrapePipeline(fetcher, page_cache, parse=parse, **kwargs).scrape_all(self.urls)
+        page_cache.save()
+        return scraped, page_cache.stats()
+
+    def test_matches_parsing_in_process(self):
+        """
+        Test that pages scraped by the worker processes come back in the order of the URLs, as if scraped directly.
+        """
+        scraped, stats = self.scrape(parse_workers=2, queue_size=1)
+
+        self.assertEqual(scraped, [scrape_page_rows(page.decode('utf-8')) for page in self.pages.values()])
+        self.assertEqual(stats['pages_parsed'], len(self.pages))
+
+    def test_unchanged_pages_not_sent_to_workers(self):
+        """
+        Test that pages the server says are unchanged reuse what was scraped from them without being parsed.
+        """
+        first_scraped, _ = self.scrape(parse_workers=1)
+        second_scraped, stats = self.scrape(parse_workers=1)
+
+        self.assertEqual(second_scraped, first_scraped)
+        self.assertEqual(stats['pages_parsed'], 0)
+        self.assertEqual(stats['pages_not_modified'], len(self.pages))
+
+    def test_failed_parse(self):
+        """
+        Test that a page that fails to be scraped gives None and isn't cached, without stopping the other pages.
+        """
+        scraped, stats = self.scrape(parse=parse_or_fail, parse_workers=1)
+
+        self.assertIsNone(scraped[2])
+        self.assertEqual(sum(page is not None for page in scraped), len(self.pages) - 1)
+        self.assertEqual(stats['pages_parsed'], len(self.pages) - 1)
+
+    def test_no_urls(self):
+        """
+        Test that scraping no pages doesn't start the pipeline.
+        """
+        page_cache = PageCache(self.cache_file)
+        with PageFetcher() as fetcher:
+            self.assertEqual(ScrapePipeline(fetcher, page_cache, parse=scrape_page_rows).scrape_all([]), [])
+
+    def test_invalid_input(self):
+        """
+        Test that the number of workers and the queue size must be positive.
+        """
+        page_cache = PageCache(self.cache_file)
+        with PageFetcher() as fetcher:
+            with self.assertRaises(ValueError):
+                ScrapePipeline(fetcher, page_cache, parse=scrape_page_rows, parse_workers=0)
+            with self.assertRaises(ValueError):
+                ScrapePipeline(fetcher, page_cache, parse=scrape_page_rows, queue_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
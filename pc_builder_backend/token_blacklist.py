@@ -0,0 +1,218 @@
+import datetime
+import hashlib
+import math
+import threading
+import time
+from typing import Iterator, Union
+
+from pymongo.errors import PyMongoError
+
+
+class BloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialises a Bloom filter, a set of tokens held as bits that can tell a token was never added without
+        storing the tokens themselves. A token that was added is always found, one that wasn't is found with
+        probability error_rate once capacity tokens have been added.
+
+        :param capacity: Number of tokens the filter is sized for.
+        :param error_rate: Chance of finding a token that wasn't added, once capacity tokens have been added.
+        :raises ValueError: If capacity isn't positive or error_rate isn't between 0 and 1.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.num_tokens = 0
+
+    def _positions(self, token: str) -> Iterator[int]:
+        """
+        Works out the bits a token sets from two halves of its SHA-256 hash, one at a time so a check can stop at the
+        first bit that isn't set.
+        """
+        digest = hashlib.sha256(token.encode('utf-8')).digest()
+        position, step = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:16], 'little') | 1
+        for _ in range(self.num_hashes):
+            yield position % self.num_bits
+            position += step
+
+    def add(self, token: str) -> None:
+        """
+        Adds a token to the filter.
+
+        :param token: Encoded JWT.
+        """
+        for position in self._positions(token):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.num_tokens += 1
+
+    def __contains__(self, token: str) -> bool:
+        bits = self._bits
+        for position in self._positions(token):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class TokenBlacklist:
+
+    def __init__(self, collection, capacity: int, error_rate: float):
+        """
+        Initialises the blacklist of tokens revoked by logging out, stored in MongoDB with a copy held in a Bloom
+        filter by each worker process.
+
+        Revoked tokens are stored with the time they expire and a TTL index removes them once they have, so the
+        collection only ever holds tokens that could still be used. Most tokens checked were never revoked, the
+        filter tells so without a round trip to the database. A token the filter finds may be a false positive, so
+        it is looked up in the collection. Revocations by other worker processes are picked up when the filter is
+        synced, until the first sync every token is looked up.
+
+        :param collection: MongoDB collection of revoked tokens.
+        :param capacity: Fewest tokens the filter is sized for, it is sized for twice the revoked tokens if more.
+        :param error_rate: Chance of a token that wasn't revoked being looked up in the collection.
+        :raises ValueError: If capacity isn't positive or error_rate isn't between 0 and 1.
+        """
+        # Checks the arguments before the first sync rather than failing in the background
+        BloomFilter(capacity=capacity, error_rate=error_rate)
+
+        self.collection = collection
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = None
+        self._lock = threading.Lock()
+        # Tokens revoked in this process and when, so a sync that read the collection before they were stored
+        # doesn't drop them from the filter
+        self._local_revocations = []
+        self._indexed = False
+        self.synced_at = None
+        self.lookups = 0
+        self.false_positives = 0
+        self._stop_syncing = threading.Event()
+        self._syncer = None
+
+    def ensure_indexes(self) -> None:
+        """
+        Creates the TTL index removing tokens once they expire, and the index tokens are looked up by.
+
+        :raises PyMongoError: If the indexes can't be created.
+        """
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("token")
+        self._indexed = True
+
+    def revoke(self, token: str, expires_at: Union[int, float, None]) -> None:
+        """
+        Stores a token so it can no longer be used, until it expires.
+
+        :param token: Encoded JWT.
+        :param expires_at: Unix time the token expires, None if it never does so it is kept forever.
+        :raises PyMongoError: If the token can't be stored.
+        """
+        document = {"token": token}
+        if expires_at is not None:
+            document["expires_at"] = datetime.datetime.fromtimestamp(expires_at, tz=datetime.timezone.utc)
+        self.collection.insert_one(document)
+
+        with self._lock:
+            self._local_revocations.append((time.time(), token))
+            if self._filter is not None:
+                self._filter.add(token)
+
+    def is_blacklisted(self, token: str) -> bool:
+        """
+        Checks if a token has been revoked, only looking it up in the collection if the filter finds it.
+
+        :param token: Encoded JWT.
+        :return: True if the token has been revoked.
+        :raises PyMongoError: If the token has to be looked up and the collection can't be read.
+        """
+        bloom_filter = self._filter
+        if bloom_filter is not None and token not in bloom_filter:
+            return False
+
+        revoked = self.collection.find_one({"token": token}) is not None
+        with self._lock:
+            self.lookups += 1
+            if bloom_filter is not None and not revoked:
+                self.false_positives += 1
+        return revoked
+
+    def sync(self) -> int:
+        """
+        Rebuilds the filter from the tokens in the collection, dropping tokens the TTL index has removed.
+
+        :return: Number of tokens in the new filter.
+        :raises PyMongoError: If the collection can't be read.
+        """
+        if not self._indexed:
+            self.ensure_indexes()
+
+        started = time.time()
+        tokens = [document["token"] for document in self.collection.find({}, {"token": 1, "_id": 0})]
+        bloom_filter = BloomFilter(capacity=max(self.capacity, 2 * len(tokens)), error_rate=self.error_rate)
+        for token in tokens:
+            bloom_filter.add(token)
+
+        with self._lock:
+            # Tokens revoked here while the collection was being read may be missing from it
+            self._local_revocations = [(revoked_at, token) for revoked_at, token in self._local_revocations
+                                       if revoked_at >= started]
+            for _, token in self._local_revocations:
+                bloom_filter.add(token)
+            self._filter = bloom_filter
+            self.synced_at = time.time()
+        return bloom_filter.num_tokens
+
+    def start_syncing(self, interval: Union[int, float]) -> None:
+        """
+        Starts a background thread that syncs the filter straight away, then every interval.
+
+        :param interval: Seconds between syncs, which is how long a token revoked by another worker process can still
+                         be used here.
+        """
+        if self._syncer is not None:
+            return
+        self._stop_syncing.clear()
+        self._syncer = threading.Thread(target=self._sync_loop, args=(interval,), name="blacklist-sync", daemon=True)
+        self._syncer.start()
+
+    def stop_syncing(self) -> None:
+        """
+        Stops the background thread syncing the filter.
+        """
+        self._stop_syncing.set()
+        if self._syncer is not None:
+            self._syncer.join()
+            self._syncer = None
+
+    def _sync_loop(self, interval: Union[int, float]) -> None:
+        """
+        Syncs the filter every interval, keeping the last filter if the collection can't be read.
+        """
+        while True:
+            try:
+                self.sync()
+            except PyMongoError as e:
+                synced_at = self.synced_at
+                state = f"the filter is {time.time() - synced_at:.0f}s old" if synced_at is not None \
+                    else "every token is looked up until it is"
+                print(f"Token blacklist could not be synced, {state}: {e}")
+            if self._stop_syncing.wait(interval):
+                return
+
+    def stats(self) -> dict:
+        """
+        Reports the size of the filter and how often tokens were looked up in the collection.
+
+        :return: Dictionary of the tokens and bits in the filter, lookups, false positives and when it was synced.
+        """
+        with self._lock:
+            bloom_filter = self._filter
+            return {"tokens": bloom_filter.num_tokens if bloom_filter is not None else None,
+                    "bits": bloom_filter.num_bits if bloom_filter is not None else None,
+                    "lookups": self.lookups, "false_positives": self.false_positives, "synced_at": self.synced_at}
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable
+
+# Bumped whenever the layout of the cache file changes so old caches are thrown away
+PAGE_CACHE_FORMAT = 3
+
+
+def get_page_cache_path(excel_file: str) -> str:
+    """
+    Works out where the cache of scraped pages is kept, next to the Excel catalog the scraper writes.
+
+    :param excel_file: File path of the Excel catalog.
+    :return: File path of the page cache.
+    """
+    directory, filename = os.path.split(excel_file)
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}.pages.json")
+
+
+class FetchedPage:
+    __slots__ = ('url', 'text', 'content_hash', 'content_bytes', 'validators')
+
+    def __init__(self, url: str, text: str, content_hash: str, content_bytes: int, validators: dict):
+        """
+        Initialises a page that was downloaded because it changed, or wasn't cached, and still has to be scraped.
+
+        :param url: URL of the page.
+        :param text: HTML content of the page.
+        :param content_hash: Hex digest of the SHA-256 hash of the page.
+        :param content_bytes: Size of the page in bytes.
+        :param validators: Dictionary of the page's ETag and Last-Modified.
+        """
+        self.url = url
+        self.text = text
+        self.content_hash = content_hash
+        self.content_bytes = content_bytes
+        self.validators = validators
+
+
+class PageCache:
+
+    def __init__(self, cache_file: str):
+        """
+        Initialises an on-disk cache of the pages the scraper fetched and the parts scraped from them.
+
+        Each URL keeps the ETag and Last-Modified validators the server sent, a hash of the page and the parts that
+        were scraped from it. Pages are fetched with conditional requests, and a page the server says is unchanged,
+        or whose content hashes the same as before, reuses its parts without being parsed again.
+
+        :param cache_file: File path of the cache, an unreadable or missing cache starts empty.
+        """
+        self.cache_file = cache_file
+        self._pages = self._read()
+        self._lock = threading.Lock()
+
+        self.pages_parsed = 0
+        self.pages_not_modified = 0
+        self.pages_unchanged = 0
+        self.pages_stale = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.parse_seconds = 0.0
+        self.parse_seconds_saved = 0.0
+
+    def _read(self) -> dict:
+        """
+        Reads the cached pages from the cache file.
+        """
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Page cache could not be read from '{self.cache_file}': {e}")
+            return {}
+        if not isinstance(cache, dict) or cache.get("format") != PAGE_CACHE_FORMAT:
+            return {}
+        return cache.get("pages", {})
+
+    def __len__(self):
+        return len(self._pages)
+
+    def conditional_headers(self, url: str) -> dict:
+        """
+        Builds the headers asking the server to only send a page if it changed since it was cached.
+
+        :param url: URL of the page.
+        :return: Dictionary of If-None-Match and If-Modified-Since headers, empty if the page isn't cached.
+        """
+        page = self._pages.get(url)
+        if page is None:
+            return {}
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    def fetch_page(self, fetcher, url: str) -> tuple:
+        """
+        Fetches a page unless it hasn't changed since it was cached.
+
+        :param fetcher: PageFetcher used to send the request.
+        :param url: URL of the page.
+        :return: Tuple of (what was scraped from the page last time, None) if the page hasn't changed, otherwise
+                 (None, FetchedPage) for the page to be scraped and stored.
+        :raises requests.exceptions.RequestException: If the request fails or gets an error status.
+        """
+        cached = self._pages.get(url)
+        response = fetcher.get(url, headers=self.conditional_headers(url))
+
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.pages_not_modified += 1
+                self.bytes_saved += cached["content_bytes"]
+                self.parse_seconds_saved += cached["parse_seconds"]
+            return cached["parts"], None
+
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            self.bytes_downloaded += len(content)
+
+        if cached is not None and cached["content_hash"] == content_hash:
+            # The server doesn't support conditional requests for this page, but its content is the same
+            with self._lock:
+                self.pages_unchanged += 1
+                self.parse_seconds_saved += cached["parse_seconds"]
+                self._pages[url] = {**cached, **self._validators(response)}
+            return cached["parts"], None
+
+        return None, FetchedPage(url=url, text=response.text, content_hash=content_hash,
+                                 content_bytes=len(content), validators=self._validators(response))
+
+    def store(self, page: 'FetchedPage', parts, parse_seconds: float) -> None:
+        """
+        Caches what was scraped from a fetched page.
+
+        :param page: FetchedPage returned by fetch_page.
+        :param parts: What was scraped from the page, it has to be JSON serialisable.
+        :param parse_seconds: Seconds it took to scrape the page.
+        """
+        with self._lock:
+            self.pages_parsed += 1
+            self.parse_seconds += parse_seconds
+            self._pages[page.url] = {**page.validators, "content_hash": page.content_hash,
+                                     "content_bytes": page.content_bytes, "parse_seconds": parse_seconds,
+                                     "parts": parts}
+
+    def last_scraped(self, url: str):
+        """
+        Fetches what was scraped from a page the last time it was fetched, for a page that can't be fetched now.
+
+        :param url: URL of the page.
+        :return: What was scraped from the page, or None if the page has never been fetched.
+        """
+        cached = self._pages.get(url)
+        if cached is None:
+            return None
+        with self._lock:
+            self.pages_stale += 1
+        return cached["parts"]
+
+    def fetch_parts(self, fetcher, url: str, parse: Callable[[str], dict]) -> dict:
+        """
+        Fetches a page and scrapes its parts, reusing the parts scraped last time if the page hasn't changed.
+
+        :param fetcher: PageFetcher used to send the request.
+        :param url: URL of the page.
+        :param parse: Function scraping the parts out of the page's HTML content, what it returns is cached so has to
+                      be JSON serialisable.
+        :return: What parse scraped from the page.
+        :raises requests.exceptions.RequestException: If the request fails or gets an error status.
+        """
+        parts, page = self.fetch_page(fetcher, url)
+        if page is None:
+            return parts
+
+        start = time.perf_counter()
+        parts = parse(page.text)
+        self.store(page, parts, parse_seconds=time.perf_counter() - start)
+        return parts
+
+    @staticmethod
+    def _validators(response) -> dict:
+        """
+        Reads the validators a server sent with a page.
+        """
+        return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+    def save(self) -> None:
+        """
+        Writes the cache to its file, writing to a temporary file first so a partly written cache is never read.
+
+        :raises OSError: If the cache can't be written.
+        """
+        with self._lock:
+            cache = {"format": PAGE_CACHE_FORMAT, "pages": self._pages}
+            directory = os.path.dirname(self.cache_file) or '.'
+            file_descriptor, temp_file = tempfile.mkstemp(dir=directory, suffix='.json.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+                    json.dump(cache, file, ensure_ascii=False)
+                os.chmod(temp_file, 0o644)
+                os.replace(temp_file, self.cache_file)
+            except OSError:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                raise
+
+    def stats(self) -> dict:
+        """
+        Fetches what the cache saved during this run.
+
+        :return: Dictionary of the number of pages parsed, not modified, unchanged and reused after failing, bytes
+                 downloaded and saved, and seconds spent and saved parsing.
+        """
+        with self._lock:
+            return {
+                "pages_parsed": self.pages_parsed,
+                "pages_not_modified": self.pages_not_modified,
+                "pages_unchanged": self.pages_unchanged,
+                "pages_stale": self.pages_stale,
+                "bytes_downloaded": self.bytes_downloaded,
+                "bytes_saved": self.bytes_saved,
+                "parse_seconds": round(self.parse_seconds, 4),
+                "parse_seconds_saved": round(self.parse_seconds_saved, 4)
+            }
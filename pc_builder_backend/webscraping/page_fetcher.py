@@ -0,0 +1,362 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pc_builder_backend.constants import SCRAPER_MAX_WORKERS, SCRAPER_MAX_PER_HOST, SCRAPER_TIMEOUT, \
+    SCRAPER_RATE_PER_HOST, SCRAPER_BURST_PER_HOST, SCRAPER_MAX_RETRIES, SCRAPER_BACKOFF_BASE, SCRAPER_BACKOFF_MAX, \
+    SCRAPER_RETRY_ROUNDS
+
+# Statuses of a site rate limiting the scraper or briefly failing, requests that get them are sent again
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Errors of a request that never got a response, also sent again
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class TokenBucket:
+
+    def __init__(self, rate: Union[int, float], burst: int):
+        """
+        Initialises a token bucket limiting how often something happens.
+
+        The bucket starts full with burst tokens and refills at rate tokens a second. Each acquire takes a token,
+        waiting for one to refill if the bucket is empty.
+
+        :param rate: Tokens added a second, the average rate allowed.
+        :param burst: Most tokens the bucket holds, the most allowed back to back.
+        :raises ValueError: If the rate or burst isn't positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        if burst <= 0:
+            raise ValueError("burst must be positive.")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token from the bucket, waiting until one is available.
+
+        The token is reserved before waiting, so callers waiting at the same time are let through one after another
+        at the bucket's rate.
+
+        :return: Seconds spent waiting for the token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FetchStatus:
+    __slots__ = ('url', 'status_code', 'attempts', 'error')
+
+    def __init__(self, url: str, status_code: Union[int, None], attempts: int, error: Union[str, None]):
+        """
+        Initialises the outcome of fetching a page.
+
+        :param url: URL of the page.
+        :param status_code: HTTP status of the last response, None if no response was received.
+        :param attempts: Number of requests sent for the page.
+        :param error: Why the page couldn't be fetched, None if it was fetched.
+        """
+        self.url = url
+        self.status_code = status_code
+        self.attempts = attempts
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def retryable(self) -> bool:
+        """
+        Whether the page failed in a way that fetching it again later may fix.
+        """
+        return not self.ok and (self.status_code is None or self.status_code in RETRY_STATUSES)
+
+    def to_dict(self) -> dict:
+        return {"url": self.url, "status_code": self.status_code, "attempts": self.attempts, "error": self.error}
+
+    def __repr__(self):
+        return f"FetchStatus: {self.url} - {self.status_code} - {self.attempts} attempts"
+
+
+def parse_retry_after(response: requests.Response) -> Union[float, None]:
+    """
+    Reads how long a site asked to be left before the next request, from a Retry-After header given in seconds.
+
+    :param response: Response of the site.
+    :return: Seconds to wait, or None if the site didn't ask or gave a date.
+    """
+    retry_after = response.headers.get("Retry-After", "")
+    return float(retry_after) if retry_after.strip().isdigit() else None
+
+
+class PageFetcher:
+
+    def __init__(self, max_workers: int = SCRAPER_MAX_WORKERS, max_per_host: int = SCRAPER_MAX_PER_HOST,
+                 timeout: Union[int, float] = SCRAPER_TIMEOUT, session: requests.Session = None,
+                 rate_per_host: Union[int, float, None] = SCRAPER_RATE_PER_HOST,
+                 burst_per_host: int = SCRAPER_BURST_PER_HOST, max_retries: int = SCRAPER_MAX_RETRIES,
+                 backoff_base: Union[int, float] = SCRAPER_BACKOFF_BASE,
+                 backoff_max: Union[int, float] = SCRAPER_BACKOFF_MAX, retry_rounds: int = SCRAPER_RETRY_ROUNDS):
+        """
+        Initialises a fetcher that downloads pages concurrently over one pooled HTTP session.
+
+        Connections are kept alive and reused between pages, and no more than max_per_host requests are sent to the
+        same host at once so the site being scraped isn't flooded. Requests to each host are also held to
+        rate_per_host a second by a token bucket.
+
+        A request that is rate limited, gets a server error or loses its connection is sent again after backing
+        off for a random time of up to backoff_base seconds, doubling with each retry up to backoff_max, or for as
+        long as the site's Retry-After asks. Pages that still fail are fetched again in retry rounds once every other
+        page is done, without fetching the pages that succeeded again. The outcome of every page is kept in statuses.
+
+        :param max_workers: Most pages fetched at once across every host.
+        :param max_per_host: Most pages fetched at once from a single host.
+        :param timeout: Seconds to wait for a page before giving up on it.
+        :param session: Session to send the requests with, a new one is created if not provided.
+        :param rate_per_host: Requests a second sent to a single host on average, unlimited if None.
+        :param burst_per_host: Requests sent to a single host back to back before the rate applies.
+        :param max_retries: Times a request is sent again before the page fails.
+        :param backoff_base: Most seconds waited before the first retry.
+        :param backoff_max: Most seconds waited before any retry.
+        :param retry_rounds: Times the pages that failed are fetched again after the others.
+        :raises ValueError: If either limit, the rate or the burst isn't positive, or the retries are negative.
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive.")
+        if max_per_host <= 0:
+            raise ValueError("max_per_host must be positive.")
+        if rate_per_host is not None and rate_per_host <= 0:
+            raise ValueError("rate_per_host must be positive.")
+        if burst_per_host <= 0:
+            raise ValueError("burst_per_host must be positive.")
+        if max_retries < 0 or retry_rounds < 0:
+            raise ValueError("max_retries and retry_rounds can't be negative.")
+
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_rounds = retry_rounds
+
+        self.session = session if session is not None else requests.Session()
+        # Keeps one idle connection for every request that may be in flight to a host, so none are thrown away
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_limits = {}
+        self._host_buckets = {}
+        self._host_limits_lock = threading.Lock()
+
+        # Outcome of the last fetch of each page, and totals across every page
+        self.statuses = {}
+        self._stats = {"requests": 0, "retries": 0, "pages_retried": 0, "rate_limited_seconds": 0.0,
+                       "backoff_seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the session and its pooled connections.
+        """
+        self.session.close()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        """
+        Fetches the semaphore limiting the requests in flight to the host of a URL.
+        """
+        host = urlsplit(url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def _host_bucket(self, url: str) -> Union[TokenBucket, None]:
+        """
+        Fetches the token bucket limiting the rate of requests to the host of a URL, None if the rate is unlimited.
+        """
+        if self.rate_per_host is None:
+            return None
+        host = urlsplit(url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_buckets:
+                self._host_buckets[host] = TokenBucket(rate=self.rate_per_host, burst=self.burst_per_host)
+            return self._host_buckets[host]
+
+    def backoff_delay(self, retry: int, retry_after: Union[float, None] = None) -> float:
+        """
+        Works out how long to wait before a retry, a random time up to an exponentially growing limit so retries
+        from many pages don't all arrive at once.
+
+        :param retry: Number of the retry, starting from 1.
+        :param retry_after: Seconds the site asked to wait for, if it did.
+        :return: Seconds to wait, no more than backoff_max.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (retry - 1)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.backoff_max)
+
+    def _add_stats(self, **amounts) -> None:
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                self._stats[name] += amount
+
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        Sends a GET request for a page, retrying it if it is rate limited, gets a server error or loses its
+        connection.
+
+        Each request waits for a token for its host and then a free slot for it. The outcome is kept in statuses.
+
+        :param url: URL of the page.
+        :param headers: Extra headers to send with the request.
+        :return: The response, which may be a 304 if conditional headers were sent.
+        :raises requests.exceptions.RequestException: If the last request fails or gets an error status.
+        """
+        bucket = self._host_bucket(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            rate_limited_seconds = bucket.acquire() if bucket is not None else 0.0
+            self._add_stats(requests=1, rate_limited_seconds=rate_limited_seconds)
+
+            response, retry_after = None, None
+            try:
+                with self._host_limit(url):
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                retryable = isinstance(e, RETRY_ERRORS) or (response is not None and
+                                                            response.status_code in RETRY_STATUSES)
+                if not retryable or attempt > self.max_retries:
+                    self.statuses[url] = FetchStatus(url=url, status_code=getattr(response, 'status_code', None),
+                                                     attempts=attempt, error=str(e))
+                    raise
+                retry_after = parse_retry_after(response) if response is not None else None
+            else:
+                self.statuses[url] = FetchStatus(url=url, status_code=response.status_code, attempts=attempt,
+                                                 error=None)
+                return response
+
+            delay = self.backoff_delay(attempt, retry_after)
+            self._add_stats(retries=1, pages_retried=int(attempt == 1), backoff_seconds=delay)
+            time.sleep(delay)
+
+    def fetch(self, url: str) -> str:
+        """
+        Fetches the HTML content of a page.
+
+        :param url: URL of the page.
+        :return: HTML content of the page.
+        :raises requests.exceptions.RequestException: If the request fails or gets an error status.
+        """
+        return self.get(url).text
+
+    def fetch_all(self, urls: list, fetch: Callable[[str], object] = None) -> list:
+        """
+        Fetches many pages concurrently.
+
+        :param urls: List of page URLs.
+        :param fetch: Function fetching a single URL, fetch is used if not provided.
+        :return: List of what was fetched for each page in the order of the URLs, None for pages that couldn't be
+                 fetched.
+        """
+        if not urls:
+            return []
+        fetch = fetch if fetch is not None else self.fetch
+        results = [None] * len(urls)
+        failed = set()
+
+        def fetch_or_none(position: int):
+            # Prints the error and gives None for a page that can't be fetched so the other pages carry on
+            try:
+                results[position] = fetch(urls[position])
+                failed.discard(position)
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching HTML content from {urls[position]}: {e}")
+                failed.add(position)
+
+        positions = range(len(urls))
+        for retry_round in range(self.retry_rounds + 1):
+            if retry_round > 0:
+                # Only the pages that failed in a way that may pass later are fetched again
+                positions = sorted(position for position in failed if self._is_retryable(urls[position]))
+                if not positions:
+                    break
+                print(f"Fetching {len(positions)} failed pages again")
+                time.sleep(self.backoff_delay(self.max_retries + retry_round))
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(positions))) as executor:
+                list(executor.map(fetch_or_none, positions))
+
+        return results
+
+    def _is_retryable(self, url: str) -> bool:
+        """
+        Checks if a page that failed may be fetched if tried again, pages that failed before a request was sent
+        aren't.
+        """
+        status = self.statuses.get(url)
+        return status is not None and status.retryable
+
+    def failed_pages(self) -> list:
+        """
+        Lists the pages that couldn't be fetched.
+
+        :return: List of the FetchStatus of each failed page.
+        """
+        return [status for status in self.statuses.values() if not status.ok]
+
+    def stats(self) -> dict:
+        """
+        Reports the requests sent for every page fetched so far.
+
+        :return: Dictionary of the number of requests, retries, pages retried, pages fetched and failed, and the
+                 seconds spent waiting on the rate limit and backing off.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pages_fetched"] = sum(status.ok for status in self.statuses.values())
+        stats["pages_failed"] = len(self.statuses) - stats["pages_fetched"]
+        return stats
+
+    def fetch_categories(self, category_urls: dict, fetch: Callable[[str], object] = None) -> dict:
+        """
+        Fetches the pages of every category together, so one slow category doesn't hold up the others.
+
+        :param category_urls: Dictionary mapping part types to the list of their page URLs.
+        :param fetch: Function fetching a single URL, fetch is used if not provided.
+        :return: Dictionary mapping part types to what was fetched for each of their pages, in the order of their
+                 URLs.
+        """
+        urls = [url for url_list in category_urls.values() for url in url_list]
+        pages = iter(self.fetch_all(urls, fetch=fetch))
+        return {part_type: [next(pages) for _ in url_list] for part_type, url_list in category_urls.items()}
@@ -1,258 +1,267 @@
-import requests
-from bs4 import BeautifulSoup
-from pc_builder_backend.excel_methods.excel_helper_methods import create_data_frame, combine_dataframes, write_excel_data
+import pandas as pd
+from typing import Iterator, Union
+from urllib.parse import urlsplit
+from pc_builder_backend.constants import SCRAPER_MAX_PAGES, SCRAPER_PARSE_WORKERS, PRICE_HISTORY_MAX_SEGMENTS, \
+    EXPORT_CATALOG_XLSX, CATALOG_MIN_KEPT_FRACTION
+from pc_builder_backend.excel_methods.catalog_diff import CatalogDiff, diff_catalogs
+from pc_builder_backend.excel_methods.catalog_loader import load_catalog, find_catalog_file, get_catalog_path, \
+    write_catalog
+from pc_builder_backend.excel_methods.excel_helper_methods import create_catalog_data_frame, write_excel_data
+from pc_builder_backend.excel_methods.price_history import PriceHistoryStore, get_history_dir
+from pc_builder_backend.webscraping.page_cache import PageCache, get_page_cache_path
+from pc_builder_backend.webscraping.page_fetcher import PageFetcher
+from pc_builder_backend.webscraping.part_parsers import get_parser_backend
+from pc_builder_backend.webscraping.scrape_categories import SCRAPE_CATEGORIES
+from pc_builder_backend.webscraping.scrape_pipeline import ScrapePipeline
 import os
 
 
-def scrape_part_data(html_content):
+def scrape_part_data(html_content, parser: str = None):
     """
     Extracts part information from HTML content and returns a dictionary.
 
     :param html_content: HTML content to be scraped.
+    :param parser: Name of the parser backend in PARSER_BACKENDS, DEFAULT_PARSER_BACKEND if not provided.
     :return: Dictionary containing part names as keys and their prices as values.
     """
+    return scrape_first_page(html_content, parser=parser)["parts"]
+
+
+def scrape_first_page(html_content, parser: str = None) -> dict:
+    """
+    Extracts part information and the number of pages in the category from the first page of a category.
+
+    :param html_content: HTML content to be scraped.
+    :param parser: Name of the parser backend in PARSER_BACKENDS, DEFAULT_PARSER_BACKEND if not provided.
+    :return: Dictionary containing the page's parts under 'parts' and the number of pages under 'num_pages'.
+    """
+    parse = get_parser_backend(parser)
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        products = soup.find_all('div', class_='card-horizontal')
+        part_info, num_pages = parse(html_content)
     except Exception as e:
         print(f"Error parsing HTML content: {e}")
-        return {}
+        return {"parts": {}, "num_pages": 1}
 
-    part_info = {}
-    for product in products:
-        try:
-            name = product.find('div', class_='title').text.strip()
-            price_elem = product.find('div', class_='price in-stock')
-            if price_elem:
-                price = price_elem.text.strip()
-            else:
-                price = 'Price not available'
-            part_info[name] = price
-        except (AttributeError, TypeError) as e:
-            print(f"Error extracting part information: {e}")
-            continue
-
-    return part_info
+    return {"parts": part_info, "num_pages": num_pages}
 
 
-def fetch_html_content(url):
+def normalise_price(price: str) -> Union[float, None]:
     """
-    Fetches HTML content from the given URL.
+    Converts a scraped price such as '£1,049.99' to pounds.
 
-    :param url: URL to fetch HTML content from.
-    :return: HTML content if successful.
-    :raises Exception: If the request fails.
+    :param price: Price text of a part.
+    :return: The price, or None if the part has no price.
     """
-    response = requests.get(url)
-    response.raise_for_status()  # Raise an exception if the request was unsuccessful
-    return response.text
+    try:
+        return float(price[1:].replace(',', ''))
+    except ValueError:
+        return None
 
 
-def main():
+def scrape_page_rows(html_content) -> dict:
+    """
+    Extracts the priced parts and the number of pages in the category from a page, run by the parse workers.
 
-    # Fetch all the urls for the parts
-    # CPU
-    cpu_storage_dict = {}
-    cpu_url_list = [
-        "https://pcparts.uk/browse/cpus",
-        "https://pcparts.uk/browse/cpus?page=2",
-        "https://pcparts.uk/browse/cpus?page=3"
-    ]
-
-    # GPU
-    gpu_storage_dict = {}
-    gpu_url_list = [
-        "https://pcparts.uk/browse/graphics-cards",
-        "https://pcparts.uk/browse/graphics-cards?page=2",
-        "https://pcparts.uk/browse/graphics-cards?page=3"
-    ]
-
-    # RAM
-    ram_storage_dict = {}
-    ram_url_list = [
-        "https://pcparts.uk/browse/memory",
-        "https://pcparts.uk/browse/memory?page=2",
-        "https://pcparts.uk/browse/memory?page=3"
-    ]
-
-    # SSD
-    ssd_storage_dict = {}
-    ssd_url_list = [
-        "https://pcparts.uk/browse/solid-state-drives",
-        "https://pcparts.uk/browse/solid-state-drives?page=2",
-        "https://pcparts.uk/browse/solid-state-drives?page=3"
-    ]
-
-    # HDD
-    hdd_storage_dict = {}
-    hdd_url_list = [
-        "https://pcparts.uk/browse/hard-drives",
-        "https://pcparts.uk/browse/hard-drives?page=2",
-        "https://pcparts.uk/browse/hard-drives?page=3"
-    ]
-
-    # Motherboard
-    motherboard_storage_dict = {}
-    motherboard_url_list = [
-        "https://pcparts.uk/browse/motherboards",
-        "https://pcparts.uk/browse/motherboards?page=2",
-        "https://pcparts.uk/browse/motherboards?page=3"
-    ]
-
-    # Power Supply
-    power_supply_storage_dict = {}
-    power_supply_url_list = [
-        "https://pcparts.uk/browse/power-supplies",
-        "https://pcparts.uk/browse/power-supplies?page=2",
-        "https://pcparts.uk/browse/power-supplies?page=3"
-    ]
-
-    # Case
-    case_storage_dict = {}
-    case_url_list = [
-        "https://pcparts.uk/browse/cases",
-        "https://pcparts.uk/browse/cases?page=2",
-        "https://pcparts.uk/browse/cases?page=3"
-    ]
+    :param html_content: HTML content to be scraped.
+    :return: Dictionary containing a list of [name, price] for each priced part under 'rows' and the number of
+             pages under 'num_pages'.
+    """
+    page = scrape_first_page(html_content)
+    rows = []
+    for name, price in page["parts"].items():
+        price = normalise_price(price)
+        if price is not None:
+            rows.append([name, price])
+    return {"rows": rows, "num_pages": page["num_pages"]}
 
-    try:
-        for url in cpu_url_list:
-            html_data = fetch_html_content(url)
-
-            if html_data:
-                cpu_data = scrape_part_data(html_content=html_data)
-
-                if cpu_data:
-                    cpu_storage_dict.update(cpu_data)
-                else:
-                    print("NO CPU DATA FOUND")
-            else:
-                print("URL ISN'T VALID + ", url)
-
-        for url in gpu_url_list:
-            html_data = fetch_html_content(url)
-
-            if html_data:
-                gpu_data = scrape_part_data(html_content=html_data)
-
-                if gpu_data:
-                    gpu_storage_dict.update(gpu_data)
-                else:
-                    print("NO CPU DATA FOUND")
-            else:
-                print("URL ISN'T VALID + ", url)
-
-        for url in ram_url_list:
-            html_data = fetch_html_content(url)
-
-            if html_data:
-                ram_data = scrape_part_data(html_content=html_data)
-
-                if ram_data:
-                    ram_storage_dict.update(ram_data)
-                else:
-                    print("NO CPU DATA FOUND")
-            else:
-                print("URL ISN'T VALID + ", url)
-
-        # Loop for scraping data from HDD URLs
-        for url in hdd_url_list:
-            html_data = fetch_html_content(url)
-
-            if html_data:
-                hdd_data = scrape_part_data(html_content=html_data)
-
-                if hdd_data:
-                    hdd_storage_dict.update(hdd_data)
-                else:
-                    print("NO HDD DATA FOUND")
-            else:
-                print("URL ISN'T VALID: ", url)
 
-        # Loop for scraping data from SSD URLs
-        for url in ssd_url_list:
-            html_data = fetch_html_content(url)
+def get_page_url(url: str, page: int) -> str:
+    """
+    Builds the URL of a page of a category.
 
-            if html_data:
-                ssd_data = scrape_part_data(html_content=html_data)
+    :param url: URL of the first page of the category.
+    :param page: Number of the page, starting from 1.
+    :return: URL of the page.
+    """
+    if page == 1:
+        return url
+    return f"{url}{'&' if urlsplit(url).query else '?'}page={page}"
 
-                if ssd_data:
-                    ssd_storage_dict.update(ssd_data)
-                else:
-                    print("NO SSD DATA FOUND")
-            else:
-                print("URL ISN'T VALID: ", url)
 
-        # Loop for scraping data from Motherboard URLs
-        for url in motherboard_url_list:
-            html_data = fetch_html_content(url)
+def scrape_or_reuse(pipeline: ScrapePipeline, page_cache: PageCache, urls: list) -> list:
+    """
+    Scrapes pages, reusing what was scraped from a page last run if it can't be fetched now, so a page that fails
+    keeps its parts in the catalog rather than having them removed.
+
+    :param pipeline: ScrapePipeline the pages are scraped with.
+    :param page_cache: PageCache the pipeline stores the pages in.
+    :param urls: List of page URLs.
+    :return: List of what was scraped from each page in the order of the URLs, None for pages that couldn't be
+             scraped and have never been scraped before.
+    """
+    pages = pipeline.scrape_all(urls)
+    for position, (url, page) in enumerate(zip(urls, pages)):
+        if page is None:
+            pages[position] = page_cache.last_scraped(url)
+            if pages[position] is not None:
+                print(f"Reusing the parts scraped last run from {url}")
+    return pages
 
-            if html_data:
-                motherboard_data = scrape_part_data(html_content=html_data)
 
-                if motherboard_data:
-                    motherboard_storage_dict.update(motherboard_data)
-                else:
-                    print("NO MOTHERBOARD DATA FOUND")
-            else:
-                print("URL ISN'T VALID: ", url)
+def scrape_categories(fetcher: PageFetcher, categories, page_cache: PageCache, max_pages: int = SCRAPER_MAX_PAGES,
+                      parse_workers: int = SCRAPER_PARSE_WORKERS) -> list:
+    """
+    Scrapes every page of each category.
+
+    The first pages of every category are scraped together and their pagination gives the number of pages in each
+    category, then the remaining pages of every category are scraped together. Pages are fetched on threads and
+    scraped in parse_workers processes.
+
+    :param fetcher: PageFetcher used to send the requests.
+    :param categories: Sequence of ScrapeCategory to scrape.
+    :param page_cache: PageCache of the pages scraped before, unchanged pages reuse what was scraped from them.
+    :param max_pages: Most pages fetched from a single category, in case its pagination can't be trusted.
+    :param parse_workers: Number of worker processes scraping pages.
+    :return: List with an entry for each category of a list of (url, rows) for each of its pages in order, where
+             rows is a list of [name, price] or None for a page that couldn't be scraped.
+    """
+    pipeline = ScrapePipeline(fetcher, page_cache, parse=scrape_page_rows, parse_workers=parse_workers)
+    first_pages = scrape_or_reuse(pipeline, page_cache, [category.url for category in categories])
 
-        # Loop for scraping data from Power Supply URLs
-        for url in power_supply_url_list:
-            html_data = fetch_html_content(url)
+    category_urls = []
+    for category, first_page in zip(categories, first_pages):
+        num_pages = first_page["num_pages"] if first_page is not None else 1
+        if num_pages > max_pages:
+            print(f"{category.part_type} lists {num_pages} pages, only the first {max_pages} are scraped")
+            num_pages = max_pages
+        category_urls.append([get_page_url(category.url, page) for page in range(2, num_pages + 1)])
 
-            if html_data:
-                power_supply_data = scrape_part_data(html_content=html_data)
+    other_pages = iter(scrape_or_reuse(pipeline, page_cache, [url for urls in category_urls for url in urls]))
 
-                if power_supply_data:
-                    power_supply_storage_dict.update(power_supply_data)
-                else:
-                    print("NO POWER SUPPLY DATA FOUND")
-            else:
-                print("URL ISN'T VALID: ", url)
+    category_pages = []
+    for category, first_page, urls in zip(categories, first_pages, category_urls):
+        pages = [(category.url, first_page)] + [(url, next(other_pages)) for url in urls]
+        category_pages.append([(url, page["rows"] if page is not None else None) for url, page in pages])
+    return category_pages
 
-        # Loop for scraping data from Case URLs
-        for url in case_url_list:
-            html_data = fetch_html_content(url)
 
-            if html_data:
-                case_data = scrape_part_data(html_content=html_data)
+def iter_part_rows(categories, category_pages: list) -> Iterator[tuple]:
+    """
+    Streams the parts scraped from every page as catalog rows, reporting pages that had no parts.
 
-                if case_data:
-                    case_storage_dict.update(case_data)
-                else:
-                    print("NO CASE DATA FOUND")
-            else:
+    :param categories: Sequence of ScrapeCategory that were scraped.
+    :param category_pages: Pages of each category returned by scrape_categories.
+    :return: Generator of (type, name, price) for each part, in the order of the categories and their pages.
+    """
+    for category, pages in zip(categories, category_pages):
+        for url, rows in pages:
+            if rows is None:
                 print("URL ISN'T VALID: ", url)
+            elif not rows:
+                print(f"NO {category.part_type.upper()} DATA FOUND")
+            for name, price in rows or ():
+                yield category.part_type, name, price
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching HTML content: {e}")
 
-    cpu_df = create_data_frame(part_type="CPU", part_dict=cpu_storage_dict)
+def load_previous_catalog(excel_file: str) -> pd.DataFrame:
+    """
+    Loads the catalog written by the last scraper run, from its columnar file or, before one was written, from the
+    Excel catalog.
 
-    gpu_df = create_data_frame(part_type="GPU", part_dict=gpu_storage_dict)
+    :param excel_file: File path of the Excel catalog.
+    :return: DataFrame containing 'Type', 'Name' and 'Price' columns, empty if the catalog hasn't been written yet.
+    """
+    catalog_file = find_catalog_file(excel_file)
+    if not os.path.exists(catalog_file):
+        return pd.DataFrame(columns=['Type', 'Name', 'Price'])
+    return load_catalog(catalog_file)
 
-    ram_df = create_data_frame(part_type="RAM", part_dict=ram_storage_dict)
 
-    hdd_df = create_data_frame(part_type="HDD", part_dict=hdd_storage_dict)
+def is_catalog_complete(previous: pd.DataFrame, current: pd.DataFrame,
+                        min_kept_fraction: float = CATALOG_MIN_KEPT_FRACTION) -> bool:
+    """
+    Checks a scraped catalog looks complete enough to replace the last one, so a run where most pages failed doesn't
+    empty the catalog or record every part it missed as removed.
 
-    ssd_df = create_data_frame(part_type="SSD", part_dict=ssd_storage_dict)
+    :param previous: DataFrame of the catalog written by the last run, empty if there wasn't one.
+    :param current: DataFrame of the catalog scraped this run.
+    :param min_kept_fraction: Smallest fraction of the last catalog's parts the new catalog must list.
+    :return: True if the new catalog has parts and at least min_kept_fraction as many as the last one.
+    """
+    if current.empty:
+        return False
+    return len(current) >= len(previous) * min_kept_fraction
 
-    motherboard_df = create_data_frame(part_type="Motherboard", part_dict=motherboard_storage_dict)
 
-    psu_df = create_data_frame(part_type="Power Supply", part_dict=power_supply_storage_dict)
+def record_price_history(price_history: PriceHistoryStore, diff: CatalogDiff,
+                         max_segments: int = PRICE_HISTORY_MAX_SEGMENTS) -> None:
+    """
+    Appends the changes of a scraper run to the price history, merging its segments once there are too many.
 
-    case_df = create_data_frame(part_type="Case", part_dict=case_storage_dict)
+    The history is kept alongside the catalog rather than being needed by it, so errors writing it are printed.
+
+    :param price_history: PriceHistoryStore the changes are appended to.
+    :param diff: CatalogDiff of the changes since the last run.
+    :param max_segments: Most segments the history is left with before they are merged.
+    """
+    try:
+        price_history.append(diff)
+        if len(price_history.segment_files()) > max_segments:
+            price_history.compact()
+    except OSError as e:
+        print(f"Price history could not be written to '{price_history.history_dir}': {e}")
 
-    complete_df = combine_dataframes(cpu_df, gpu_df, ram_df, hdd_df, ssd_df, motherboard_df, psu_df, case_df)
-    print(complete_df)
 
+def main():
     # Get the current directory of the script
     current_dir = os.path.dirname(os.path.realpath(__file__))
-    # Construct the path to the Excel file relative to the project root
+    # Construct the path to the Excel file relative to the project root, the columnar catalog is written next to it
     excel_file = os.path.abspath(os.path.join(current_dir, '../../parts/components.xlsx'))
+    catalog_file = get_catalog_path(excel_file)
+
+    # Pages unchanged since the last run are not downloaded or parsed again, their last scraped parts are reused
+    page_cache = PageCache(cache_file=get_page_cache_path(excel_file))
+
+    # Fetches every page concurrently over pooled connections and scrapes them in worker processes
+    with PageFetcher() as fetcher:
+        category_pages = scrape_categories(fetcher, SCRAPE_CATEGORIES, page_cache)
+    # Pages that failed after every retry are reported, the pages that were fetched are still written
+    print(f"Fetches: {fetcher.stats()}")
+    for status in fetcher.failed_pages():
+        print(f"Page could not be fetched: {status.to_dict()}")
 
-    write_excel_data(filepath=excel_file, dataframe=complete_df)
+    try:
+        page_cache.save()
+    except OSError as e:
+        print(f"Page cache could not be written to '{page_cache.cache_file}': {e}")
+    print(f"Page cache: {page_cache.stats()}")
+
+    complete_df = create_catalog_data_frame(part_rows=iter_part_rows(SCRAPE_CATEGORIES, category_pages))
+    print(complete_df)
+
+    previous_df = load_previous_catalog(excel_file)
+    if not is_catalog_complete(previous=previous_df, current=complete_df):
+        # Most pages failing would otherwise replace the catalog with what little was scraped
+        print(f"Scraped {len(complete_df)} parts against {len(previous_df)} last run, catalog not written")
+        return
+
+    # Only the parts that changed since the last run are recorded, the first run records every part's starting price
+    diff = diff_catalogs(previous=previous_df, current=complete_df)
+    print(f"Catalog changes: {diff.summary()}")
+    if not len(diff) and os.path.exists(catalog_file):
+        # Rewriting an unchanged catalog would only make the app reload it
+        print("Catalog unchanged, not rewritten")
+        return
+
+    # The app loads the columnar catalog, it is renamed into place so the app never reads a partly written catalog
+    write_catalog(catalog_file=catalog_file, dataframe=complete_df)
+    # Recorded once the catalog is written, as a failed write diffs against the old catalog again on the next run
+    record_price_history(PriceHistoryStore(history_dir=get_history_dir(excel_file)), diff)
+    if EXPORT_CATALOG_XLSX:
+        try:
+            write_excel_data(filepath=excel_file, dataframe=complete_df)
+        except OSError as e:
+            print(f"Catalog could not be exported to '{excel_file}': {e}")
 
 
 if __name__ == "__main__":
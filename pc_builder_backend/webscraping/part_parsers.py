@@ -0,0 +1,264 @@
+from html.parser import HTMLParser
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional, the standard library parsers are always available
+    lxml = None
+
+# Classes of the parts site's markup the scraper reads
+PRODUCT_CLASS = 'card-horizontal'
+NAME_CLASS = 'title'
+PRICE_CLASS = 'price in-stock'
+PAGINATION_CLASS = 'pagination'
+PRICE_NOT_AVAILABLE = 'Price not available'
+
+
+def page_count_from_links(links) -> int:
+    """
+    Works out the number of pages in a category from its pagination links.
+
+    The highest page linked to is used, whether it is given in the link's page query or its text, so pagination
+    that skips the middle pages (1 2 3 ... 12) still gives the last page.
+
+    :param links: Iterable of (href, text) of each pagination link.
+    :return: Number of pages in the category, at least 1.
+    """
+    page_numbers = [1]
+    for href, text in links:
+        page = parse_qs(urlsplit(href).query).get('page', [''])[0]
+        if page.isdigit():
+            page_numbers.append(int(page))
+        if text.isdigit():
+            page_numbers.append(int(text))
+    return max(page_numbers)
+
+
+def extract_part_info(soup) -> dict:
+    """
+    Extracts part information from a parsed page.
+
+    :param soup: BeautifulSoup of the page.
+    :return: Dictionary containing part names as keys and their prices as values.
+    """
+    part_info = {}
+    for product in soup.find_all('div', class_=PRODUCT_CLASS):
+        try:
+            name = product.find('div', class_=NAME_CLASS).text.strip()
+            price_elem = product.find('div', class_=PRICE_CLASS)
+            if price_elem:
+                price = price_elem.text.strip()
+            else:
+                price = PRICE_NOT_AVAILABLE
+            part_info[name] = price
+        except (AttributeError, TypeError) as e:
+            print(f"Error extracting part information: {e}")
+            continue
+
+    return part_info
+
+
+def find_page_count(soup) -> int:
+    """
+    Finds the number of pages in a category from the pagination links of one of its pages.
+
+    :param soup: BeautifulSoup of the page.
+    :return: Number of pages in the category, 1 if the page has no pagination.
+    """
+    pagination = soup.find(class_=PAGINATION_CLASS)
+    if pagination is None:
+        return 1
+    return page_count_from_links((link['href'], link.get_text(strip=True))
+                                 for link in pagination.find_all('a', href=True))
+
+
+def parse_with_soup(html_content: str) -> tuple:
+    """
+    Parses a page into a full BeautifulSoup tree with Python's built in HTML parser.
+
+    :param html_content: HTML content of the page.
+    :return: Tuple of (dictionary of part names to prices, number of pages in the category).
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    return extract_part_info(soup), find_page_count(soup)
+
+
+def _is_scraped_class(value) -> bool:
+    """
+    Checks if a class attribute, or one of its classes, marks a product card or the pagination.
+    """
+    return value is not None and not {PRODUCT_CLASS, PAGINATION_CLASS}.isdisjoint(value.split())
+
+
+def parse_with_strainer(html_content: str) -> tuple:
+    """
+    Parses a page with Python's built in HTML parser, only building the product cards and pagination into a tree.
+
+    :param html_content: HTML content of the page.
+    :return: Tuple of (dictionary of part names to prices, number of pages in the category).
+    """
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=SoupStrainer(class_=_is_scraped_class))
+    return extract_part_info(soup), find_page_count(soup)
+
+
+class ProductCardParser(HTMLParser):
+
+    def __init__(self):
+        """
+        Initialises a parser that reads the product cards and pagination links out of a page as it is parsed, without
+        building a tree of the page.
+
+        Reads the same parts as extract_part_info, the first name and in stock price div within each product card,
+        and the links of the first pagination element.
+        """
+        super().__init__(convert_charrefs=True)
+        self.part_info = {}
+        self.page_links = []
+
+        self._div_depth = 0
+        self._card_depth = None
+        self._name, self._name_depth = None, None
+        self._price, self._price_depth = None, None
+
+        self._pagination_tag, self._pagination_depth = None, 0
+        self._pagination_done = False
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+
+        if tag == 'div':
+            self._div_depth += 1
+            if self._card_depth is None:
+                if PRODUCT_CLASS in classes:
+                    self._card_depth = self._div_depth
+                    self._name, self._price = None, None
+            elif self._name is None and NAME_CLASS in classes:
+                self._name, self._name_depth = [], self._div_depth
+            elif self._price is None and ' '.join(classes) == PRICE_CLASS:
+                self._price, self._price_depth = [], self._div_depth
+
+        if self._pagination_tag is not None:
+            if tag == self._pagination_tag:
+                self._pagination_depth += 1
+            if tag == 'a' and attrs.get('href') is not None:
+                self._link = (attrs['href'], [])
+        elif not self._pagination_done and PAGINATION_CLASS in classes:
+            self._pagination_tag, self._pagination_depth = tag, 1
+
+    def handle_endtag(self, tag):
+        if tag == 'div' and self._div_depth > 0:
+            if self._div_depth == self._name_depth:
+                self._name_depth = None
+            if self._div_depth == self._price_depth:
+                self._price_depth = None
+            if self._div_depth == self._card_depth:
+                self._finish_card()
+            self._div_depth -= 1
+
+        if self._pagination_tag is not None:
+            if tag == 'a' and self._link is not None:
+                href, text = self._link
+                self.page_links.append((href, ''.join(part.strip() for part in text)))
+                self._link = None
+            if tag == self._pagination_tag:
+                self._pagination_depth -= 1
+                if self._pagination_depth == 0:
+                    self._pagination_tag, self._pagination_done = None, True
+
+    def handle_data(self, data):
+        if self._name_depth is not None:
+            self._name.append(data)
+        if self._price_depth is not None:
+            self._price.append(data)
+        if self._link is not None:
+            self._link[1].append(data)
+
+    def _finish_card(self):
+        """
+        Records the part of the product card that just ended.
+        """
+        self._card_depth, self._name_depth, self._price_depth = None, None, None
+        if self._name is None:
+            print("Error extracting part information: product has no name")
+            return
+        price = ''.join(self._price).strip() if self._price is not None else PRICE_NOT_AVAILABLE
+        self.part_info[''.join(self._name).strip()] = price
+
+
+def parse_with_events(html_content: str) -> tuple:
+    """
+    Parses a page with Python's built in HTML parser, reading the parts out as it goes rather than building a tree.
+
+    :param html_content: HTML content of the page.
+    :return: Tuple of (dictionary of part names to prices, number of pages in the category).
+    """
+    parser = ProductCardParser()
+    parser.feed(html_content)
+    parser.close()
+    return parser.part_info, page_count_from_links(parser.page_links)
+
+
+def _class_selector(class_name: str) -> str:
+    """
+    Builds an XPath condition matching elements that have a class.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def parse_with_lxml(html_content: str) -> tuple:
+    """
+    Parses a page with lxml's C HTML parser, selecting the product cards and pagination with XPath.
+
+    :param html_content: HTML content of the page.
+    :return: Tuple of (dictionary of part names to prices, number of pages in the category).
+    """
+    document = lxml.html.fromstring(html_content)
+
+    part_info = {}
+    for product in document.xpath(f"//div[{_class_selector(PRODUCT_CLASS)}]"):
+        names = product.xpath(f".//div[{_class_selector(NAME_CLASS)}]")
+        if not names:
+            print("Error extracting part information: product has no name")
+            continue
+        prices = product.xpath(f".//div[normalize-space(@class)='{PRICE_CLASS}']")
+        price = prices[0].text_content().strip() if prices else PRICE_NOT_AVAILABLE
+        part_info[names[0].text_content().strip()] = price
+
+    paginations = document.xpath(f"//*[{_class_selector(PAGINATION_CLASS)}]")
+    if not paginations:
+        return part_info, 1
+    links = [(link.get('href'), link.text_content().strip()) for link in paginations[0].xpath(".//a[@href]")]
+    return part_info, page_count_from_links(links)
+
+
+# Parser backends by name, each gives the same parts and page count for a page
+PARSER_BACKENDS = {
+    "html.parser": parse_with_soup,
+    "strainer": parse_with_strainer,
+    "events": parse_with_events,
+}
+if lxml is not None:
+    PARSER_BACKENDS["lxml"] = parse_with_lxml
+
+# Fastest of the backends that are always installed, see benchmarks/bench_part_parsers.py. lxml is only used when asked
+# for by name, as it isn't in requirements.pip and so may differ between environments
+DEFAULT_PARSER_BACKEND = "events"
+
+
+def get_parser_backend(name: str = None) -> Callable[[str], tuple]:
+    """
+    Fetches a parser backend by name.
+
+    :param name: Name of the backend, DEFAULT_PARSER_BACKEND if not provided.
+    :return: Function parsing a page's HTML content into (parts, number of pages).
+    :raises ValueError: If no backend has that name, such as lxml when it isn't installed.
+    """
+    name = name if name is not None else DEFAULT_PARSER_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"parser must be one of {', '.join(PARSER_BACKENDS)}.")
+    return PARSER_BACKENDS[name]
@@ -0,0 +1,28 @@
+class ScrapeCategory:
+    __slots__ = ('part_type', 'url')
+
+    def __init__(self, part_type: str, url: str):
+        """
+        Initialises a category of parts listed on the parts site.
+
+        :param part_type: Type the scraped parts are saved as (e.g., CPU, GPU, RAM).
+        :param url: URL of the first page of the category, the other pages are found from its pagination.
+        """
+        self.part_type = part_type
+        self.url = url
+
+    def __repr__(self):
+        return f"ScrapeCategory: {self.part_type} - {self.url}"
+
+
+# Categories scraped into the catalog, in the order their parts are written to components.xlsx
+SCRAPE_CATEGORIES = (
+    ScrapeCategory("CPU", "https://pcparts.uk/browse/cpus"),
+    ScrapeCategory("GPU", "https://pcparts.uk/browse/graphics-cards"),
+    ScrapeCategory("RAM", "https://pcparts.uk/browse/memory"),
+    ScrapeCategory("HDD", "https://pcparts.uk/browse/hard-drives"),
+    ScrapeCategory("SSD", "https://pcparts.uk/browse/solid-state-drives"),
+    ScrapeCategory("Motherboard", "https://pcparts.uk/browse/motherboards"),
+    ScrapeCategory("Power Supply", "https://pcparts.uk/browse/power-supplies"),
+    ScrapeCategory("Case", "https://pcparts.uk/browse/cases"),
+)
@@ -0,0 +1,130 @@
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable
+
+from pc_builder_backend.constants import SCRAPER_PARSE_WORKERS, SCRAPER_PARSE_QUEUE_SIZE
+
+# Marks the end of the fetched pages on the queue
+_FETCH_DONE = object()
+
+
+def _timed_parse(parse: Callable[[str], object], html_content: str) -> tuple:
+    """
+    Scrapes a page in a parse worker, timing how long it took.
+
+    :return: Tuple of (what parse scraped from the page, seconds taken).
+    """
+    start = time.perf_counter()
+    scraped = parse(html_content)
+    return scraped, time.perf_counter() - start
+
+
+class ScrapePipeline:
+
+    def __init__(self, fetcher, page_cache, parse: Callable[[str], object],
+                 parse_workers: int = SCRAPER_PARSE_WORKERS, queue_size: int = SCRAPER_PARSE_QUEUE_SIZE):
+        """
+        Initialises a two stage scraper, fetching pages on threads and scraping them in worker processes.
+
+        Parsing HTML holds the GIL, so scraping pages on the fetch threads only ever uses one core. Here the fetch
+        threads put the pages that changed on a bounded queue, and the pages on it are scraped by a process pool. A
+        full queue blocks the fetch threads until the parse workers catch up, so downloaded pages never pile up in
+        memory.
+
+        :param fetcher: PageFetcher used to send the requests.
+        :param page_cache: PageCache of the pages scraped before, unchanged pages reuse what was scraped from them
+                           and are never sent to the parse workers.
+        :param parse: Function scraping a page's HTML content, it is run in the worker processes so must be defined at
+                      the top level of a module.
+        :param parse_workers: Number of worker processes scraping pages.
+        :param queue_size: Most fetched pages waiting to be scraped.
+        :raises ValueError: If the number of workers or the queue size isn't positive.
+        """
+        if parse_workers <= 0:
+            raise ValueError("parse_workers must be positive.")
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive.")
+
+        self.fetcher = fetcher
+        self.page_cache = page_cache
+        self.parse = parse
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+
+    def scrape_all(self, urls: list) -> list:
+        """
+        Fetches and scrapes many pages.
+
+        :param urls: List of page URLs.
+        :return: List of what was scraped from each page in the order of the URLs, None for pages that couldn't be
+                 fetched.
+        """
+        if not urls:
+            return []
+
+        scraped = {}
+        fetched_pages = queue.Queue(maxsize=self.queue_size)
+
+        def fetch(url: str):
+            cached, page = self.page_cache.fetch_page(self.fetcher, url)
+            if page is None:
+                scraped[url] = cached
+            else:
+                # Waits here while the queue is full, so fetching never runs far ahead of parsing
+                fetched_pages.put(page)
+
+        def fetch_stage():
+            try:
+                self.fetcher.fetch_all(urls, fetch=fetch)
+            finally:
+                fetched_pages.put(_FETCH_DONE)
+
+        fetch_thread = threading.Thread(target=fetch_stage, daemon=True)
+        fetch_thread.start()
+        try:
+            self._parse_stage(fetched_pages, scraped)
+        finally:
+            # Frees any fetch threads still waiting on the queue if the parse stage stopped early
+            while fetch_thread.is_alive():
+                try:
+                    fetched_pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            fetch_thread.join()
+
+        return [scraped.get(url) for url in urls]
+
+    def _parse_stage(self, fetched_pages: queue.Queue, scraped: dict) -> None:
+        """
+        Takes fetched pages off the queue and scrapes them in the process pool, until the fetch stage is done.
+
+        No more pages are handed to the pool than it has workers to keep busy, so pages wait on the bounded queue
+        rather than in the pool.
+        """
+        # Worker processes are started fresh rather than forked, as the fetch threads are already running
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=context) as executor:
+            in_flight = {}
+            fetch_done = False
+            while not fetch_done or in_flight:
+                if not fetch_done and len(in_flight) < self.parse_workers * 2:
+                    page = fetched_pages.get()
+                    if page is _FETCH_DONE:
+                        fetch_done = True
+                    else:
+                        in_flight[executor.submit(_timed_parse, self.parse, page.text)] = page
+                    continue
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = in_flight.pop(future)
+                    try:
+                        result, parse_seconds = future.result()
+                    except Exception as e:
+                        print(f"Error scraping HTML content from {page.url}: {e}")
+                        continue
+                    self.page_cache.store(page, result, parse_seconds=parse_seconds)
+                    scraped[page.url] = result